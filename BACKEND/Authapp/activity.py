@@ -0,0 +1,207 @@
+"""
+Per-user activity totals (UserActivity) behind the profile summary.
+
+Incidents, donations and volunteer applications each add to their owner's
+totals. As with the dashboard counters, every tracked instance remembers
+what it added when it was loaded (Authapp/signals.py); on save the
+difference goes to the owner's row as one F() update and on delete its
+part is taken away. A user's rescue total is the number of assignments of
+every team they are on. Both membership and assignment changes move it, and cascading deletes
+remove members and assignments in no fixed order, so it is recounted for
+the users concerned once the transaction commits.
+
+A row is counted from scratch the first time a save or a summary read
+needs it. Deletes only touch existing rows: a user being deleted must not
+get a new one. bulk_create() and QuerySet.update() skip the signals, so
+code using them calls refresh_rescue() or leaves it to
+`manage.py rebuild_user_activity`.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import CharField, Count, DecimalField, F, IntegerField, Q, Sum, Value
+
+from donations.models import Donation, Donor
+from incidents.models import Incident
+from rescue.models import RescueAssignment, RescueTeamMember
+from volunteer.models import VolunteerAssignment
+
+from .models import UserActivity
+
+# The fields each tracked model's contribution is computed from
+TRACKED_FIELDS = {
+    Incident: {"reporter_id"},
+    Donation: {"donor_id", "donation_type", "amount"},
+    VolunteerAssignment: {"user_id"},
+}
+
+
+def contributions(instance):
+    """
+    What one row adds: {(owner, field): amount}. Donations are owned by
+    ("donor", donor_id) until resolve() maps donors to users, so loading
+    donations never fetches their donor.
+    """
+    result = Counter()
+    if isinstance(instance, Incident):
+        if instance.reporter_id:
+            result[(instance.reporter_id, "incidents_reported")] += 1
+    elif isinstance(instance, Donation):
+        donor = ("donor", instance.donor_id)
+        result[(donor, "donation_count")] += 1
+        if instance.donation_type == "money":
+            result[(donor, "money_donated")] += instance.amount or 0
+    elif isinstance(instance, VolunteerAssignment):
+        result[(instance.user_id, "volunteer_assignments")] += 1
+    return result
+
+
+def resolve(deltas):
+    """{user_id: {field: delta}}, dropping zero deltas."""
+    donor_ids = {owner[1] for owner, _ in deltas if isinstance(owner, tuple)}
+    donors = dict(Donor.objects.filter(pk__in=donor_ids).values_list("pk", "user_id")) if donor_ids else {}
+
+    by_user = defaultdict(Counter)
+    for (owner, field), delta in deltas.items():
+        user_id = donors.get(owner[1]) if isinstance(owner, tuple) else owner
+        if user_id and delta:
+            by_user[user_id][field] += delta
+    return {user_id: fields for user_id, fields in by_user.items() if any(fields.values())}
+
+
+def counted(user_id):
+    """Every total for one user, counted from the source tables."""
+    donations = Donation.objects.filter(donor__user_id=user_id).aggregate(
+        count=Count("id"),
+        money=Sum("amount", filter=Q(donation_type="money")),
+    )
+    return {
+        "incidents_reported": Incident.objects.filter(reporter_id=user_id).count(),
+        "donation_count": donations["count"],
+        "money_donated": donations["money"] or 0,
+        "volunteer_assignments": VolunteerAssignment.objects.filter(user_id=user_id).count(),
+        "rescue_assignments": RescueAssignment.objects.filter(team__members__user_id=user_id).count(),
+    }
+
+
+def _create(user_id):
+    """(row, created) for a user found to have no row, counted from scratch."""
+    return UserActivity.objects.get_or_create(user_id=user_id, defaults=counted(user_id))
+
+
+def activity_for(user_id):
+    """The user's row, counted and created if they have none yet."""
+    return UserActivity.objects.filter(user_id=user_id).first() or _create(user_id)[0]
+
+
+RECENT_LIMIT = 5
+RECENT_COLUMNS = ("kind", "object_id", "label", "category", "state", "money", "item", "units", "at")
+
+
+def _recent(queryset, kind, at, **columns):
+    """The newest RECENT_LIMIT rows of `queryset` as RECENT_COLUMNS."""
+    newest = queryset.order_by(f"-{at}").values("pk")[:RECENT_LIMIT]
+    defaults = {
+        "label": Value(None, output_field=CharField()),
+        "category": Value(None, output_field=CharField()),
+        "state": Value(None, output_field=CharField()),
+        "money": Value(None, output_field=DecimalField(max_digits=12, decimal_places=2)),
+        "item": Value(None, output_field=CharField()),
+        "units": Value(None, output_field=IntegerField()),
+    }
+    defaults.update(columns)
+    return queryset.model.objects.filter(pk__in=newest).annotate(
+        kind=Value(kind, output_field=CharField()),
+        object_id=F("pk"),
+        at=F(at),
+        **defaults,
+    ).values(*RECENT_COLUMNS).order_by()
+
+
+def recent_activity(user_id):
+    """
+    The user's latest incidents, donations and volunteer applications,
+    {kind: [row, ...]} newest first, read with one UNION query.
+    """
+    incidents = _recent(
+        Incident.objects.filter(reporter_id=user_id), "incident", "created_at",
+        label=F("title"), category=F("incident_type"), state=F("status"),
+    )
+    donations = _recent(
+        Donation.objects.filter(donor__user_id=user_id), "donation", "created_at",
+        label=F("incident__title"), category=F("donation_type"), money=F("amount"),
+        item=F("item_name"), units=F("quantity"),
+    )
+    volunteering = _recent(
+        VolunteerAssignment.objects.filter(user_id=user_id), "volunteer", "applied_at",
+        label=F("incident__title"), state=F("status"),
+    )
+
+    recent = {"incident": [], "donation": [], "volunteer": []}
+    for row in incidents.union(donations, volunteering, all=True).order_by("-at"):
+        recent[row["kind"]].append(row)
+    return recent
+
+
+def apply(deltas, create=True):
+    for user_id, fields in resolve(deltas).items():
+        changes = {field: F(field) + delta for field, delta in fields.items()}
+        if UserActivity.objects.filter(user_id=user_id).update(**changes) or not create:
+            continue
+        # The first count already includes this write, unless another
+        # transaction created the row first
+        _, created = _create(user_id)
+        if not created:
+            UserActivity.objects.filter(user_id=user_id).update(**changes)
+
+
+def _recount_rescue(user_ids):
+    totals = dict(
+        RescueTeamMember.objects.filter(user_id__in=user_ids).values("user_id").annotate(
+            total=Count("team__assignments")
+        ).values_list("user_id", "total")
+    )
+    for user_id in user_ids:
+        UserActivity.objects.filter(user_id=user_id).update(rescue_assignments=totals.get(user_id, 0))
+
+
+def refresh_rescue(user_ids):
+    """Recount the rescue totals of `user_ids` once the transaction commits."""
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: _recount_rescue(user_ids))
+
+
+def rebuild():
+    """Recount every user's row; returns how many rows were written."""
+    totals = defaultdict(lambda: {
+        "incidents_reported": 0,
+        "donation_count": 0,
+        "money_donated": 0,
+        "volunteer_assignments": 0,
+        "rescue_assignments": 0,
+    })
+    for user_id, total in Incident.objects.filter(reporter__isnull=False).values("reporter_id").annotate(
+        total=Count("id")
+    ).values_list("reporter_id", "total"):
+        totals[user_id]["incidents_reported"] = total
+    for user_id, count, money in Donation.objects.values("donor__user_id").annotate(
+        count=Count("id"),
+        money=Sum("amount", filter=Q(donation_type="money")),
+    ).values_list("donor__user_id", "count", "money"):
+        totals[user_id]["donation_count"] = count
+        totals[user_id]["money_donated"] = money or 0
+    for user_id, total in VolunteerAssignment.objects.values("user_id").annotate(
+        total=Count("id")
+    ).values_list("user_id", "total"):
+        totals[user_id]["volunteer_assignments"] = total
+    for user_id, total in RescueTeamMember.objects.values("user_id").annotate(
+        total=Count("team__assignments")
+    ).values_list("user_id", "total"):
+        totals[user_id]["rescue_assignments"] = total
+
+    rows = [UserActivity(user_id=user_id, **fields) for user_id, fields in totals.items()]
+    with transaction.atomic():
+        UserActivity.objects.all().delete()
+        UserActivity.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,72 @@
+"""
+JWT authentication backed by a principal cache.
+
+simplejwt loads the user row on every request, and the donor_profile
+checks in the donation views add another query. Here the user is loaded
+once, with its donor profile, and kept under auth:principal:<id> for
+AUTH_PRINCIPAL_CACHE_SECONDS, so an authenticated request with a warm
+cache runs no auth queries at all. Authapp/signals.py evicts the entry
+whenever the user or their donor profile changes, which only reaches every
+worker when the cache is shared (SHARED_CACHE). With a per-process cache a
+deactivated or demoted user would keep their rights on the other workers,
+so the user is loaded from the database on every request instead.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def principal_key(user_id):
+    return f"auth:principal:{user_id}"
+
+
+def _load(user_model, user_id):
+    return user_model.objects.select_related("donor_profile").filter(
+        **{api_settings.USER_ID_FIELD: user_id}
+    ).first()
+
+
+def load_principal(user_model, user_id):
+    if not settings.SHARED_CACHE:
+        return _load(user_model, user_id)
+
+    principal = cache.get(principal_key(user_id))
+    if principal is None:
+        principal = _load(user_model, user_id)
+        if principal is not None:
+            cache.set(principal_key(user_id), principal, settings.AUTH_PRINCIPAL_CACHE_SECONDS)
+    return principal
+
+
+def invalidate_principal(user_id):
+    cache.delete(principal_key(user_id))
+    # A request inside the transaction may have cached the old row again
+    transaction.on_commit(lambda: cache.delete(principal_key(user_id)))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication whose user comes from the principal cache."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = load_principal(self.user_model, user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,161 @@
+"""
+Refresh token blacklist: a Bloom filter in front of the database, and
+batched pruning of expired rows.
+
+Logout and refresh rotation blacklist a token on every use, so
+token_blacklist's tables only grow, and simplejwt checks membership with a
+query on every refresh. Each process keeps a Bloom filter of blacklisted
+JTIs instead: a miss means "definitely not blacklisted" and skips the
+query; a hit (a real entry or a rare false positive) falls back to it.
+
+The filter is built from the table on first use and each blacklist write
+adds its JTI. Writes made by other processes reach it through a journal in
+the default cache: once a write commits, a counter is incremented and the
+JTI stored under the new value, so the journal is in commit order, and a
+filter at version n reads entries n+1.. when the counter moves. Reading by
+commit order rather than by id means a row whose id was allocated early but
+that committed late is not skipped. A gap in the journal (an evicted or
+expired entry, or a counter that had to be recreated) rebuilds the filter.
+
+The journal only works if every process shares the cache; without a
+SHARED_CACHE a miss cannot be trusted and every check goes to the
+database.
+
+`manage.py prune_tokens` deletes expired outstanding tokens (and with them
+their blacklist rows) TOKEN_PRUNE_BATCH_SIZE at a time.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+VERSION_KEY = "auth:blacklist:version"
+JOURNAL_KEY = "auth:blacklist:journal:{}"
+
+# A filter further behind than this rebuilds rather than reading the journal
+JOURNAL_MAX_READ = 1000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        if item in self:
+            return
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class _Blacklist:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.version = None
+
+    def rebuild(self):
+        """Build the filter from every blacklisted token that has not expired."""
+        with self.lock:
+            # Read before the table: writes journalled up to here have committed
+            self.version = cache.get(VERSION_KEY)
+            live = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            bloom = BloomFilter(
+                max(live.count() * 2, settings.TOKEN_BLOOM_MIN_CAPACITY),
+                settings.TOKEN_BLOOM_ERROR_RATE,
+            )
+            for jti in live.values_list("token__jti", flat=True).iterator(chunk_size=2000):
+                bloom.add(jti)
+            self.bloom = bloom
+
+    def _sync(self):
+        """Add the JTIs journalled since the last sync, by any process."""
+        version = cache.get(VERSION_KEY)
+        if version == self.version:
+            return
+        if version is None or self.version is None or not 0 < version - self.version <= JOURNAL_MAX_READ:
+            self.rebuild()
+            return
+        keys = [JOURNAL_KEY.format(number) for number in range(self.version + 1, version + 1)]
+        entries = cache.get_many(keys)
+        if len(entries) < len(keys):
+            self.rebuild()
+            return
+        with self.lock:
+            for jti in entries.values():
+                self.bloom.add(jti)
+            self.version = version
+
+    def might_contain(self, jti):
+        if not settings.SHARED_CACHE:
+            return True
+        if self.bloom is None:
+            self.rebuild()
+        else:
+            self._sync()
+        if self.bloom.count > self.bloom.capacity:
+            self.rebuild()
+        return jti in self.bloom
+
+    def added(self, jti):
+        """Record a blacklist write; other processes learn of it once committed."""
+        if self.bloom is not None:
+            with self.lock:
+                self.bloom.add(jti)
+        transaction.on_commit(lambda: journal(jti))
+
+
+def journal(jti):
+    """Append a committed blacklist write to the journal other processes read."""
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        # Start a recreated counter from the clock, far past any value the
+        # old one reached, so every filter sees a jump and rebuilds
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.incr(VERSION_KEY)
+    cache.set(JOURNAL_KEY.format(version), jti, timeout=settings.TOKEN_BLOOM_JOURNAL_SECONDS)
+
+
+blacklist = _Blacklist()
+
+
+def prune_expired(batch_size=None, now=None):
+    """
+    Delete expired outstanding tokens with their blacklist rows, one batch
+    per transaction so the tables are never locked for long; returns how
+    many outstanding tokens went.
+    """
+    batch_size = batch_size or settings.TOKEN_PRUNE_BATCH_SIZE
+    expired = OutstandingToken.objects.filter(expires_at__lte=now or timezone.now())
+
+    pruned = 0
+    while True:
+        ids = list(expired.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return pruned
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        pruned += len(ids)
@@ -0,0 +1,24 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from Authapp.blacklist import prune_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Prune once and exit.")
+        parser.add_argument("--interval", type=float, default=None, help="Seconds between runs.")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        interval = options["interval"] or settings.TOKEN_PRUNE_INTERVAL_SECONDS
+        while True:
+            pruned = prune_expired(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} expired token(s)"))
+            if options["once"]:
+                return
+            time.sleep(interval)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from Authapp.activity import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recount the per-user activity totals shown on the profile summary."
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt activity totals for {rows} user(s)"))
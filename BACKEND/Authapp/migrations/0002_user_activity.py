@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Authapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivity',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('incidents_reported', models.PositiveIntegerField(default=0)),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('money_donated', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('volunteer_assignments', models.PositiveIntegerField(default=0)),
+                ('rescue_assignments', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -53,3 +53,29 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def is_citizen(self):
         return self.role == UserRole.CITIZEN
+
+
+class UserActivity(models.Model):
+    """
+    Per-user activity totals for the profile summary, kept current by
+    Authapp/activity.py and rebuilt with `manage.py rebuild_user_activity`.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="activity"
+    )
+
+    incidents_reported = models.PositiveIntegerField(default=0)
+    donation_count = models.PositiveIntegerField(default=0)
+    money_donated = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+    volunteer_assignments = models.PositiveIntegerField(default=0)
+    rescue_assignments = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Activity of {self.user_id}"
@@ -8,3 +8,11 @@ class IsAdminRole(BasePermission):
             request.user.is_authenticated and
             request.user.role == UserRole.ADMIN
         )
+
+
+class IsAdminOrAssessmentTeam(BasePermission):
+    def has_permission(self, request, view):
+        return (
+            request.user.is_authenticated and
+            request.user.role in (UserRole.ADMIN, UserRole.ASSESSMENT_TEAM)
+        )
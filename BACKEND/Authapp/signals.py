@@ -0,0 +1,95 @@
+"""
+Evict cached principals (Authapp/authentication.py) when a user or their
+donor profile changes, feed blacklist writes to the Bloom filter
+(Authapp/blacklist.py) and keep UserActivity totals current
+(Authapp/activity.py).
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from donations.models import Donor
+from rescue.models import RescueAssignment, RescueTeamMember
+
+from .activity import TRACKED_FIELDS, apply, contributions, refresh_rescue
+from .authentication import invalidate_principal
+from .blacklist import blacklist
+
+
+def user_changed(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+def donor_profile_changed(sender, instance, **kwargs):
+    invalidate_principal(instance.user_id)
+
+
+post_save.connect(user_changed, sender=settings.AUTH_USER_MODEL, dispatch_uid="principal_cache_user_save")
+post_delete.connect(user_changed, sender=settings.AUTH_USER_MODEL, dispatch_uid="principal_cache_user_delete")
+post_save.connect(donor_profile_changed, sender=Donor, dispatch_uid="principal_cache_donor_save")
+post_delete.connect(donor_profile_changed, sender=Donor, dispatch_uid="principal_cache_donor_delete")
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        blacklist.added(instance.token.jti)
+
+
+# ------------------------------------------------------------
+# Activity totals
+# ------------------------------------------------------------
+
+ACTIVITY_SNAPSHOT_ATTR = "_activity_snapshot"
+
+
+def _snapshot_on_init(sender, instance, **kwargs):
+    if instance.pk is None or TRACKED_FIELDS[sender] & instance.get_deferred_fields():
+        return
+    setattr(instance, ACTIVITY_SNAPSHOT_ATTR, contributions(instance))
+
+
+def _snapshot_before_save(sender, instance, **kwargs):
+    if instance._state.adding:
+        setattr(instance, ACTIVITY_SNAPSHOT_ATTR, Counter())
+    elif not hasattr(instance, ACTIVITY_SNAPSHOT_ATTR):
+        previous = sender._default_manager.filter(pk=instance.pk).first()
+        setattr(instance, ACTIVITY_SNAPSHOT_ATTR, contributions(previous) if previous else Counter())
+
+
+def _apply_after_save(sender, instance, **kwargs):
+    current = contributions(instance)
+    deltas = Counter(current)
+    deltas.subtract(getattr(instance, ACTIVITY_SNAPSHOT_ATTR, Counter()))
+    apply(deltas)
+    setattr(instance, ACTIVITY_SNAPSHOT_ATTR, current)
+
+
+def _apply_after_delete(sender, instance, **kwargs):
+    deltas = Counter()
+    deltas.subtract(getattr(instance, ACTIVITY_SNAPSHOT_ATTR, None) or contributions(instance))
+    apply(deltas, create=False)
+
+
+for model in TRACKED_FIELDS:
+    label = model._meta.label
+    post_init.connect(_snapshot_on_init, sender=model, dispatch_uid=f"activity_init_{label}")
+    pre_save.connect(_snapshot_before_save, sender=model, dispatch_uid=f"activity_pre_save_{label}")
+    post_save.connect(_apply_after_save, sender=model, dispatch_uid=f"activity_post_save_{label}")
+    post_delete.connect(_apply_after_delete, sender=model, dispatch_uid=f"activity_post_delete_{label}")
+
+
+@receiver([post_save, post_delete], sender=RescueTeamMember)
+def team_member_changed(sender, instance, **kwargs):
+    refresh_rescue([instance.user_id])
+
+
+@receiver(post_delete, sender=RescueAssignment)
+@receiver(post_save, sender=RescueAssignment)
+def rescue_assignment_changed(sender, instance, created=True, **kwargs):
+    if created:
+        # Read now: a cascading team delete may remove the members first
+        refresh_rescue(RescueTeamMember.objects.filter(team_id=instance.team_id).values_list("user_id", flat=True))
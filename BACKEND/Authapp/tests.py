@@ -1,3 +1,297 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from donations.models import Donation, Donor
+from rescue.models import RescueAssignment, RescueTeam, RescueTeamMember
+from volunteer.models import VolunteerAssignment
+
+from .activity import rebuild
+from .blacklist import JOURNAL_KEY, JOURNAL_MAX_READ, VERSION_KEY, BloomFilter, blacklist, journal, prune_expired
+from .models import User, UserActivity, UserRole
+from .tokens import DONOR_PROFILE_CLAIM, ROLE_CLAIM, RoleRefreshToken
+from RapidAid.testing import QueryCountMixin, api_client, make_incident, make_user
+
+
+class AdminUserListQueryCountTests(QueryCountMixin, TestCase):
+    def test_user_list_queries_do_not_grow_with_rows(self):
+        client = api_client(make_user(role=UserRole.ADMIN))
+        self.assertConstantQueries(client, "/api/auth/admin/users/", make_user)
+
+
+@override_settings(SHARED_CACHE=True)
+class PrincipalCacheTests(TestCase):
+    password = "s3cure-Passw0rd"
+
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.user.set_password(self.password)
+        self.user.save()
+
+    def login(self):
+        response = APIClient().post(
+            "/api/auth/login/",
+            {"email": self.user.email, "password": self.password},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return client, response.data["access"]
+
+    def test_access_token_carries_role_and_donor_profile(self):
+        donor = Donor.objects.create(user=self.user)
+        _, access = self.login()
+
+        token = AccessToken(access)
+        self.assertEqual(token[ROLE_CLAIM], UserRole.CITIZEN)
+        self.assertEqual(token[DONOR_PROFILE_CLAIM], donor.pk)
+
+    def test_warm_principal_runs_no_auth_queries(self):
+        Donor.objects.create(user=self.user)
+        client, _ = self.login()
+        client.get("/api/donations/donor/me/")
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get("/api/donations/donor/me/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["has_donor"])
+        user_table = User._meta.db_table
+        self.assertFalse([q for q in context.captured_queries if user_table in q["sql"]])
+
+    def test_user_update_evicts_principal(self):
+        client, _ = self.login()
+        self.assertEqual(client.get("/api/auth/me/").data["role"], UserRole.CITIZEN)
+
+        self.user.role = UserRole.ADMIN
+        self.user.save()
+        self.assertEqual(client.get("/api/auth/me/").data["role"], UserRole.ADMIN)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(client.get("/api/auth/me/").status_code, 401)
+
+    def test_new_donor_profile_evicts_principal(self):
+        client, _ = self.login()
+        self.assertFalse(client.get("/api/donations/donor/me/").data["has_donor"])
+
+        Donor.objects.create(user=self.user)
+        self.assertTrue(client.get("/api/donations/donor/me/").data["has_donor"])
+
+    @override_settings(SHARED_CACHE=False)
+    def test_per_process_cache_is_not_trusted(self):
+        client, _ = self.login()
+        client.get("/api/auth/me/")
+
+        # As if another worker made the change: no eviction reaches this one
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(client.get("/api/auth/me/").status_code, 401)
+
+
+@override_settings(SHARED_CACHE=True)
+class TokenBlacklistTests(TestCase):
+    password = "s3cure-Passw0rd"
+
+    def setUp(self):
+        cache.clear()
+        # The filter outlives each test's rolled back rows
+        blacklist.bloom = None
+        self.user = make_user()
+        self.user.set_password(self.password)
+        self.user.save()
+
+    def login(self):
+        response = APIClient().post(
+            "/api/auth/login/",
+            {"email": self.user.email, "password": self.password},
+            format="json",
+        )
+        return response.data["refresh"], response.data["access"]
+
+    def refresh(self, token):
+        return APIClient().post("/api/auth/token/refresh/", {"refresh": token}, format="json")
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for number in range(1000):
+            bloom.add(f"jti-{number}")
+        self.assertTrue(all(f"jti-{number}" in bloom for number in range(1000)))
+        false_positives = sum(f"other-{number}" in bloom for number in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_refresh_rotates_and_rejects_reuse(self):
+        refresh, _ = self.login()
+
+        response = self.refresh(refresh)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn("access", response.data)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+        self.assertEqual(self.refresh(response.data["refresh"]).status_code, 200)
+
+    def test_logged_out_token_cannot_refresh(self):
+        refresh, access = self.login()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(client.post("/api/auth/logout/", {"refresh": refresh}, format="json").status_code, 200)
+
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def blacklist_elsewhere(self, *tokens):
+        """As another process would: the rows, then the journal once committed, no signal."""
+        jtis = [RefreshToken(token, verify=False)["jti"] for token in tokens]
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token=token) for token in OutstandingToken.objects.filter(jti__in=jtis)]
+        )
+        return jtis
+
+    def test_blacklist_written_elsewhere_is_picked_up(self):
+        refresh, _ = self.login()
+        self.assertEqual(self.refresh(refresh).status_code, 200)  # builds the filter
+        fresh, _ = self.login()
+
+        for jti in self.blacklist_elsewhere(fresh):
+            journal(jti)
+
+        self.assertEqual(self.refresh(fresh).status_code, 401)
+
+    def test_late_commit_with_a_low_id_is_picked_up(self):
+        first, _ = self.login()
+        second, _ = self.login()
+        journal("warm-up")
+        blacklist.might_contain("warm-up")
+
+        # The lower id commits last, after the filter has read the higher one
+        early, late = self.blacklist_elsewhere(first, second)
+        journal(late)
+        self.assertFalse(blacklist.might_contain(early))
+        journal(early)
+
+        self.assertTrue(blacklist.might_contain(early))
+        self.assertEqual(self.refresh(first).status_code, 401)
+
+    def test_journal_gap_rebuilds_the_filter(self):
+        first, _ = self.login()
+        second, _ = self.login()
+        blacklist.might_contain("warm-up")
+
+        (jti,) = self.blacklist_elsewhere(first)
+        journal(jti)
+        cache.delete(JOURNAL_KEY.format(cache.get(VERSION_KEY)))
+        self.assertTrue(blacklist.might_contain(jti))
+
+        cache.delete(VERSION_KEY)  # evicted: the recreated counter jumps ahead
+        (jti,) = self.blacklist_elsewhere(second)
+        journal(jti)
+        self.assertGreater(cache.get(VERSION_KEY), blacklist.version + JOURNAL_MAX_READ)
+        self.assertTrue(blacklist.might_contain(jti))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_per_process_cache_always_queries(self):
+        refresh, _ = self.login()
+        blacklist.might_contain("warm-up")
+        self.blacklist_elsewhere(refresh)  # no journal entry at all
+
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def test_refresh_skips_blacklist_query(self):
+        refresh, _ = self.login()
+        blacklist.might_contain("warm-up")
+
+        with CaptureQueriesContext(connection) as context:
+            RoleRefreshToken(refresh)
+        table = BlacklistedToken._meta.db_table
+        self.assertFalse([q for q in context.captured_queries if table in q["sql"]])
+
+    def test_prune_deletes_expired_tokens_in_batches(self):
+        logged_out, access = self.login()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        client.post("/api/auth/logout/", {"refresh": logged_out}, format="json")
+        live, _ = self.login()
+        expired, _ = self.login()
+
+        jti = {token: RefreshToken(token, verify=False)["jti"] for token in (logged_out, live, expired)}
+        OutstandingToken.objects.filter(jti__in=[jti[logged_out], jti[expired]]).update(expires_at=timezone.now())
+
+        self.assertEqual(prune_expired(batch_size=1), 2)
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), [jti[live]])
+        self.assertFalse(BlacklistedToken.objects.exists())
+        self.assertEqual(prune_expired(now=timezone.now() + timedelta(days=8)), 1)
+
+
+class ActivitySummaryTests(TestCase):
+    url = "/api/auth/profile/"
+
+    def setUp(self):
+        self.user = make_user()
+        self.donor = Donor.objects.create(user=self.user)
+        self.client = api_client(self.user)
+
+    def summary(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def add_activity(self):
+        incident = make_incident(reporter=self.user)
+        make_incident(reporter=self.user)
+        Donation.objects.create(donor=self.donor, incident=incident, donation_type="money", amount=Decimal("150.50"))
+        Donation.objects.create(donor=self.donor, incident=incident, donation_type="item", item_name="Tent", quantity=2)
+        VolunteerAssignment.objects.create(user=self.user, incident=incident)
+
+        team = RescueTeam.objects.create(name="Alpha", organization="Red Cross")
+        with self.captureOnCommitCallbacks(execute=True):
+            RescueTeamMember.objects.create(team=team, user=self.user, role="Medic")
+        with self.captureOnCommitCallbacks(execute=True):
+            RescueAssignment.objects.create(incident=incident, team=team)
+            RescueAssignment.objects.create(incident=make_incident(), team=team)
+        return incident, team
+
+    def assertTotals(self, data, incidents, donations, money, volunteer, rescue):
+        self.assertEqual(data["incident_activity"]["total_reported"], incidents)
+        self.assertEqual(data["donation_activity"]["total_donations"], donations)
+        self.assertEqual(data["donation_activity"]["total_money_donated"], money)
+        self.assertEqual(data["volunteer_activity"]["total_assignments"], volunteer)
+        self.assertEqual(data["rescue_activity"]["total_assignments"], rescue)
+
+    def test_totals_follow_writes(self):
+        self.summary()  # creates the row before the activity exists
+        incident, team = self.add_activity()
+        self.assertTotals(self.summary(), 2, 2, 150.5, 1, 2)
+
+        money = Donation.objects.get(donation_type="money")
+        money.amount = Decimal("200")
+        money.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            team.delete()
+        VolunteerAssignment.objects.filter(user=self.user).first().delete()
+        self.assertTotals(self.summary(), 2, 2, 200.0, 0, 0)
+
+    def test_first_read_counts_existing_activity(self):
+        self.add_activity()
+        UserActivity.objects.all().delete()
+
+        self.assertTotals(self.summary(), 2, 2, 150.5, 1, 2)
+        self.assertEqual(rebuild(), 1)
+        self.assertTotals(self.summary(), 2, 2, 150.5, 1, 2)
+
+    def test_summary_is_two_queries(self):
+        self.add_activity()
+        self.summary()
+
+        with CaptureQueriesContext(connection) as context:
+            data = self.summary()
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertEqual(len(data["recent_incidents"]), 2)
+        self.assertEqual(data["recent_donations"][0]["item_name"], "Tent")
+        self.assertEqual(data["recent_donations"][1]["amount"], Decimal("150.50"))
+        self.assertEqual(data["recent_volunteer"][0]["status"], "pending")
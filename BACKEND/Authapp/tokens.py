@@ -0,0 +1,43 @@
+"""
+JWTs carrying the user's role and donor profile.
+
+Clients read these claims to pick screens without calling /me. The server
+never authorizes from them: a role can change while a token is live, so
+permission checks use the principal (Authapp/authentication.py), which
+follows every change to the user.
+"""
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import blacklist
+
+ROLE_CLAIM = "role"
+DONOR_PROFILE_CLAIM = "donor_profile"
+
+
+def donor_profile_id(user):
+    try:
+        return user.donor_profile.pk
+    except user._meta.model.donor_profile.RelatedObjectDoesNotExist:
+        return None
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh token whose claims, role included, its access tokens inherit.
+    Its blacklist check asks the Bloom filter (Authapp/blacklist.py) first.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        self[ROLE_CLAIM] = user.role
+        self[DONOR_PROFILE_CLAIM] = donor_profile_id(user)
+
+    def check_blacklist(self):
+        if blacklist.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
@@ -3,6 +3,7 @@ from .views import (
     RegisterUserAPIView,
     LoginAPIView,
     LogoutAPIView,
+    TokenRefreshAPIView,
     UserMeAPIView,
     UpdateProfileAPIView,
     AdminUserListAPIView,
@@ -15,6 +16,7 @@ urlpatterns = [
     path("register/", RegisterUserAPIView.as_view()),
     path("login/", LoginAPIView.as_view()),
     path("logout/", LogoutAPIView.as_view()),
+    path("token/refresh/", TokenRefreshAPIView.as_view()),
     path("me/", UserMeAPIView.as_view()),
     path("profile/", UserProfileSummaryAPIView.as_view()),
     path("me/update/", UpdateProfileAPIView.as_view()),
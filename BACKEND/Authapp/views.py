@@ -1,18 +1,16 @@
 from rest_framework import generics, permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import get_user_model
-from django.db.models import Sum
-
-from incidents.models import Incident
-from donations.models import Donation
-from volunteer.models import VolunteerAssignment
-from rescue.models import RescueTeamMember, RescueAssignment
 
+from .activity import activity_for, recent_activity
+from .authentication import load_principal
 from .models import UserRole
 from .serializers import UserDetailSerializer
 from .permissions import IsAdminRole
+from .tokens import RoleRefreshToken
 
 User = get_user_model()
 
@@ -59,14 +57,14 @@ class LoginAPIView(generics.GenericAPIView):
         email = serializer.validated_data["email"]
         password = serializer.validated_data["password"]
 
-        user = User.objects.filter(email=email).first()
+        user = User.objects.select_related("donor_profile").filter(email=email).first()
         if not user or not user.check_password(password):
             return Response(
                 {"detail": "Invalid email or password"},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleRefreshToken.for_user(user)
         return Response({
             "refresh": str(refresh),
             "access": str(refresh.access_token),
@@ -90,7 +88,7 @@ class LogoutAPIView(generics.GenericAPIView):
 
         refresh_token = serializer.validated_data["refresh"]
         try:
-            token = RefreshToken(refresh_token)
+            token = RoleRefreshToken(refresh_token)
             token.blacklist()
             return Response({"detail": "Logged out successfully"})
         except Exception:
@@ -100,6 +98,52 @@ class LogoutAPIView(generics.GenericAPIView):
             )
 
 
+# Serializer for token refresh
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        try:
+            refresh = RoleRefreshToken(attrs["refresh"])
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        user = load_principal(User, refresh[jwt_settings.USER_ID_CLAIM])
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("No active account found for the given token.")
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS and jwt_settings.BLACKLIST_AFTER_ROTATION:
+            refresh.blacklist()
+
+        # Claims follow the user's current role, not the one at login
+        refresh.set_user_claims(user)
+        data = {"access": str(refresh.access_token)}
+
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
+
+
+# Token refresh API
+class TokenRefreshAPIView(generics.GenericAPIView):
+    serializer_class = TokenRefreshSerializer
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get_authenticate_header(self, request):
+        # Without an authenticator DRF would turn token errors into 403s
+        return 'Bearer realm="api"'
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.validated_data)
+
+
 # ============================================================
 # CURRENT USER PROFILE
 # ============================================================
@@ -125,61 +169,55 @@ class UserProfileSummaryAPIView(generics.GenericAPIView):
 
     def get(self, request):
         user = request.user
-
-        incident_qs = Incident.objects.filter(reporter=user).order_by("-created_at")
-        donation_qs = Donation.objects.filter(donor__user=user).order_by("-created_at")
-        volunteer_qs = VolunteerAssignment.objects.filter(user=user).order_by("-applied_at")
-
-        team_ids = RescueTeamMember.objects.filter(user=user).values_list("team_id", flat=True)
-        rescue_assignments_qs = RescueAssignment.objects.filter(team_id__in=team_ids)
-
-        total_money = donation_qs.filter(donation_type="money").aggregate(total=Sum("amount"))["total"]
-
-        recent_incidents = list(
-            incident_qs.values("id", "title", "incident_type", "status", "created_at")[:5]
-        )
-
-        recent_donations = [
-            {
-                "id": donation.id,
-                "donation_type": donation.donation_type,
-                "amount": donation.amount,
-                "item_name": donation.item_name,
-                "quantity": donation.quantity,
-                "created_at": donation.created_at,
-                "incident_title": donation.incident.title if donation.incident else None,
-            }
-            for donation in donation_qs.select_related("incident")[:5]
-        ]
-
-        recent_volunteer = [
-            {
-                "id": assignment.id,
-                "status": assignment.status,
-                "applied_at": assignment.applied_at,
-                "incident_title": assignment.incident.title if assignment.incident else None,
-            }
-            for assignment in volunteer_qs.select_related("incident")[:5]
-        ]
+        activity = activity_for(user.pk)
+        recent = recent_activity(user.pk)
 
         data = {
             "user": UserDetailSerializer(user).data,
             "incident_activity": {
-                "total_reported": incident_qs.count(),
+                "total_reported": activity.incidents_reported,
             },
             "donation_activity": {
-                "total_money_donated": float(total_money or 0),
-                "total_donations": donation_qs.count(),
+                "total_money_donated": float(activity.money_donated),
+                "total_donations": activity.donation_count,
             },
             "rescue_activity": {
-                "total_assignments": rescue_assignments_qs.count(),
+                "total_assignments": activity.rescue_assignments,
             },
             "volunteer_activity": {
-                "total_assignments": volunteer_qs.count(),
+                "total_assignments": activity.volunteer_assignments,
             },
-            "recent_incidents": recent_incidents,
-            "recent_donations": recent_donations,
-            "recent_volunteer": recent_volunteer,
+            "recent_incidents": [
+                {
+                    "id": row["object_id"],
+                    "title": row["label"],
+                    "incident_type": row["category"],
+                    "status": row["state"],
+                    "created_at": row["at"],
+                }
+                for row in recent["incident"]
+            ],
+            "recent_donations": [
+                {
+                    "id": row["object_id"],
+                    "donation_type": row["category"],
+                    "amount": row["money"],
+                    "item_name": row["item"],
+                    "quantity": row["units"],
+                    "created_at": row["at"],
+                    "incident_title": row["label"],
+                }
+                for row in recent["donation"]
+            ],
+            "recent_volunteer": [
+                {
+                    "id": row["object_id"],
+                    "status": row["state"],
+                    "applied_at": row["at"],
+                    "incident_title": row["label"],
+                }
+                for row in recent["volunteer"]
+            ],
         }
 
         return Response(data)
@@ -241,6 +279,7 @@ class AdminUserListAPIView(generics.ListAPIView):
     """
     serializer_class = UserDetailSerializer
     permission_classes = [IsAdminRole]
+    cursor_ordering = ("-id",)
     queryset = User.objects.all().order_by("-id")
 
 
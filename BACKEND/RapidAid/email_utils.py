@@ -1,22 +1,55 @@
 import logging
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.db import transaction
+
+from notifications.models import OutboxEmail
+from notifications.outbox import wake_worker
 
 logger = logging.getLogger(__name__)
 
 
 def send_notification_email(to_email, subject, message):
+    """
+    Queue a notification email in the outbox.
+
+    The row commits together with the caller's transaction, so nothing is
+    sent for rolled-back changes and no SMTP work happens inside the request.
+    """
     if not to_email:
         return
 
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[to_email],
-            fail_silently=False,
-        )
+        # A savepoint, so a failed INSERT does not leave the caller's
+        # transaction aborted (as it would on PostgreSQL)
+        with transaction.atomic():
+            OutboxEmail.objects.create(
+                to_email=to_email,
+                subject=subject,
+                message=message,
+            )
     except Exception:
-        logger.exception("Failed to send notification email to %s", to_email)
+        logger.exception("Failed to queue notification email to %s", to_email)
+        return
+
+    if settings.EMAIL_OUTBOX_AUTOSEND:
+        transaction.on_commit(wake_worker)
+
+
+def queue_notification_emails(emails):
+    """
+    Queue many (to_email, subject, message) notifications with one INSERT.
+    Used by bulk endpoints; same commit semantics as send_notification_email.
+    """
+    rows = [
+        OutboxEmail(to_email=to_email, subject=subject, message=message)
+        for to_email, subject, message in emails
+        if to_email
+    ]
+    if not rows:
+        return
+
+    OutboxEmail.objects.bulk_create(rows)
+
+    if settings.EMAIL_OUTBOX_AUTOSEND:
+        transaction.on_commit(wake_worker)
@@ -0,0 +1,176 @@
+"""
+Streaming CSV / NDJSON exports of whole tables.
+
+An Export is a queryset and its columns, (header, lookup) pairs read with
+values_list(), so no model instances are built. Rows come from
+iterator(chunk_size=EXPORT_CHUNK_SIZE), which streams them from the
+database cursor; each row is encoded as soon as it arrives and the text is
+sent in blocks of about EXPORT_BLOCK_BYTES, optionally through one gzip
+compressor. Memory stays at one chunk of rows plus one block however many
+rows there are.
+
+ExportAPIView serves an Export through StreamingHttpResponse and honours
+the same filter_fields / date filter as the list views; ExportCommand
+writes one to a file or stdout.
+"""
+import csv
+import json
+import sys
+import zlib
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+
+EXPORT_BLOCK_BYTES = 64 * 1024
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, sort_keys=True)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """File-like object handing csv.writer's output straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def _ndjson_lines(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+ENCODERS = {
+    "csv": _csv_lines,
+    "ndjson": _ndjson_lines,
+}
+
+
+def _blocks(lines):
+    parts, size = [], 0
+    for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= EXPORT_BLOCK_BYTES:
+            yield "".join(parts).encode()
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts).encode()
+
+
+def _gzipped(blocks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class Export:
+    """A named queryset and the (header, lookup) columns exported from it."""
+
+    def __init__(self, name, queryset, columns):
+        self.name = name
+        self.queryset = queryset
+        self.columns = columns
+
+    def stream(self, output="csv", compress=False, queryset=None, chunk_size=None):
+        """The encoded export as an iterator of byte blocks."""
+        queryset = self.queryset.all() if queryset is None else queryset
+        headers = [header for header, _ in self.columns]
+        rows = queryset.values_list(*[lookup for _, lookup in self.columns]).iterator(
+            chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE
+        )
+        blocks = _blocks(ENCODERS[output](headers, rows))
+        return _gzipped(blocks) if compress else blocks
+
+    def filename(self, output, compress=False):
+        return f"{self.name}-{timezone.now():%Y%m%d}.{output}{'.gz' if compress else ''}"
+
+
+class ExportAPIView(generics.GenericAPIView):
+    """
+    GET ?output=csv|ndjson (default csv), ?gzip=true for a .gz download.
+    Subclasses set `export`, and filter_fields / date_filter_field like
+    the matching list view.
+    """
+    export = None
+    pagination_class = None
+
+    def get_queryset(self):
+        return self.export.queryset.all()
+
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get("output", "csv")
+        if output not in ENCODERS:
+            raise ValidationError({"output": "Use one of: csv, ndjson"})
+        compress = request.query_params.get("gzip", "").lower() in ("1", "true", "yes")
+
+        response = StreamingHttpResponse(
+            self.export.stream(output, compress, queryset=self.filter_queryset(self.get_queryset())),
+            content_type="application/gzip" if compress else CONTENT_TYPES[output],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.export.filename(output, compress)}"'
+        # Let nginx pass blocks on as they come instead of buffering the file
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class ExportCommand(BaseCommand):
+    """Write `export` to --path (default stdout) as CSV or NDJSON."""
+    export = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", choices=sorted(ENCODERS), default="csv")
+        parser.add_argument("--gzip", action="store_true", help="Compress with gzip.")
+        parser.add_argument("--path", help="File to write; stdout when omitted.")
+        parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        blocks = self.export.stream(options["output"], options["gzip"], chunk_size=options["chunk_size"])
+        if not options["path"]:
+            if options["gzip"]:
+                for block in blocks:
+                    sys.stdout.buffer.write(block)
+            else:
+                # Blocks hold whole lines, so each one decodes on its own
+                for block in blocks:
+                    self.stdout.write(block.decode(), ending="")
+            return
+
+        written = 0
+        with open(options["path"], "wb") as handle:
+            for block in blocks:
+                handle.write(block)
+                written += len(block)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['path']}"))
@@ -0,0 +1,237 @@
+"""
+Geohash spatial index for models with latitude/longitude.
+
+Models keep a `geohash` column (12 characters, indexed) next to their
+coordinates. A geohash is a Z-order curve written in base32, so every cell
+at any precision is a contiguous range of the sorted column:
+
+    "tv5" covers geohash >= "tv5" AND geohash <= "tv5~"
+
+A bounding box is covered by a handful of cells at a precision chosen from
+the box size, adjacent cells are merged into ranges, and each range is an
+index range scan. Candidates are then trimmed by exact coordinates and
+haversine distance, so queries touch only rows near the box instead of the
+whole table. Works on any database; no GIS extensions needed.
+"""
+import math
+
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Upper bound on the cells used to cover one box; more cells give a tighter
+# cover but more index range scans.
+MAX_COVER_CELLS = 16
+
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 500.0
+DEFAULT_NEARBY_LIMIT = 20
+
+LATITUDE_VALIDATORS = [MinValueValidator(-90), MaxValueValidator(90)]
+LONGITUDE_VALIDATORS = [MinValueValidator(-180), MaxValueValidator(180)]
+
+
+def _bits(precision):
+    total = precision * 5
+    return (total + 1) // 2, total // 2  # longitude bits, latitude bits
+
+
+def _cell_index(lat, lng, precision):
+    lng_bits, lat_bits = _bits(precision)
+    lat_index = int((lat + 90.0) / 180.0 * (1 << lat_bits))
+    lng_index = int((lng + 180.0) / 360.0 * (1 << lng_bits))
+    return (
+        min(max(lat_index, 0), (1 << lat_bits) - 1),
+        min(max(lng_index, 0), (1 << lng_bits) - 1),
+    )
+
+
+def _interleave(lat_index, lng_index, precision):
+    """Z-order value of a cell; longitude takes the first bit, as in geohash."""
+    lng_bits, lat_bits = _bits(precision)
+    value = 0
+    for position in range(precision * 5):
+        if position % 2 == 0:
+            lng_bits -= 1
+            bit = (lng_index >> lng_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (lat_index >> lat_bits) & 1
+        value = (value << 1) | bit
+    return value
+
+
+def _to_base32(value, precision):
+    chars = []
+    for _ in range(precision):
+        chars.append(BASE32[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def encode(lat, lng, precision=PRECISION):
+    lat_index, lng_index = _cell_index(float(lat), float(lng), precision)
+    return _to_base32(_interleave(lat_index, lng_index, precision), precision)
+
+
+def point_geohash(latitude, longitude):
+    """Value for a model's geohash column; None when it has no coordinates."""
+    if latitude is None or longitude is None:
+        return None
+    return encode(latitude, longitude)
+
+
+def save_fields(update_fields):
+    """update_fields for Model.save() that keep geohash with the coordinates."""
+    if update_fields is None:
+        return None
+    update_fields = set(update_fields)
+    if update_fields & {"latitude", "longitude"}:
+        update_fields.add("geohash")
+    return update_fields
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, map(float, (lat1, lng1, lat2, lng2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def box_around(lat, lng, radius_km):
+    """(min_lat, min_lng, max_lat, max_lng) enclosing a circle."""
+    lat, lng = float(lat), float(lng)
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(lat - lat_delta, -90.0), min(lat + lat_delta, 90.0)
+
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 89.9:
+        return min_lat, -180.0, max_lat, 180.0
+
+    lng_delta = radius_km / (KM_PER_DEGREE * math.cos(math.radians(widest)))
+    if lng_delta >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    # Boxes crossing the antimeridian are widened to the full longitude range
+    if lng - lng_delta < -180.0 or lng + lng_delta > 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    return min_lat, lng - lng_delta, max_lat, lng + lng_delta
+
+
+def cover(min_lat, min_lng, max_lat, max_lng):
+    """
+    Geohash ranges [(low, high), ...] covering the box, using the finest
+    precision that needs at most MAX_COVER_CELLS cells.
+    """
+    for precision in range(PRECISION, 0, -1):
+        low_lat, low_lng = _cell_index(min_lat, min_lng, precision)
+        high_lat, high_lng = _cell_index(max_lat, max_lng, precision)
+        count = (high_lat - low_lat + 1) * (high_lng - low_lng + 1)
+        if count <= MAX_COVER_CELLS or precision == 1:
+            break
+
+    values = sorted(
+        _interleave(lat_index, lng_index, precision)
+        for lat_index in range(low_lat, high_lat + 1)
+        for lng_index in range(low_lng, high_lng + 1)
+    )
+
+    ranges = []
+    for value in values:
+        if ranges and ranges[-1][1] == value - 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+
+    return [
+        (_to_base32(low, precision), _to_base32(high, precision) + "~")
+        for low, high in ranges
+    ]
+
+
+def within_box(queryset, min_lat, min_lng, max_lat, max_lng):
+    ranges = Q()
+    for low, high in cover(min_lat, min_lng, max_lat, max_lng):
+        ranges |= Q(geohash__gte=low, geohash__lte=high)
+
+    return queryset.filter(ranges).filter(
+        latitude__gte=min_lat,
+        latitude__lte=max_lat,
+        longitude__gte=min_lng,
+        longitude__lte=max_lng,
+    )
+
+
+def nearest(queryset, lat, lng, limit, max_radius_km, start_radius_km=1.0):
+    """
+    [(pk, distance_km), ...] for the `limit` rows closest to the point and
+    within max_radius_km, closest first. The search radius doubles until
+    enough rows are found, so a dense area never reads far-away rows.
+    """
+    radius = min(start_radius_km, max_radius_km)
+    while True:
+        # No ORDER BY, or SQLite may walk the ordering index instead of the cells
+        candidates = within_box(queryset, *box_around(lat, lng, radius)).order_by()
+        found = sorted(
+            (haversine_km(lat, lng, row_lat, row_lng), pk)
+            for pk, row_lat, row_lng in candidates.values_list("pk", "latitude", "longitude")
+        )
+        found = [(pk, distance) for distance, pk in found if distance <= radius]
+        if len(found) >= limit or radius >= max_radius_km:
+            return found[:limit]
+        radius = min(radius * 2, max_radius_km)
+
+
+# ======================================================
+# REQUEST / SERIALIZER HELPERS
+# ======================================================
+
+def validate_point(attrs, instance=None):
+    """Serializer validate() hook: coordinates come in pairs."""
+    latitude = attrs.get("latitude", getattr(instance, "latitude", None))
+    longitude = attrs.get("longitude", getattr(instance, "longitude", None))
+    if (latitude is None) != (longitude is None):
+        raise ValidationError("Provide both latitude and longitude, or neither.")
+    return attrs
+
+
+def float_param(request, name, default=None, low=None, high=None):
+    raw = request.query_params.get(name)
+    if raw in (None, ""):
+        if default is None:
+            raise ValidationError({name: "This parameter is required"})
+        return default
+
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValidationError({name: "Must be a number"})
+    if not math.isfinite(value) or (low is not None and value < low) or (high is not None and value > high):
+        raise ValidationError({name: f"Must be between {low} and {high}"})
+    return value
+
+
+def box_params(request):
+    min_lat = float_param(request, "min_lat", low=-90, high=90)
+    max_lat = float_param(request, "max_lat", low=-90, high=90)
+    min_lng = float_param(request, "min_lng", low=-180, high=180)
+    max_lng = float_param(request, "max_lng", low=-180, high=180)
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValidationError("min_lat/min_lng must not exceed max_lat/max_lng")
+    return min_lat, min_lng, max_lat, max_lng
+
+
+def nearby_params(request):
+    """(lat, lng, radius_km, limit) from ?lat=&lng=&radius_km=&limit="""
+    lat = float_param(request, "lat", low=-90, high=90)
+    lng = float_param(request, "lng", low=-180, high=180)
+    radius_km = float_param(request, "radius_km", DEFAULT_RADIUS_KM, low=0, high=MAX_RADIUS_KM)
+    limit = int(float_param(request, "limit", DEFAULT_NEARBY_LIMIT, low=1, high=settings.API_MAX_PAGE_SIZE))
+    return lat, lng, radius_km, limit
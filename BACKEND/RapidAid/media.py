@@ -0,0 +1,262 @@
+"""
+Media file serving.
+
+Django only decides whether a file may be sent; incident media needs a
+signed URL (see signed_url(), valid for one to two
+MEDIA_URL_SIGNATURE_SECONDS windows) or a staff session. The bytes are
+then sent by, in order of preference:
+
+- the front web server, when MEDIA_SENDFILE_BACKEND is "nginx"
+  (X-Accel-Redirect to MEDIA_SENDFILE_PREFIX, an internal location aliased
+  to MEDIA_ROOT) or "xsendfile" (Apache mod_xsendfile, lighttpd);
+- Django otherwise, honouring a single-range Range header (206) so videos
+  can seek, and the WSGI server's file wrapper for whole files.
+
+An nginx setup for the first option:
+
+    location /protected-media/ {
+        internal;
+        alias /srv/rapidaid/media/;
+    }
+
+Both paths answer If-None-Match / If-Modified-Since with 304 before
+touching the file contents. Content-addressed blobs (incidents/blobs.py)
+never change under their name, so they carry their sha256 as a strong
+ETag and an immutable Cache-Control. Only files outside the protected
+prefixes may sit in shared caches: a signed URL may be kept privately
+until its signature expires, and a staff session's unsigned URL varies on
+the cookie.
+
+Paths are normalized before any check, and paths that climb out of
+MEDIA_ROOT or are absolute are refused, so dot segments cannot dodge the
+protected prefixes.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import time
+from pathlib import PurePosixPath
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import serializers
+
+from incidents.blobs import BLOB_DIR, IMMUTABLE_CACHE_CONTROL, PRIVATE_IMMUTABLE_CACHE_CONTROL
+
+# Files below these prefixes are only served on a valid signature
+PROTECTED_PREFIXES = ("incidents/",)
+
+READ_BLOCK_BYTES = 64 * 1024
+
+_signer = signing.Signer(salt="RapidAid.media")
+
+
+# ------------------------------------------------------------
+# Signed URLs
+# ------------------------------------------------------------
+
+def _window(now=None):
+    return int((now or time.time()) // settings.MEDIA_URL_SIGNATURE_SECONDS)
+
+
+def sign(name, now=None):
+    """
+    Signature for media `name`. It stays the same within a window, so
+    browsers and cached API payloads keep reusing one URL.
+    """
+    window = _window(now)
+    signature = _signer.sign(f"{window}:{name}").rsplit(":", 1)[1]
+    return f"{window}.{signature}"
+
+
+def signature_valid(name, token, now=None):
+    window, _, signature = (token or "").partition(".")
+    if not window.isdigit() or int(window) not in (_window(now), _window(now) - 1):
+        return False
+    try:
+        _signer.unsign(f"{window}:{name}:{signature}")
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def signature_expires_in(token, now=None):
+    """Seconds until the valid signature `token` stops being accepted."""
+    window = int(token.partition(".")[0])
+    expires_at = (window + 2) * settings.MEDIA_URL_SIGNATURE_SECONDS
+    return max(int(expires_at - (now or time.time())), 0)
+
+
+def signed_url(name):
+    return f"{default_storage.url(name)}?{urlencode({'sig': sign(name)})}"
+
+
+class SignedMediaField(serializers.FileField):
+    """FileField whose URLs carry a media signature."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = signed_url(value.name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+# ------------------------------------------------------------
+# Serving
+# ------------------------------------------------------------
+
+def is_immutable(path):
+    return path.startswith(f"{BLOB_DIR}/")
+
+
+def normalized(path):
+    """`path` relative to MEDIA_ROOT without dot segments, or None if it leaves it."""
+    if path.startswith("/") or ".." in path.split("/"):
+        return None
+    path = posixpath.normpath(path)
+    return None if path in (".", "") or path.startswith("/") else path
+
+
+def authorization(request, path):
+    """
+    What lets the request read normalized `path`: "public", "signature" or
+    "session"; None when nothing does.
+    """
+    if not path.startswith(PROTECTED_PREFIXES):
+        return "public"
+    if signature_valid(path, request.GET.get("sig")):
+        return "signature"
+    user = getattr(request, "user", None)
+    if user and user.is_authenticated and (user.is_staff or getattr(user, "is_admin_role", False)):
+        return "session"
+    return None
+
+
+def _etag(path, stat):
+    if is_immutable(path):
+        return f'"{PurePosixPath(path).stem}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def requested_range(request, size, etag, last_modified):
+    """
+    (start, end) inclusive for a satisfiable single-range request, "invalid"
+    when it cannot be satisfied, or None to send the whole file.
+    """
+    header = request.META.get("HTTP_RANGE", "")
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header)
+    if not match or match.groups() == ("", ""):
+        return None  # absent, malformed or multi-range: send everything
+
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != last_modified:
+        return None  # the client's partial copy is stale
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        return "invalid"
+    return start, end
+
+
+def _read_range(full_path, start, end):
+    with open(full_path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining:
+            block = file.read(min(READ_BLOCK_BYTES, remaining))
+            if not block:
+                return
+            remaining -= len(block)
+            yield block
+
+
+def _offloaded(path, full_path):
+    response = HttpResponse()
+    if settings.MEDIA_SENDFILE_BACKEND == "nginx":
+        response["X-Accel-Redirect"] = f"{settings.MEDIA_SENDFILE_PREFIX.rstrip('/')}/{quote(path)}"
+    else:
+        response["X-Sendfile"] = full_path
+    return response
+
+
+def _streamed(request, full_path, size, etag, last_modified):
+    byte_range = requested_range(request, size, etag, last_modified)
+    if byte_range == "invalid":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is None:
+        return FileResponse(open(full_path, "rb"))
+
+    start, end = byte_range
+    response = StreamingHttpResponse(_read_range(full_path, start, end), status=206)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(end - start + 1)
+    return response
+
+
+def serve(request, path):
+    """GET/HEAD /media/<path>"""
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponse(status=405, headers={"Allow": "GET, HEAD"})
+
+    path = normalized(path)
+    if path is None:
+        raise Http404("Not found")
+
+    # Checked first, so unsigned requests cannot probe which files exist
+    authorized_by = authorization(request, path)
+    if authorized_by is None:
+        return HttpResponseForbidden("Invalid or expired media signature")
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except (ValueError, SuspiciousFileOperation):
+        raise Http404("Not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Not found")
+
+    stat = os.stat(full_path)
+    etag = _etag(path, stat)
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.MEDIA_SENDFILE_BACKEND:
+            response = _offloaded(path, full_path)
+        else:
+            response = _streamed(request, full_path, stat.st_size, etag, last_modified)
+
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response["Content-Type"] = content_type or "application/octet-stream"
+        if encoding:
+            response["Content-Encoding"] = encoding
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    immutable = is_immutable(path)
+    if authorized_by == "public":
+        if immutable:
+            response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    elif authorized_by == "signature":
+        # Anyone holding the URL could read it from a shared cache after expiry
+        cache_control = f"private, max-age={signature_expires_in(request.GET['sig'])}"
+        response["Cache-Control"] = f"{cache_control}, immutable" if immutable else cache_control
+    else:
+        response["Cache-Control"] = PRIVATE_IMMUTABLE_CACHE_CONTROL if immutable else "private"
+        patch_vary_headers(response, ["Cookie"])
+    return response
@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination used by every list endpoint.
+
+    Views declare `cursor_ordering`, e.g. ("-created_at", "-id"). The first
+    field is the cursor key and must be backed by a composite index together
+    with "-id", which breaks ties between rows sharing the same timestamp.
+    Rows inserted while a client is paging never shift the following pages.
+
+    ?ordering=<key> or ?ordering=-<key> (e.g. ?ordering=created_at) flips
+    the direction of the whole ordering; other values are ignored.
+    """
+    ordering = ("-created_at", "-id")
+    ordering_param = "ordering"
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        cursor_ordering = getattr(view, "cursor_ordering", None)
+        if cursor_ordering:
+            self.ordering = cursor_ordering
+
+            requested = request.query_params.get(self.ordering_param, "")
+            if requested.lstrip("-") == cursor_ordering[0].lstrip("-"):
+                prefix = "-" if requested.startswith("-") else ""
+                self.ordering = tuple(prefix + field.lstrip("-") for field in cursor_ordering)
+
+        return super().get_ordering(request, queryset, view)
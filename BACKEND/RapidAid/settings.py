@@ -15,6 +15,8 @@ from datetime import timedelta
 import os
 import re
 
+from corsheaders.defaults import default_headers
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -70,6 +72,9 @@ INSTALLED_APPS = [
     'donations',   
     'incidents',
     'ledger',
+    'dashboard',
+    'benchmarks',
+    'notifications',
     'Authapp',
     "rest_framework",
     "rest_framework_simplejwt.token_blacklist",
@@ -93,10 +98,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ledger.audit.AuditMiddleware',
 ]
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
+# Chunked media upload headers (incidents/uploads.py)
+CORS_ALLOW_HEADERS = (*default_headers, "upload-offset", "upload-checksum")
+CORS_EXPOSE_HEADERS = ["upload-offset"]
 
 
 ROOT_URLCONF = 'RapidAid.urls'
@@ -128,9 +137,64 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+
+# Cache
+# CACHE_BACKEND: "locmem" (default), "file", or "redis" for any Redis-compatible
+# server (needs the `redis` package).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "rapidaid",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache")),
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+    },
+}
+CACHES = {
+    "default": _CACHE_BACKENDS[CACHE_BACKEND],
+}
+# Whether every worker process sees the same default cache. locmem is per
+# process, so state that must agree across workers (the principal cache,
+# the token blacklist journal) is not kept there unless this is set, e.g.
+# for a single-process server.
+SHARED_CACHE = os.getenv("SHARED_CACHE", str(CACHE_BACKEND != "locmem")).lower() == "true"
+
+# Seconds a cached incident list page / detail payload may live
+INCIDENT_CACHE_TIMEOUT = int(os.getenv("INCIDENT_CACHE_TIMEOUT", "60"))
+
+# Seconds an admin keeps a claimed report from the triage queue
+TRIAGE_LEASE_SECONDS = int(os.getenv("TRIAGE_LEASE_SECONDS", "300"))
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media serving (see RapidAid/media.py). MEDIA_SENDFILE_BACKEND: "" sends
+# files from Django, "nginx" uses X-Accel-Redirect to MEDIA_SENDFILE_PREFIX,
+# "xsendfile" uses X-Sendfile (Apache, lighttpd).
+MEDIA_SENDFILE_BACKEND = os.getenv("MEDIA_SENDFILE_BACKEND", "")
+MEDIA_SENDFILE_PREFIX = os.getenv("MEDIA_SENDFILE_PREFIX", "/protected-media/")
+MEDIA_URL_SIGNATURE_SECONDS = int(os.getenv("MEDIA_URL_SIGNATURE_SECONDS", "3600"))
+
+# Resumable chunked uploads (see incidents/uploads.py). Partial files stay
+# outside MEDIA_ROOT so they are never served; keep them on the same
+# filesystem so finalizing is a rename rather than a copy.
+MEDIA_UPLOAD_TEMP_DIR = os.getenv("MEDIA_UPLOAD_TEMP_DIR", str(BASE_DIR / "media_uploads"))
+MEDIA_UPLOAD_MAX_BYTES = int(os.getenv("MEDIA_UPLOAD_MAX_BYTES", str(500 * 1024 * 1024)))
+MEDIA_UPLOAD_CHUNK_BYTES = int(os.getenv("MEDIA_UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+MEDIA_UPLOAD_EXPIRY_SECONDS = int(os.getenv("MEDIA_UPLOAD_EXPIRY_SECONDS", "86400"))
+
+# Seconds an unreferenced media blob is kept before collect_media_blobs deletes it
+MEDIA_BLOB_GC_GRACE_SECONDS = int(os.getenv("MEDIA_BLOB_GC_GRACE_SECONDS", "3600"))
+
+# Processes rendering photo thumbnails (incidents/derivatives.py); 0 renders inline
+MEDIA_DERIVATIVE_WORKERS = int(os.getenv("MEDIA_DERIVATIVE_WORKERS", "2"))
+
 
 
 # Password validation
@@ -154,11 +218,19 @@ AUTH_USER_MODEL = 'Authapp.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'Authapp.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-
+    'DEFAULT_PAGINATION_CLASS': 'RapidAid.pagination.KeysetCursorPagination',
+    'DEFAULT_FILTER_BACKENDS': (
+        'RapidAid.filters.QueryParamFilterBackend',
+    ),
+    'PAGE_SIZE': int(os.getenv("API_PAGE_SIZE", "50")),
 }
+
+# Upper bound for the opt-in ?page_size= query parameter on list endpoints.
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "200"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -166,6 +238,31 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Seconds an authenticated user (with their donor profile) stays cached
+# between requests; any change to them evicts it at once. Only used with a
+# SHARED_CACHE, since an eviction must reach every worker.
+AUTH_PRINCIPAL_CACHE_SECONDS = int(os.getenv("AUTH_PRINCIPAL_CACHE_SECONDS", "300"))
+
+# Refresh token blacklist Bloom filter (Authapp/blacklist.py): sized for at
+# least TOKEN_BLOOM_MIN_CAPACITY tokens at TOKEN_BLOOM_ERROR_RATE false
+# positives. Other processes' writes are read from a journal in the shared
+# cache whose entries live TOKEN_BLOOM_JOURNAL_SECONDS; a filter idle for
+# longer rebuilds from the table.
+TOKEN_BLOOM_MIN_CAPACITY = int(os.getenv("TOKEN_BLOOM_MIN_CAPACITY", "10000"))
+TOKEN_BLOOM_ERROR_RATE = float(os.getenv("TOKEN_BLOOM_ERROR_RATE", "0.001"))
+TOKEN_BLOOM_JOURNAL_SECONDS = int(os.getenv("TOKEN_BLOOM_JOURNAL_SECONDS", "86400"))
+
+# Expired tokens deleted per transaction by `manage.py prune_tokens`, and
+# seconds between its runs when left running.
+TOKEN_PRUNE_BATCH_SIZE = int(os.getenv("TOKEN_PRUNE_BATCH_SIZE", "1000"))
+TOKEN_PRUNE_INTERVAL_SECONDS = int(os.getenv("TOKEN_PRUNE_INTERVAL_SECONDS", "3600"))
+
+# Entries between two Merkle checkpoints of the ledger (ledger/chain.py)
+LEDGER_CHECKPOINT_INTERVAL = int(os.getenv("LEDGER_CHECKPOINT_INTERVAL", "1024"))
+
+# Rows fetched per database round trip by the streaming exports (RapidAid/exports.py)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'RadidAid',
     'DESCRIPTION': 'API documentation',
@@ -214,3 +311,11 @@ DEFAULT_FROM_EMAIL = os.getenv(
     f"RapidAid <{EMAIL_HOST_USER}>" if EMAIL_HOST_USER else "RapidAid <noreply@rapidaid.local>",
 )
 EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "10"))
+
+# Notification outbox (see notifications/outbox.py)
+# Autosend drains the outbox in a background thread after each commit;
+# disable it when running `manage.py process_email_outbox` as a worker.
+EMAIL_OUTBOX_AUTOSEND = os.getenv("EMAIL_OUTBOX_AUTOSEND", "True").lower() == "true"
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30"))
@@ -0,0 +1,101 @@
+"""
+Shared helpers for the app test suites.
+
+QueryCountMixin guards list endpoints against N+1 regressions: it measures
+an endpoint, adds more rows, measures again and fails if the number of
+queries changed. TemporaryMediaMixin points file storage at a throwaway
+directory.
+"""
+import itertools
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from Authapp.models import User, UserRole
+from incidents.models import Incident, IncidentType, Severity
+
+_sequence = itertools.count(1)
+
+
+def make_user(role=UserRole.CITIZEN, **extra_fields):
+    number = next(_sequence)
+    return User.objects.create_user(
+        email=f"user{number}@rapidaid.test",
+        full_name=f"User {number}",
+        password=None,
+        role=role,
+        **extra_fields
+    )
+
+
+def make_incident(reporter=None, **extra_fields):
+    number = next(_sequence)
+    fields = {
+        "reporter": reporter,
+        "title": f"Incident {number}",
+        "description": "Test incident",
+        "incident_type": IncidentType.FLOOD,
+        "severity": Severity.HIGH,
+        "location": "Kathmandu",
+        "incident_date": "2025-01-01",
+    }
+    fields.update(extra_fields)
+    return Incident.objects.create(**fields)
+
+
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class QueryCountMixin:
+    """
+    Mix into a TestCase and call assertConstantQueries(client, url, add_rows),
+    where add_rows() inserts a few more rows that `url` will return.
+    """
+    growth_rounds = 3
+
+    def count_queries(self, client, url):
+        # Measure the uncached path; a cache hit would hide per-row queries
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, client, url, add_rows):
+        add_rows()
+        baseline = self.count_queries(client, url)
+
+        for _ in range(self.growth_rounds):
+            add_rows()
+
+        grown = self.count_queries(client, url)
+        self.assertEqual(
+            baseline,
+            grown,
+            f"{url} ran {baseline} queries before and {grown} after adding rows; "
+            "the endpoint is doing per-row queries"
+        )
+
+
+class TemporaryMediaMixin:
+    """MEDIA_ROOT (as self.media_root) and upload scratch space under a temporary directory."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.media_root = Path(directory.name)
+
+        settings = self.settings(
+            MEDIA_ROOT=directory.name,
+            MEDIA_UPLOAD_TEMP_DIR=str(self.media_root / "partial"),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
@@ -1,8 +1,9 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from django.conf import settings
-from django.conf.urls.static import static
+
+from RapidAid.media import serve as serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,11 +14,14 @@ urlpatterns = [
     path('api/rescue/', include('rescue.urls')),
     path('api/incidents/', include('incidents.urls')),
     path('api/volunteer/', include("volunteer.urls")),
+    path('api/dashboard/', include('dashboard.urls')),
+    path('api/notifications/', include('notifications.urls')),
 
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 ]
 
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Media: authorized here, sent by the web server when sendfile is set up
+urlpatterns += [
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$", serve_media, name="media"),
+]
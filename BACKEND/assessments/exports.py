@@ -0,0 +1,41 @@
+from RapidAid.exports import Export
+
+from .models import AffectedFamily, LossAssessment
+
+AFFECTED_FAMILIES = Export(
+    "affected-families",
+    AffectedFamily.objects.order_by("-created_at", "-id"),
+    [
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("incident_id", "incident_id"),
+        ("incident_title", "incident__title"),
+        ("head_of_family_name", "head_of_family_name"),
+        ("contact_number", "contact_number"),
+        ("address", "address"),
+        ("latitude", "latitude"),
+        ("longitude", "longitude"),
+        ("total_members", "total_members"),
+        ("injured_members", "injured_members"),
+        ("deceased_members", "deceased_members"),
+        ("is_verified", "is_verified"),
+    ],
+)
+
+LOSS_ASSESSMENTS = Export(
+    "loss-assessments",
+    LossAssessment.objects.order_by("-assessed_at", "-id"),
+    [
+        ("id", "id"),
+        ("assessed_at", "assessed_at"),
+        ("family_id", "family_id"),
+        ("head_of_family_name", "family__head_of_family_name"),
+        ("incident_id", "incident_id"),
+        ("house_damage", "house_damage"),
+        ("estimated_property_loss", "estimated_property_loss"),
+        ("livestock_lost", "livestock_lost"),
+        ("crops_lost", "crops_lost"),
+        ("remarks", "remarks"),
+        ("assessed_by", "assessed_by_id"),
+    ],
+)
@@ -0,0 +1,7 @@
+from assessments.exports import AFFECTED_FAMILIES
+from RapidAid.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream every affected family as CSV or NDJSON."
+    export = AFFECTED_FAMILIES
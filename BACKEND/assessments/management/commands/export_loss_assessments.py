@@ -0,0 +1,7 @@
+from assessments.exports import LOSS_ASSESSMENTS
+from RapidAid.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream every loss assessment as CSV or NDJSON."
+    export = LOSS_ASSESSMENTS
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0001_initial'),
+        ('incidents', '0003_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='affectedfamily',
+            index=models.Index(fields=['-created_at', '-id'], name='family_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lossassessment',
+            index=models.Index(fields=['-assessed_at', '-id'], name='loss_assessed_id_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_cursor_pagination_indexes'),
+        ('incidents', '0004_list_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='affectedfamily',
+            index=models.Index(fields=['incident', '-created_at'], name='family_incident_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lossassessment',
+            index=models.Index(fields=['house_damage', '-assessed_at'], name='loss_damage_assessed_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:29
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_list_filter_indexes'),
+        ('incidents', '0006_coordinates_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='affectedfamily',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='affectedfamily',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='affectedfamily',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='affectedfamily',
+            index=models.Index(fields=['geohash'], name='family_geohash_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_family_incident(apps, schema_editor):
+    AffectedFamily = apps.get_model("assessments", "AffectedFamily")
+    LossAssessment = apps.get_model("assessments", "LossAssessment")
+    LossAssessment.objects.update(incident_id=Subquery(
+        AffectedFamily.objects.filter(pk=OuterRef("family_id")).values("incident_id")[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0004_coordinates_geohash'),
+        ('incidents', '0006_coordinates_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lossassessment',
+            name='incident',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='loss_assessments', to='incidents.incident'),
+        ),
+        migrations.RunPython(copy_family_incident, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='lossassessment',
+            name='incident',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='loss_assessments', to='incidents.incident'),
+        ),
+        migrations.AddIndex(
+            model_name='affectedfamily',
+            index=models.Index(fields=['is_verified', '-created_at', '-id'], name='family_verified_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lossassessment',
+            index=models.Index(fields=['incident', '-assessed_at', '-id'], name='loss_incident_assessed_idx'),
+        ),
+    ]
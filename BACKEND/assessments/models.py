@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from incidents.models import Incident
+from RapidAid.geo import LATITUDE_VALIDATORS, LONGITUDE_VALIDATORS, point_geohash, save_fields
 
 
 # =========================================
@@ -16,6 +17,21 @@ class AffectedFamily(models.Model):
     head_of_family_name = models.CharField(max_length=150)
     contact_number = models.CharField(max_length=20)
     address = models.CharField(max_length=255)
+    latitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        validators=LATITUDE_VALIDATORS
+    )
+    longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        validators=LONGITUDE_VALIDATORS
+    )
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
 
     total_members = models.PositiveIntegerField()
     injured_members = models.PositiveIntegerField(default=0)
@@ -25,6 +41,25 @@ class AffectedFamily(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="family_created_id_idx"),
+            models.Index(fields=["incident", "-created_at"], name="family_incident_created_idx"),
+            models.Index(fields=["is_verified", "-created_at", "-id"], name="family_verified_created_idx"),
+            models.Index(fields=["geohash"], name="family_geohash_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        self.geohash = point_geohash(self.latitude, self.longitude)
+        kwargs["update_fields"] = save_fields(kwargs.get("update_fields"))
+        super().save(*args, **kwargs)
+        if not adding:
+            # Keep the copy on the loss assessment in step
+            LossAssessment.objects.filter(family=self).exclude(
+                incident_id=self.incident_id
+            ).update(incident_id=self.incident_id)
+
     def __str__(self):
         return f"{self.head_of_family_name} - {self.incident.title}"
 
@@ -39,6 +74,16 @@ class LossAssessment(models.Model):
         related_name="loss_assessment"
     )
 
+    # Copied from family.incident so ?incident= is an index range scan;
+    # led by loss_incident_assessed_idx, so no index of its own
+    incident = models.ForeignKey(
+        Incident,
+        on_delete=models.CASCADE,
+        related_name="loss_assessments",
+        editable=False,
+        db_index=False
+    )
+
     house_damage = models.CharField(
         max_length=50,
         choices=[
@@ -66,5 +111,19 @@ class LossAssessment(models.Model):
 
     assessed_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-assessed_at", "-id"], name="loss_assessed_id_idx"),
+            models.Index(fields=["house_damage", "-assessed_at"], name="loss_damage_assessed_idx"),
+            models.Index(fields=["incident", "-assessed_at", "-id"], name="loss_incident_assessed_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.incident_id = self.family.incident_id
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"family", "family_id"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "incident"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Loss Assessment - {self.family.head_of_family_name}"
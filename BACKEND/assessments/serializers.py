@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import AffectedFamily, LossAssessment
+from RapidAid.geo import validate_point
 
 
 # -----------------------------------------
@@ -14,7 +15,10 @@ class AffectedFamilySerializer(serializers.ModelSerializer):
     class Meta:
         model = AffectedFamily
         fields = "__all__"
-        read_only_fields = ["created_at"]
+        read_only_fields = ["created_at", "geohash"]
+
+    def validate(self, attrs):
+        return validate_point(attrs, self.instance)
 
 
 # -----------------------------------------
@@ -1,3 +1,136 @@
+import csv
+import io
+import json
+
 from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .models import AffectedFamily, LossAssessment
+from .views import AffectedFamilyListAPIView, LossAssessmentListAPIView
+from Authapp.models import UserRole
+from RapidAid.filters import QueryParamFilterBackend
+from RapidAid.testing import QueryCountMixin, api_client, make_incident, make_user
+
+
+class AssessmentQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.assessor = make_user(role=UserRole.ASSESSMENT_TEAM)
+        self.client = api_client(self.assessor)
+
+    def add_family(self):
+        family = AffectedFamily.objects.create(
+            incident=make_incident(),
+            head_of_family_name="Ram",
+            contact_number="9800000000",
+            address="Ward 4",
+            total_members=5,
+        )
+        LossAssessment.objects.create(
+            family=family,
+            house_damage="partial",
+            estimated_property_loss=25000,
+            assessed_by=self.assessor,
+        )
+
+    def test_family_list_queries_do_not_grow_with_rows(self):
+        self.assertConstantQueries(self.client, "/api/assessments/families/", self.add_family)
+
+    def test_loss_list_queries_do_not_grow_with_rows(self):
+        self.assertConstantQueries(self.client, "/api/assessments/loss/", self.add_family)
+
+
+class AffectedFamilyGeoTests(TestCase):
+    def test_nearby_families_are_ordered_by_distance(self):
+        incident = make_incident()
+        far, near = [
+            AffectedFamily.objects.create(
+                incident=incident,
+                head_of_family_name=name,
+                contact_number="9800000000",
+                address="Ward 4",
+                total_members=4,
+                latitude=latitude,
+                longitude="85.324000",
+            )
+            for name, latitude in [("Far", "27.740000"), ("Near", "27.718000")]
+        ]
+        client = api_client(make_user(role=UserRole.ASSESSMENT_TEAM))
+
+        response = client.get("/api/assessments/families/nearby/", {"lat": 27.7172, "lng": 85.324})
+
+        self.assertEqual([row["id"] for row in response.data["results"]], [near.id, far.id])
+
+
+class AssessmentExportTests(TestCase):
+    def setUp(self):
+        self.incident, other = make_incident(), make_incident()
+        self.families = [
+            AffectedFamily.objects.create(
+                incident=incident,
+                head_of_family_name=name,
+                contact_number="9800000000",
+                address="Ward 4",
+                total_members=4,
+            )
+            for incident, name in [(self.incident, "Sita"), (other, "Hari")]
+        ]
+        LossAssessment.objects.create(
+            family=self.families[0], house_damage="full", estimated_property_loss=1000, remarks="Roof gone",
+        )
+        self.client = api_client(make_user(role=UserRole.ASSESSMENT_TEAM))
+
+    def content(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_family_export_is_filtered_like_the_list(self):
+        response = self.client.get(f"/api/assessments/families/export/?output=ndjson&incident={self.incident.pk}")
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([(row["id"], row["head_of_family_name"]) for row in rows], [(self.families[0].pk, "Sita")])
+
+    def test_loss_export_as_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.content(self.client.get("/api/assessments/loss/export/")))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            (rows[0]["head_of_family_name"], rows[0]["house_damage"], rows[0]["remarks"]), ("Sita", "full", "Roof gone")
+        )
+
+    def test_citizens_cannot_export(self):
+        response = api_client(make_user()).get("/api/assessments/families/export/")
+        self.assertEqual(response.status_code, 403)
+
+
+class AssessmentFilterTests(TestCase):
+    def setUp(self):
+        self.incident = make_incident()
+        self.family = AffectedFamily.objects.create(
+            incident=self.incident,
+            head_of_family_name="Gita",
+            contact_number="9800000000",
+            address="Ward 2",
+            total_members=3,
+        )
+        self.loss = LossAssessment.objects.create(family=self.family, house_damage="none", estimated_property_loss=0)
+
+    def test_loss_assessments_carry_their_familys_incident(self):
+        client = api_client(make_user(role=UserRole.ASSESSMENT_TEAM))
+        response = client.get(f"/api/assessments/loss/?incident={self.incident.pk}")
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.loss.pk])
+
+        moved = make_incident()
+        self.family.incident = moved
+        self.family.save()
+        self.loss.refresh_from_db()
+        self.assertEqual(self.loss.incident_id, moved.pk)
+
+    def test_filters_use_composite_indexes(self):
+        def filtered(view, query):
+            request = Request(APIRequestFactory().get("/", query))
+            return QueryParamFilterBackend().filter_queryset(request, view.queryset, view)
 
-# Create your tests here.
+        families = filtered(AffectedFamilyListAPIView, {"is_verified": "True"})
+        losses = filtered(LossAssessmentListAPIView, {"incident": self.incident.pk})
+        self.assertIn("family_verified_created_idx", families.explain())
+        self.assertIn("loss_incident_assessed_idx", losses.explain())
+        self.assertEqual(list(families), [])
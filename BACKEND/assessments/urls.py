@@ -2,8 +2,12 @@ from django.urls import path
 from .views import (
     AddAffectedFamilyAPIView,
     AffectedFamilyListAPIView,
+    AffectedFamilyExportAPIView,
+    AffectedFamilyNearbyAPIView,
+    AffectedFamilyWithinAPIView,
     LossAssessmentAPIView,
     LossAssessmentListAPIView,
+    LossAssessmentExportAPIView,
     LossAssessmentDetailAPIView,
 )
 
@@ -11,9 +15,13 @@ urlpatterns = [
     # Affected families
     path("families/add/", AddAffectedFamilyAPIView.as_view(), name="add-family"),
     path("families/", AffectedFamilyListAPIView.as_view(), name="family-list"),
+    path("families/export/", AffectedFamilyExportAPIView.as_view(), name="family-export"),
+    path("families/nearby/", AffectedFamilyNearbyAPIView.as_view(), name="family-nearby"),
+    path("families/within/", AffectedFamilyWithinAPIView.as_view(), name="family-within"),
 
     # Loss assessment
     path("loss/add/", LossAssessmentAPIView.as_view(), name="loss-add"),
     path("loss/", LossAssessmentListAPIView.as_view(), name="loss-list"),
+    path("loss/export/", LossAssessmentExportAPIView.as_view(), name="loss-export"),
     path("loss/<int:pk>/", LossAssessmentDetailAPIView.as_view(), name="loss-detail"),
 ]
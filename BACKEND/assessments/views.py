@@ -1,12 +1,16 @@
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 
+from .exports import AFFECTED_FAMILIES, LOSS_ASSESSMENTS
 from .models import AffectedFamily, LossAssessment
 from .serializers import (
     AffectedFamilySerializer,
     LossAssessmentSerializer
 )
-from Authapp.permissions import IsAdminRole
+from Authapp.permissions import IsAdminOrAssessmentTeam, IsAdminRole
+from RapidAid import geo
+from RapidAid.exports import ExportAPIView
 from incidents.models import IncidentStatus
 
 
@@ -36,7 +40,59 @@ class AddAffectedFamilyAPIView(generics.CreateAPIView):
 class AffectedFamilyListAPIView(generics.ListAPIView):
     serializer_class = AffectedFamilySerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = AffectedFamily.objects.all().order_by("-created_at")
+    cursor_ordering = ("-created_at", "-id")
+    filter_fields = {
+        "incident": "incident",
+        "is_verified": "is_verified",
+    }
+    date_filter_field = "created_at"
+    queryset = AffectedFamily.objects.select_related(
+        "incident"
+    ).order_by("-created_at", "-id")
+
+
+class AffectedFamilyExportAPIView(ExportAPIView):
+    """?output=csv|ndjson&gzip=true, filtered like the list."""
+    permission_classes = [IsAdminOrAssessmentTeam]
+    export = AFFECTED_FAMILIES
+    filter_fields = AffectedFamilyListAPIView.filter_fields
+    date_filter_field = "created_at"
+
+
+# =========================================
+# AFFECTED FAMILIES NEAR A POINT / INSIDE A BOX
+# =========================================
+class AffectedFamilyNearbyAPIView(generics.ListAPIView):
+    """?lat=&lng=&radius_km=&limit= — closest families first, with distance_km."""
+    serializer_class = AffectedFamilySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    filter_fields = AffectedFamilyListAPIView.filter_fields
+    date_filter_field = "created_at"
+
+    def list(self, request, *args, **kwargs):
+        lat, lng, radius_km, limit = geo.nearby_params(request)
+        found = geo.nearest(self.filter_queryset(AffectedFamily.objects.all()), lat, lng, limit, radius_km)
+
+        families = AffectedFamily.objects.select_related("incident").in_bulk([pk for pk, _ in found])
+        results = self.get_serializer([families[pk] for pk, _ in found], many=True).data
+        for row, (_, distance) in zip(results, found):
+            row["distance_km"] = round(distance, 3)
+
+        return Response({"results": results})
+
+
+class AffectedFamilyWithinAPIView(generics.ListAPIView):
+    """?min_lat=&min_lng=&max_lat=&max_lng= — families inside a bounding box."""
+    serializer_class = AffectedFamilySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
+    filter_fields = AffectedFamilyListAPIView.filter_fields
+    date_filter_field = "created_at"
+
+    def get_queryset(self):
+        families = AffectedFamily.objects.select_related("incident")
+        return geo.within_box(families, *geo.box_params(self.request)).order_by("-created_at", "-id")
 
 
 # =========================================
@@ -61,7 +117,24 @@ class LossAssessmentAPIView(generics.CreateAPIView):
 class LossAssessmentListAPIView(generics.ListAPIView):
     serializer_class = LossAssessmentSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = LossAssessment.objects.all().order_by("-assessed_at")
+    cursor_ordering = ("-assessed_at", "-id")
+    filter_fields = {
+        "incident": "incident",
+        "family": "family",
+        "house_damage": "house_damage",
+    }
+    date_filter_field = "assessed_at"
+    queryset = LossAssessment.objects.select_related(
+        "family"
+    ).order_by("-assessed_at", "-id")
+
+
+class LossAssessmentExportAPIView(ExportAPIView):
+    """?output=csv|ndjson&gzip=true, filtered like the list."""
+    permission_classes = [IsAdminOrAssessmentTeam]
+    export = LOSS_ASSESSMENTS
+    filter_fields = LossAssessmentListAPIView.filter_fields
+    date_filter_field = "assessed_at"
 
 
 # =========================================
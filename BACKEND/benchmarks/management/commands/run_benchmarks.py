@@ -0,0 +1,91 @@
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from Authapp.models import User, UserRole
+from benchmarks import runner
+from benchmarks.seed import SEEDED_MODELS
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark every API URL and write a JSON report (p50/p95, queries, peak memory)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="benchmark-report.json")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--prefix", default="api/", help="Only benchmark routes starting with this.")
+        parser.add_argument("--email", help="Admin user to authenticate as (defaults to the first admin).")
+        parser.add_argument("--baseline", help="Earlier report to compare against.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(role=UserRole.ADMIN, is_active=True)
+        if options["email"]:
+            users = users.filter(email=options["email"])
+        user = users.order_by("pk").first()
+        if user is None:
+            raise CommandError("No admin user found; run seed_benchmark_data first")
+
+        # Allows the "testserver" host and swaps in the locmem email backend
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            pass  # already set up, e.g. under the test runner
+
+        token = str(RefreshToken.for_user(user).access_token)
+        endpoints = runner.run(
+            token,
+            iterations=options["iterations"],
+            prefix=options["prefix"],
+            log=self.stdout.write,
+        )
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "commit": current_commit(),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "row_counts": {
+                model._meta.label: model._default_manager.count()
+                for model in SEEDED_MODELS
+            },
+            "endpoints": endpoints,
+        }
+
+        with open(options["output"], "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as handle:
+                self.compare(json.load(handle)["endpoints"], endpoints)
+
+    def compare(self, before, after):
+        self.stdout.write(f"{'route':50} {'p95 ms':>20} {'queries':>12}")
+        for route, result in sorted(after.items()):
+            previous = before.get(route)
+            if not previous or "p95_ms" not in result or "p95_ms" not in previous:
+                continue
+            self.stdout.write(
+                f"{route:50} "
+                f"{previous['p95_ms']:>9} -> {result['p95_ms']:<8} "
+                f"{previous['queries']:>4} -> {result['queries']:<4}"
+            )
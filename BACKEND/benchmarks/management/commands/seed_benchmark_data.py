@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.seed import SCALES, BenchmarkSeeder
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic incidents and related rows for the benchmark suite."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+        parser.add_argument("--incidents", type=int, help="Seed this many incidents instead of a --scale.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        incident_count = options["incidents"] or SCALES[options["scale"]]
+        seeder = BenchmarkSeeder(
+            incident_count=incident_count,
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        )
+        seeder.run()
+        self.stdout.write(self.style.SUCCESS(f"Seeded {incident_count} benchmark incidents"))
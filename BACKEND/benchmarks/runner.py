@@ -0,0 +1,159 @@
+"""
+Drive every URL in the root URLconf through the Django test client and
+record latency, query count and peak Python memory per endpoint.
+"""
+import logging
+import math
+import re
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+# <int:pk> style route converters and (?P<pk>...) regex groups
+PARAMETER = re.compile(r"<(?:(?P<converter>\w+):)?(?P<route>\w+)>|\(\?P<(?P<regex>\w+)>[^)]*\)")
+
+# Stand-ins when the table to sample from is empty, per route converter
+PLACEHOLDERS = {"uuid": "00000000-0000-0000-0000-000000000000"}
+
+# Query strings for endpoints that reject a bare GET
+QUERY_STRINGS = {
+    "api/incidents/search/": "q=flood",
+    "api/incidents/nearby/": "lat=27.7&lng=85.3&radius_km=10",
+    "api/incidents/within/": "min_lat=27.6&min_lng=85.2&max_lat=27.8&max_lng=85.5",
+    "api/assessments/families/nearby/": "lat=27.7&lng=85.3&radius_km=10",
+    "api/assessments/families/within/": "min_lat=27.6&min_lng=85.2&max_lat=27.8&max_lng=85.5",
+}
+
+
+def iter_routes(patterns=None, prefix=""):
+    """Yield (route, URLPattern) for every leaf pattern."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern).lstrip("^").rstrip("$")
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            # DRF routers add format-suffix duplicates of every route
+            if any(
+                (match.group("route") or match.group("regex")) == "format"
+                for match in PARAMETER.finditer(route)
+            ):
+                continue
+            yield route, pattern
+
+
+def view_model(pattern):
+    callback = pattern.callback
+    view_class = getattr(callback, "view_class", None) or getattr(callback, "cls", None)
+    queryset = getattr(view_class, "queryset", None)
+    if queryset is not None:
+        return queryset.model
+
+    serializer_class = getattr(view_class, "serializer_class", None)
+    meta = getattr(serializer_class, "Meta", None)
+    return getattr(meta, "model", None)
+
+
+def sample_value(model, name, converter=None):
+    """An existing primary key for `name` (pk, or <field>_id on `model`)."""
+    if model is not None and name.endswith("_id"):
+        field = next(
+            (f for f in model._meta.get_fields() if f.name == name[:-3] and f.related_model),
+            None,
+        )
+        if field is not None:
+            model = field.related_model
+
+    placeholder = PLACEHOLDERS.get(converter, "1")
+    if model is None:
+        return placeholder
+
+    value = model._default_manager.order_by("pk").values_list("pk", flat=True).first()
+    return str(value) if value else placeholder
+
+
+def build_path(route, pattern):
+    model = view_model(pattern)
+
+    def fill(match):
+        return sample_value(model, match.group("route") or match.group("regex"), match.group("converter"))
+
+    path = "/" + PARAMETER.sub(fill, route).replace("\\", "")
+    query = QUERY_STRINGS.get(route)
+    return f"{path}?{query}" if query else path
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def consume(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(client, path, iterations, headers):
+    response = client.get(path, **headers)
+    consume(response)
+    result = {"path": path, "status": response.status_code}
+    if response.status_code == 405:
+        result["skipped"] = "GET not allowed"
+        return result
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(path, **headers)
+        result["response_bytes"] = consume(response)
+    result["queries"] = len(queries.captured_queries)
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        consume(client.get(path, **headers))
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        consume(client.get(path, **headers))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result.update({
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    })
+    return result
+
+
+def run(token, iterations=20, prefix="api/", log=None):
+    log = log or (lambda message: None)
+    client = Client()
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    # 4xx responses are expected (e.g. 405 for POST-only views); keep the log quiet
+    request_logger = logging.getLogger("django.request")
+    previous_level = request_logger.level
+    request_logger.setLevel(logging.ERROR)
+
+    endpoints = {}
+    try:
+        for route, pattern in iter_routes():
+            if not route.startswith(prefix):
+                continue
+            result = measure(client, build_path(route, pattern), iterations, headers)
+            endpoints[route] = result
+            log(f"{result['status']} {result['path']}")
+    finally:
+        request_logger.setLevel(previous_level)
+
+    return endpoints
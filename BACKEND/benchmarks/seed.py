@@ -0,0 +1,280 @@
+"""
+Synthetic data generator for the benchmark suite.
+
+Rows are written with bulk_create in batches, with timestamps spread over
+the last 90 days so keyset pagination and date filters behave as they do
+on real data. bulk_create skips model signals and save(), so geohashes are
+set here and the derived summary tables are rebuilt once seeding is done.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from Authapp.activity import rebuild as rebuild_user_activity
+from Authapp.models import User, UserRole
+from assessments.models import AffectedFamily, LossAssessment
+from dashboard.counters import rebuild as rebuild_dashboard_counters
+from donations.models import Donor, Donation, DonationSummary
+from incidents.models import (
+    Incident,
+    IncidentMedia,
+    IncidentTimeline,
+    IncidentStatus,
+    IncidentType,
+    Severity,
+)
+from ledger import chain as ledger_chain
+from ledger.models import LedgerEntry
+from RapidAid.geo import point_geohash
+from volunteer.models import VolunteerAssignment, VolunteerStatus
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+}
+
+SEEDED_MODELS = [
+    User,
+    Donor,
+    Incident,
+    IncidentTimeline,
+    IncidentMedia,
+    VolunteerAssignment,
+    Donation,
+    AffectedFamily,
+    LossAssessment,
+    LedgerEntry,
+]
+
+STATUS_WEIGHTS = {
+    IncidentStatus.REPORTED: 30,
+    IncidentStatus.VERIFIED: 35,
+    IncidentStatus.REJECTED: 10,
+    IncidentStatus.IN_RESCUE: 15,
+    IncidentStatus.RESOLVED: 10,
+}
+
+HISTORY = timedelta(days=90)
+
+ITEMS = ["Rice", "Blankets", "Tents", "Drinking water", "Medicine kits"]
+
+# Roughly the extent of Nepal
+LATITUDE_RANGE = (26.4, 30.4)
+LONGITUDE_RANGE = (80.1, 88.2)
+
+
+@contextmanager
+def explicit_timestamps(models):
+    """Let bulk_create keep the timestamps we generate instead of now()."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+
+    for field in fields:
+        field.auto_now = False
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class BenchmarkSeeder:
+    def __init__(self, incident_count, seed=0, batch_size=2000, log=None):
+        self.incident_count = incident_count
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.tag = self.now.strftime("%Y%m%d%H%M%S")
+
+    def moment(self, after=None):
+        start = after or self.now - HISTORY
+        span = max(int((self.now - start).total_seconds()), 1)
+        return start + timedelta(seconds=self.random.randint(0, span))
+
+    def point(self, near=None, spread=0.02):
+        if near is None:
+            latitude = self.random.uniform(*LATITUDE_RANGE)
+            longitude = self.random.uniform(*LONGITUDE_RANGE)
+        else:
+            latitude = float(near[0]) + self.random.uniform(-spread, spread)
+            longitude = float(near[1]) + self.random.uniform(-spread, spread)
+        latitude, longitude = round(latitude, 6), round(longitude, 6)
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": point_geohash(latitude, longitude),
+        }
+
+    def run(self):
+        with explicit_timestamps(SEEDED_MODELS), transaction.atomic():
+            self.create_users()
+            for start in range(0, self.incident_count, self.batch_size):
+                size = min(self.batch_size, self.incident_count - start)
+                self.create_incident_batch(size)
+                self.log(f"Seeded {start + size}/{self.incident_count} incidents")
+
+        DonationSummary.rebuild()
+        rebuild_dashboard_counters()
+        rebuild_user_activity()
+
+    def create_users(self):
+        citizen_count = max(50, self.incident_count // 5)
+        password = make_password(None)
+
+        def build(role, count):
+            return [
+                User(
+                    email=f"bench-{self.tag}-{role}-{number}@rapidaid.bench",
+                    full_name=f"Bench {role.replace('_', ' ').title()} {number}",
+                    role=role,
+                    password=password,
+                    date_joined=self.moment(),
+                )
+                for number in range(count)
+            ]
+
+        self.citizens = User.objects.bulk_create(
+            build(UserRole.CITIZEN, citizen_count), batch_size=self.batch_size
+        )
+        self.admins = User.objects.bulk_create(build(UserRole.ADMIN, 5))
+        self.assessors = User.objects.bulk_create(build(UserRole.ASSESSMENT_TEAM, 10))
+
+        self.donors = Donor.objects.bulk_create(
+            [
+                Donor(user=user, created_at=user.date_joined)
+                for user in self.citizens[::2]
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def create_incident_batch(self, size):
+        pick = self.random.choice
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+
+        incidents = []
+        for _ in range(size):
+            created_at = self.moment()
+            status = self.random.choices(statuses, weights)[0]
+            incidents.append(Incident(
+                reporter=pick(self.citizens),
+                title=f"{pick(IncidentType.labels)} near ward {self.random.randint(1, 32)}",
+                description="Synthetic incident generated for benchmarking.",
+                incident_type=pick(IncidentType.values),
+                severity=pick(Severity.values),
+                location=f"Ward {self.random.randint(1, 32)}, District {self.random.randint(1, 77)}",
+                incident_date=created_at.date(),
+                status=status,
+                approved_by=pick(self.admins) if status != IncidentStatus.REPORTED else None,
+                approved_at=self.moment(created_at) if status != IncidentStatus.REPORTED else None,
+                created_at=created_at,
+                updated_at=self.moment(created_at),
+                **self.point(),
+            ))
+        incidents = Incident.objects.bulk_create(incidents, batch_size=self.batch_size)
+
+        timeline, media, volunteers, donations, families, ledger = [], [], [], [], [], []
+        for incident in incidents:
+            for _ in range(self.random.randint(1, 3)):
+                timeline.append(IncidentTimeline(
+                    incident=incident,
+                    title="Incident Update",
+                    description=f"Status updated to {incident.status}",
+                    created_by=pick(self.admins),
+                    created_at=self.moment(incident.created_at),
+                ))
+
+            for number in range(self.random.randint(0, 2)):
+                media.append(IncidentMedia(
+                    incident=incident,
+                    uploaded_by=incident.reporter,
+                    file=f"incidents/media/bench-{incident.pk}-{number}.jpg",
+                    media_type="photo",
+                    uploaded_at=self.moment(incident.created_at),
+                ))
+
+            for user in self.random.sample(self.citizens, self.random.randint(0, 3)):
+                status = pick(VolunteerStatus.values)
+                applied_at = self.moment(incident.created_at)
+                volunteers.append(VolunteerAssignment(
+                    user=user,
+                    incident=incident,
+                    status=status,
+                    applied_at=applied_at,
+                    approved_at=applied_at if status in (VolunteerStatus.APPROVED, VolunteerStatus.COMPLETED) else None,
+                    completed_at=applied_at if status == VolunteerStatus.COMPLETED else None,
+                ))
+
+            for _ in range(self.random.randint(0, 4)):
+                is_money = self.random.random() < 0.6
+                donations.append(Donation(
+                    donor=pick(self.donors),
+                    incident=incident,
+                    donation_type="money" if is_money else "item",
+                    amount=self.random.randint(5, 5000) if is_money else None,
+                    item_name="" if is_money else pick(ITEMS),
+                    quantity=None if is_money else self.random.randint(1, 50),
+                    is_anonymous=self.random.random() < 0.2,
+                    created_at=self.moment(incident.created_at),
+                ))
+
+            for _ in range(self.random.randint(0, 2)):
+                families.append(AffectedFamily(
+                    incident=incident,
+                    head_of_family_name=f"Family {self.random.randint(1, 10_000)}",
+                    contact_number=f"98{self.random.randint(10_000_000, 99_999_999)}",
+                    address=incident.location,
+                    total_members=self.random.randint(1, 9),
+                    injured_members=self.random.randint(0, 2),
+                    created_at=self.moment(incident.created_at),
+                    **self.point(near=(incident.latitude, incident.longitude)),
+                ))
+
+            for action in ["created", "updated"][:self.random.randint(1, 2)]:
+                ledger.append(LedgerEntry(
+                    module="incidents.incident",
+                    reference_id=incident.pk,
+                    action=action,
+                    changed_by=pick(self.admins),
+                    timestamp=self.moment(incident.created_at),
+                    new_data={"status": incident.status},
+                ))
+
+        IncidentTimeline.objects.bulk_create(timeline, batch_size=self.batch_size)
+        IncidentMedia.objects.bulk_create(media, batch_size=self.batch_size)
+        VolunteerAssignment.objects.bulk_create(volunteers, batch_size=self.batch_size)
+        Donation.objects.bulk_create(donations, batch_size=self.batch_size)
+        families = AffectedFamily.objects.bulk_create(families, batch_size=self.batch_size)
+        # Ledger entries are hash-chained, so they go through the chain
+        ledger_chain.append(ledger)
+
+        LossAssessment.objects.bulk_create(
+            [
+                LossAssessment(
+                    family=family,
+                    incident_id=family.incident_id,
+                    house_damage=pick(["none", "partial", "full"]),
+                    estimated_property_loss=self.random.randint(0, 2_000_000),
+                    livestock_lost=self.random.randint(0, 5),
+                    crops_lost=self.random.random() < 0.3,
+                    assessed_by=pick(self.assessors),
+                    assessed_at=self.moment(family.created_at),
+                )
+                for family in families
+                if self.random.random() < 0.6
+            ],
+            batch_size=self.batch_size,
+        )
@@ -0,0 +1,46 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlsplit
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import resolve
+from drf_spectacular.drainage import GENERATOR_STATS
+
+from .runner import iter_routes
+from Authapp.models import User, UserActivity, UserRole
+from incidents import uploads
+from incidents.models import Incident
+from RapidAid.testing import TemporaryMediaMixin
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class BenchmarkSmokeTests(TemporaryMediaMixin, TestCase):
+    def test_every_route_answers_on_seeded_data(self):
+        call_command("seed_benchmark_data", "--incidents", "10", stdout=io.StringIO())
+        # bulk_create skipped the signals; the profile totals come from the rebuild
+        self.assertTrue(UserActivity.objects.filter(incidents_reported__gt=0).exists())
+        # Uploads are not seeded; give the benchmarked admin one to read
+        admin = User.objects.filter(role=UserRole.ADMIN).order_by("pk").first()
+        uploads.start(Incident.objects.first(), admin, "flood.jpg", "photo", 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "report.json"
+            # The schema route would print drf-spectacular's warnings
+            with mock.patch.object(GENERATOR_STATS, "silent", True):
+                call_command("run_benchmarks", "--iterations", "1", "--output", str(output), stdout=io.StringIO())
+            endpoints = json.loads(output.read_text())["endpoints"]
+
+        routes = {route: pattern for route, pattern in iter_routes() if route.startswith("api/")}
+        self.assertEqual(sorted(endpoints), sorted(routes))
+        for route, result in endpoints.items():
+            with self.subTest(route=route):
+                callback = routes[route].callback
+                self.assertIs(resolve(urlsplit(result["path"]).path).func, callback)
+                # Viewsets map methods to actions; other views define get()
+                actions = getattr(callback, "actions", None)
+                reads = "get" in actions if actions else hasattr(callback.cls, "get")
+                self.assertEqual(result["status"], 200 if reads else 405)
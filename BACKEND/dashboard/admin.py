@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import DashboardCounter
+
+
+@admin.register(DashboardCounter)
+class DashboardCounterAdmin(admin.ModelAdmin):
+    list_display = ("metric", "key", "value")
+    list_filter = ("metric",)
@@ -0,0 +1,88 @@
+from collections import Counter
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Count, Sum
+
+
+# Rows counted per distinct value: {model label: {metric: field}}
+COUNTED_FIELDS = {
+    "incidents.Incident": {
+        "incident_status": "status",
+        "incident_severity": "severity",
+        "incident_type": "incident_type",
+    },
+    "volunteer.VolunteerAssignment": {
+        "volunteer_status": "status",
+    },
+    "Authapp.User": {
+        "user_role": "role",
+    },
+    "donations.Donation": {
+        "donation_type": "donation_type",
+    },
+}
+
+# Values summed per distinct key: {model label: {metric: (key field, value field)}}
+SUMMED_FIELDS = {
+    "donations.Donation": {
+        "donation_amount": ("donation_type", "amount"),
+    },
+}
+
+
+def tracked_fields(label):
+    fields = set(COUNTED_FIELDS[label].values())
+    for key_field, value_field in SUMMED_FIELDS.get(label, {}).values():
+        fields.update([key_field, value_field])
+    return fields
+
+
+def contributions(instance):
+    """What a single row adds to the counters: {(metric, key): amount}."""
+    label = instance._meta.label
+    result = Counter()
+
+    for metric, field in COUNTED_FIELDS[label].items():
+        result[(metric, getattr(instance, field))] += 1
+
+    for metric, (key_field, value_field) in SUMMED_FIELDS.get(label, {}).items():
+        result[(metric, getattr(instance, key_field))] += getattr(instance, value_field) or 0
+
+    return result
+
+
+def diff(new, old):
+    deltas = Counter(new)
+    for key, value in old.items():
+        deltas[key] -= value
+    return deltas
+
+
+def rebuild(registry=django_apps):
+    """Recompute every counter with GROUP BY queries over the source tables."""
+    totals = Counter()
+
+    for label, metrics in COUNTED_FIELDS.items():
+        model = registry.get_model(label)
+        for metric, field in metrics.items():
+            rows = model._default_manager.values(field).annotate(total=Count("pk")).order_by()
+            for row in rows:
+                totals[(metric, row[field])] += row["total"]
+
+    for label, metrics in SUMMED_FIELDS.items():
+        model = registry.get_model(label)
+        for metric, (key_field, value_field) in metrics.items():
+            rows = model._default_manager.values(key_field).annotate(total=Sum(value_field)).order_by()
+            for row in rows:
+                totals[(metric, row[key_field])] += row["total"] or 0
+
+    DashboardCounter = registry.get_model("dashboard", "DashboardCounter")
+    with transaction.atomic():
+        DashboardCounter.objects.all().delete()
+        DashboardCounter.objects.bulk_create([
+            DashboardCounter(metric=metric, key=key, value=value)
+            for (metric, key), value in totals.items()
+        ])
+
+    return len(totals)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.counters import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the admin dashboard counters from the source tables."
+
+    def handle(self, *args, **options):
+        counters = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {counters} dashboard counters"))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:15
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    from dashboard.counters import rebuild
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('Authapp', '0001_initial'),
+        ('donations', '0005_donationsummary'),
+        ('incidents', '0003_cursor_pagination_indexes'),
+        ('volunteer', '0002_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=50)),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='dashboard_counter_unique')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import models
+from django.db.models import F
+
+
+# =========================================
+# DASHBOARD COUNTER (MATERIALIZED STATS)
+# =========================================
+class DashboardCounter(models.Model):
+    """
+    One row per (metric, key), e.g. ("incident_status", "reported") -> 12.
+    Kept current by dashboard/signals.py and rebuilt from scratch with
+    `manage.py rebuild_dashboard_stats`.
+    """
+    metric = models.CharField(max_length=50)
+    key = models.CharField(max_length=50)
+    value = models.DecimalField(
+        max_digits=16,
+        decimal_places=2,
+        default=0
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["metric", "key"],
+                name="dashboard_counter_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}:{self.key} = {self.value}"
+
+    @classmethod
+    def apply(cls, deltas):
+        """Add each {(metric, key): delta} to its counter row."""
+        for (metric, key), delta in deltas.items():
+            if not delta:
+                continue
+
+            updated = cls.objects.filter(metric=metric, key=key).update(
+                value=F("value") + delta
+            )
+            if not updated:
+                cls.objects.get_or_create(metric=metric, key=key)
+                cls.objects.filter(metric=metric, key=key).update(
+                    value=F("value") + delta
+                )
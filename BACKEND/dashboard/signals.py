@@ -0,0 +1,66 @@
+"""
+Keep DashboardCounter in step with the tracked models.
+
+Each tracked instance remembers what it contributed to the counters when it
+was loaded; on save the difference is applied, on delete it is subtracted.
+QuerySet.update() and bulk_create() bypass these signals, so code using them
+must apply the deltas itself (record_bulk_update) or run
+rebuild_dashboard_stats.
+"""
+from collections import Counter
+
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from .counters import COUNTED_FIELDS, contributions, diff, tracked_fields
+from .models import DashboardCounter
+
+SNAPSHOT_ATTR = "_dashboard_snapshot"
+
+
+def _snapshot_on_init(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    if tracked_fields(sender._meta.label) & instance.get_deferred_fields():
+        return
+    setattr(instance, SNAPSHOT_ATTR, contributions(instance))
+
+
+def _snapshot_before_save(sender, instance, **kwargs):
+    if instance._state.adding:
+        setattr(instance, SNAPSHOT_ATTR, {})
+        return
+    if hasattr(instance, SNAPSHOT_ATTR):
+        return
+
+    previous = sender._default_manager.filter(pk=instance.pk).first()
+    setattr(instance, SNAPSHOT_ATTR, contributions(previous) if previous else {})
+
+
+def _apply_after_save(sender, instance, **kwargs):
+    current = contributions(instance)
+    DashboardCounter.apply(diff(current, getattr(instance, SNAPSHOT_ATTR, {})))
+    setattr(instance, SNAPSHOT_ATTR, current)
+
+
+def _apply_after_delete(sender, instance, **kwargs):
+    previous = getattr(instance, SNAPSHOT_ATTR, None) or contributions(instance)
+    DashboardCounter.apply(diff({}, previous))
+
+
+def record_bulk_update(instances):
+    """Apply the counter changes of instances saved with bulk_update()."""
+    deltas = Counter()
+    for instance in instances:
+        current = contributions(instance)
+        deltas.update(diff(current, getattr(instance, SNAPSHOT_ATTR, {})))
+        setattr(instance, SNAPSHOT_ATTR, current)
+    DashboardCounter.apply(deltas)
+
+
+for label in COUNTED_FIELDS:
+    model = apps.get_model(label)
+    post_init.connect(_snapshot_on_init, sender=model, dispatch_uid=f"dashboard_init_{label}")
+    pre_save.connect(_snapshot_before_save, sender=model, dispatch_uid=f"dashboard_pre_save_{label}")
+    post_save.connect(_apply_after_save, sender=model, dispatch_uid=f"dashboard_post_save_{label}")
+    post_delete.connect(_apply_after_delete, sender=model, dispatch_uid=f"dashboard_post_delete_{label}")
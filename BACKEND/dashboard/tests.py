@@ -0,0 +1,130 @@
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .counters import rebuild
+from .models import DashboardCounter
+from .signals import record_bulk_update
+from Authapp.models import UserRole
+from donations.models import Donation, Donor
+from incidents.models import Incident, IncidentStatus, Severity
+from incidents.transitions import apply_transition
+from RapidAid.testing import api_client, make_incident, make_user
+from volunteer.models import VolunteerAssignment, VolunteerStatus
+
+
+def counters():
+    """Every non-zero counter as {(metric, key): value}."""
+    return {
+        (counter.metric, counter.key): counter.value
+        for counter in DashboardCounter.objects.exclude(value=0)
+    }
+
+
+class DashboardCounterTests(TestCase):
+    def test_create_adds_to_every_metric(self):
+        make_incident(severity=Severity.HIGH)
+        make_incident(severity=Severity.LOW)
+
+        self.assertEqual(counters()[("incident_status", IncidentStatus.REPORTED)], 2)
+        self.assertEqual(counters()[("incident_severity", Severity.HIGH)], 1)
+        self.assertEqual(counters()[("incident_severity", Severity.LOW)], 1)
+        self.assertEqual(counters()[("incident_type", "flood")], 2)
+
+    def test_changes_move_counts_between_keys(self):
+        incident = make_incident(severity=Severity.HIGH)
+        incident.status = IncidentStatus.VERIFIED
+        incident.severity = Severity.LOW
+        incident.save()
+
+        # Loaded afresh, the snapshot comes from post_init
+        incident = Incident.objects.get(pk=incident.pk)
+        incident.status = IncidentStatus.IN_RESCUE
+        incident.save()
+
+        values = counters()
+        self.assertNotIn(("incident_status", IncidentStatus.REPORTED), values)
+        self.assertNotIn(("incident_status", IncidentStatus.VERIFIED), values)
+        self.assertEqual(values[("incident_status", IncidentStatus.IN_RESCUE)], 1)
+        self.assertNotIn(("incident_severity", Severity.HIGH), values)
+        self.assertEqual(values[("incident_severity", Severity.LOW)], 1)
+
+    def test_donation_amounts_follow_edits_and_deletes(self):
+        donor = Donor.objects.create(user=make_user())
+        incident = make_incident()
+        money = Donation.objects.create(donor=donor, incident=incident, donation_type="money", amount=Decimal("100"))
+        Donation.objects.create(donor=donor, incident=incident, donation_type="money", amount=Decimal("50"))
+
+        money.amount = Decimal("70")
+        money.save()
+        self.assertEqual(counters()[("donation_amount", "money")], Decimal("120"))
+
+        money.delete()
+        self.assertEqual(counters()[("donation_amount", "money")], Decimal("50"))
+        self.assertEqual(counters()[("donation_type", "money")], 1)
+
+    def test_delete_subtracts(self):
+        incident = make_incident()
+        assignment = VolunteerAssignment.objects.create(user=make_user(), incident=incident)
+        assignment.delete()
+        incident.delete()
+
+        self.assertFalse([key for key in counters() if key[0] != "user_role"])
+
+    def test_record_bulk_update_applies_the_deltas(self):
+        incidents = [make_incident() for _ in range(3)]
+        assignments = [VolunteerAssignment.objects.create(user=make_user(), incident=incidents[0]) for _ in range(2)]
+
+        for assignment in assignments:
+            assignment.status = VolunteerStatus.APPROVED
+        VolunteerAssignment.objects.bulk_update(assignments, ["status"])
+        record_bulk_update(assignments)
+        apply_transition(incidents[:2], IncidentStatus.VERIFIED, make_user(role=UserRole.ADMIN))
+
+        values = counters()
+        self.assertEqual(values[("volunteer_status", VolunteerStatus.APPROVED)], 2)
+        self.assertNotIn(("volunteer_status", VolunteerStatus.PENDING), values)
+        self.assertEqual(values[("incident_status", IncidentStatus.VERIFIED)], 2)
+        self.assertEqual(values[("incident_status", IncidentStatus.REPORTED)], 1)
+
+    @override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+    def test_rebuild_matches_incremental_counts(self):
+        donor = Donor.objects.create(user=make_user())
+        incident = make_incident(reporter=make_user())
+        make_incident(severity=Severity.LOW).delete()
+        Donation.objects.create(donor=donor, incident=incident, donation_type="money", amount=Decimal("25.50"))
+        Donation.objects.create(donor=donor, incident=incident, donation_type="item", item_name="Tent", quantity=1)
+        VolunteerAssignment.objects.create(user=make_user(), incident=incident)
+        apply_transition([incident], IncidentStatus.VERIFIED, make_user(role=UserRole.ADMIN))
+
+        incremental = counters()
+        DashboardCounter.objects.update(value=0)
+        call_command("rebuild_dashboard_stats", stdout=io.StringIO())
+
+        self.assertEqual(counters(), incremental)
+        self.assertEqual(rebuild(), DashboardCounter.objects.count())
+
+
+class AdminDashboardStatsTests(TestCase):
+    url = "/api/dashboard/admin/stats/"
+
+    def test_only_admins_read_the_stats(self):
+        self.assertEqual(api_client(make_user()).get(self.url).status_code, 403)
+        self.assertEqual(api_client(make_user(role=UserRole.RESCUE_TEAM)).get(self.url).status_code, 403)
+
+    def test_stats_are_one_query(self):
+        client = api_client(make_user(role=UserRole.ADMIN))
+        make_incident()
+        make_incident(status=IncidentStatus.VERIFIED)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(response.data["incidents"]["total"], 2)
+        self.assertEqual(response.data["incidents"]["by_status"][IncidentStatus.VERIFIED], 1)
+        self.assertEqual(response.data["users"]["by_role"][UserRole.ADMIN], 1)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import AdminDashboardStatsAPIView
+
+urlpatterns = [
+    path("admin/stats/", AdminDashboardStatsAPIView.as_view(), name="admin-dashboard-stats"),
+]
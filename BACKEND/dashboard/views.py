@@ -0,0 +1,57 @@
+from rest_framework import generics
+from rest_framework.response import Response
+
+from .models import DashboardCounter
+from Authapp.models import UserRole
+from Authapp.permissions import IsAdminRole
+from donations.models import Donation
+from incidents.models import IncidentStatus, IncidentType, Severity
+from volunteer.models import VolunteerStatus
+
+
+# =========================================
+# ADMIN: DASHBOARD STATS
+# =========================================
+class AdminDashboardStatsAPIView(generics.GenericAPIView):
+    """
+    Landing page counters, read from the materialized counter table.
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        counters = {}
+        for counter in DashboardCounter.objects.all():
+            counters.setdefault(counter.metric, {})[counter.key] = counter.value
+
+        def counts(metric, choices):
+            values = counters.get(metric, {})
+            return {choice: int(values.get(choice, 0)) for choice in choices}
+
+        incident_status = counts("incident_status", IncidentStatus.values)
+        volunteer_status = counts("volunteer_status", VolunteerStatus.values)
+        user_role = counts("user_role", UserRole.values)
+        donation_types = [value for value, _ in Donation.DONATION_TYPE]
+        donation_type = counts("donation_type", donation_types)
+        donation_amount = counters.get("donation_amount", {})
+
+        return Response({
+            "incidents": {
+                "total": sum(incident_status.values()),
+                "by_status": incident_status,
+                "by_severity": counts("incident_severity", Severity.values),
+                "by_type": counts("incident_type", IncidentType.values),
+            },
+            "volunteers": {
+                "total": sum(volunteer_status.values()),
+                "by_status": volunteer_status,
+            },
+            "users": {
+                "total": sum(user_role.values()),
+                "by_role": user_role,
+            },
+            "donations": {
+                "total": sum(donation_type.values()),
+                "by_type": donation_type,
+                "total_amount": donation_amount.get("money", 0),
+            },
+        })
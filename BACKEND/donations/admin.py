@@ -1,6 +1,7 @@
 from django.contrib import admin
-from.models import Donation, Donor
+from.models import Donation, Donor, DonationSummary
 
 # Register your models here.
 admin.site.register(Donation)
 admin.site.register(Donor)
+admin.site.register(DonationSummary)
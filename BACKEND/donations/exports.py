@@ -0,0 +1,25 @@
+from django.db.models import Case, F, Value, When
+
+from RapidAid.exports import Export
+
+from .models import Donation
+
+# donor_name follows DonationSerializer: anonymous donations stay anonymous
+DONATIONS = Export(
+    "donations",
+    Donation.objects.annotate(
+        donor_name=Case(When(is_anonymous=True, then=Value("Anonymous")), default=F("donor__user__full_name"))
+    ).order_by("-created_at", "-id"),
+    [
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("incident_id", "incident_id"),
+        ("incident_title", "incident__title"),
+        ("donor_name", "donor_name"),
+        ("donation_type", "donation_type"),
+        ("amount", "amount"),
+        ("item_name", "item_name"),
+        ("quantity", "quantity"),
+        ("is_anonymous", "is_anonymous"),
+    ],
+)
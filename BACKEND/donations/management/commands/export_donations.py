@@ -0,0 +1,7 @@
+from donations.exports import DONATIONS
+from RapidAid.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream every donation as CSV or NDJSON."
+    export = DONATIONS
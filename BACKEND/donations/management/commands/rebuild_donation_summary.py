@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from donations.models import DonationSummary
+
+
+class Command(BaseCommand):
+    help = "Rebuild the donation summary table used by the transparency aggregates."
+
+    def handle(self, *args, **options):
+        buckets = DonationSummary.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} donation summary buckets"))
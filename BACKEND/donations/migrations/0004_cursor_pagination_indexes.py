@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0003_remove_donation_verification_code_and_more'),
+        ('incidents', '0003_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['-created_at', '-id'], name='donation_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_summaries(apps, schema_editor):
+    Donation = apps.get_model("donations", "Donation")
+    DonationSummary = apps.get_model("donations", "DonationSummary")
+
+    merged = {}
+    for donation in Donation.objects.only(
+        "incident_id", "donation_type", "item_name", "amount", "quantity", "created_at"
+    ).iterator(chunk_size=2000):
+        item_name = donation.item_name.strip() if donation.donation_type == "item" else ""
+        key = (donation.incident_id, donation.donation_type, item_name, timezone.localdate(donation.created_at))
+        summary = merged.setdefault(key, DonationSummary(
+            incident_id=key[0],
+            donation_type=key[1],
+            item_name=key[2],
+            day=key[3],
+        ))
+        summary.donation_count += 1
+        summary.total_amount += donation.amount or 0
+        summary.total_quantity += donation.quantity or 0
+
+    DonationSummary.objects.bulk_create(merged.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0004_cursor_pagination_indexes'),
+        ('incidents', '0003_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('donation_type', models.CharField(choices=[('money', 'Money'), ('item', 'Item')], max_length=10)),
+                ('item_name', models.CharField(blank=True, max_length=255)),
+                ('day', models.DateField()),
+                ('donation_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_quantity', models.PositiveIntegerField(default=0)),
+                ('incident', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='donation_summaries', to='incidents.incident')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('incident', 'donation_type', 'item_name', 'day'), name='donation_summary_bucket_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0005_donationsummary'),
+        ('incidents', '0004_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['incident', '-created_at'], name='donation_incident_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donation_type', '-created_at'], name='donation_type_created_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
 from django.conf import settings
+from django.utils import timezone
 from incidents.models import Incident
 
 
@@ -68,5 +71,137 @@ class Donation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="donation_created_id_idx"),
+            models.Index(fields=["incident", "-created_at"], name="donation_incident_created_idx"),
+            models.Index(fields=["donation_type", "-created_at"], name="donation_type_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.donation_type} donation to {self.incident.title}"
+
+
+# ----------------------------------
+# DONATION SUMMARY (TRANSPARENCY ROLLUP)
+# ----------------------------------
+class DonationSummary(models.Model):
+    """
+    Running totals per incident / donation type / item / local day.
+    Kept current by donations/signals.py as donations are saved and
+    deleted, so the transparency aggregates never have to scan the
+    donations table; rebuilt with `manage.py rebuild_donation_summary`.
+    """
+    incident = models.ForeignKey(
+        Incident,
+        on_delete=models.CASCADE,
+        related_name="donation_summaries"
+    )
+
+    donation_type = models.CharField(
+        max_length=10,
+        choices=Donation.DONATION_TYPE
+    )
+
+    # Empty for money donations
+    item_name = models.CharField(
+        max_length=255,
+        blank=True
+    )
+
+    day = models.DateField()
+
+    donation_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+    total_quantity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["incident", "donation_type", "item_name", "day"],
+                name="donation_summary_bucket_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.donation_type} summary for Incident {self.incident_id} on {self.day}"
+
+    @staticmethod
+    def contribution(donation):
+        """What one donation adds to the summary: {bucket: (count, amount, quantity)}."""
+        bucket = (
+            donation.incident_id,
+            donation.donation_type,
+            donation.item_name.strip() if donation.donation_type == "item" else "",
+            timezone.localdate(donation.created_at),
+        )
+        return {bucket: (1, donation.amount or 0, donation.quantity or 0)}
+
+    @classmethod
+    def apply(cls, deltas):
+        """Add each {bucket: (count, amount, quantity)} delta to its row."""
+        with transaction.atomic():
+            for (incident_id, donation_type, item_name, day), (count, amount, quantity) in deltas.items():
+                if not (count or amount or quantity):
+                    continue
+                bucket = {
+                    "incident_id": incident_id,
+                    "donation_type": donation_type,
+                    "item_name": item_name,
+                    "day": day,
+                }
+
+                if count > 0:
+                    _, created = cls.objects.get_or_create(**bucket, defaults={
+                        "donation_count": count,
+                        "total_amount": amount,
+                        "total_quantity": quantity,
+                    })
+                    if created:
+                        continue
+
+                # A bucket already gone with its incident is not recreated
+                cls.objects.filter(**bucket).update(
+                    donation_count=F("donation_count") + count,
+                    total_amount=F("total_amount") + amount,
+                    total_quantity=F("total_quantity") + quantity,
+                )
+                if count < 0:
+                    cls.objects.filter(**bucket, donation_count=0).delete()
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every bucket from the donations table."""
+        buckets = Donation.objects.annotate(
+            day=TruncDate("created_at")
+        ).values(
+            "incident_id", "donation_type", "item_name", "day"
+        ).annotate(
+            donation_count=Count("id"),
+            total_amount=Sum("amount"),
+            total_quantity=Sum("quantity"),
+        ).order_by()
+
+        merged = {}
+        for bucket in buckets:
+            item_name = bucket["item_name"].strip() if bucket["donation_type"] == "item" else ""
+            key = (bucket["incident_id"], bucket["donation_type"], item_name, bucket["day"])
+            summary = merged.setdefault(key, cls(
+                incident_id=key[0],
+                donation_type=key[1],
+                item_name=key[2],
+                day=key[3],
+            ))
+            summary.donation_count += bucket["donation_count"]
+            summary.total_amount += bucket["total_amount"] or 0
+            summary.total_quantity += bucket["total_quantity"] or 0
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(merged.values(), batch_size=1000)
+
+        return len(merged)
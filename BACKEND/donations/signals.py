@@ -0,0 +1,60 @@
+"""
+Keep DonationSummary in step with the donations table.
+
+Like the dashboard counters, each donation remembers which bucket it
+counted towards when it was loaded; on save the difference is applied
+(moving it between buckets if its incident, type, item or amount changed),
+on delete it is subtracted. bulk_create() and QuerySet.update() bypass
+these signals; run rebuild_donation_summary after using them.
+"""
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from .models import Donation, DonationSummary
+
+SNAPSHOT_ATTR = "_summary_snapshot"
+TRACKED_FIELDS = {"incident_id", "donation_type", "item_name", "amount", "quantity", "created_at"}
+
+
+def diff(new, old):
+    deltas = {bucket: list(values) for bucket, values in new.items()}
+    for bucket, values in old.items():
+        current = deltas.setdefault(bucket, [0, 0, 0])
+        for position, value in enumerate(values):
+            current[position] -= value
+    return deltas
+
+
+def _snapshot_on_init(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    if TRACKED_FIELDS & instance.get_deferred_fields():
+        return
+    setattr(instance, SNAPSHOT_ATTR, DonationSummary.contribution(instance))
+
+
+def _snapshot_before_save(sender, instance, **kwargs):
+    if instance._state.adding:
+        setattr(instance, SNAPSHOT_ATTR, {})
+        return
+    if hasattr(instance, SNAPSHOT_ATTR):
+        return
+
+    previous = Donation.objects.filter(pk=instance.pk).first()
+    setattr(instance, SNAPSHOT_ATTR, DonationSummary.contribution(previous) if previous else {})
+
+
+def _apply_after_save(sender, instance, **kwargs):
+    current = DonationSummary.contribution(instance)
+    DonationSummary.apply(diff(current, getattr(instance, SNAPSHOT_ATTR, {})))
+    setattr(instance, SNAPSHOT_ATTR, current)
+
+
+def _apply_after_delete(sender, instance, **kwargs):
+    previous = getattr(instance, SNAPSHOT_ATTR, None) or DonationSummary.contribution(instance)
+    DonationSummary.apply(diff({}, previous))
+
+
+post_init.connect(_snapshot_on_init, sender=Donation, dispatch_uid="donation_summary_init")
+pre_save.connect(_snapshot_before_save, sender=Donation, dispatch_uid="donation_summary_pre_save")
+post_save.connect(_apply_after_save, sender=Donation, dispatch_uid="donation_summary_post_save")
+post_delete.connect(_apply_after_delete, sender=Donation, dispatch_uid="donation_summary_post_delete")
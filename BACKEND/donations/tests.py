@@ -1,3 +1,202 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .models import Donor, Donation, DonationSummary
+from Authapp.models import UserRole
+from RapidAid.testing import QueryCountMixin, api_client, make_incident, make_user
+
+
+class DonationQueryCountTests(QueryCountMixin, TestCase):
+    def test_donation_list_queries_do_not_grow_with_rows(self):
+        incident = make_incident()
+
+        def add_donation():
+            donor = Donor.objects.create(user=make_user())
+            Donation.objects.create(
+                donor=donor,
+                incident=incident,
+                donation_type="money",
+                amount=100,
+            )
+
+        client = api_client(make_user(role=UserRole.ADMIN))
+        self.assertConstantQueries(client, "/api/donations/list/", add_donation)
+
+
+class DonationFilterTests(TestCase):
+    def test_filters_by_incident_type_and_date(self):
+        incident, other = make_incident(), make_incident()
+        donor = Donor.objects.create(user=make_user())
+        money = Donation.objects.create(donor=donor, incident=incident, donation_type="money", amount=100)
+        Donation.objects.create(donor=donor, incident=incident, donation_type="item", item_name="Rice", quantity=5)
+        Donation.objects.create(donor=donor, incident=other, donation_type="money", amount=50)
+        client = api_client(make_user(role=UserRole.ADMIN))
+        today = money.created_at.date().isoformat()
+
+        response = client.get(
+            f"/api/donations/list/?incident={incident.id}&donation_type=money"
+            f"&date_from={today}&date_to={today}"
+        )
+        self.assertEqual([row["id"] for row in response.data["results"]], [money.id])
+
+        response = client.get("/api/donations/list/?date_from=2000-01-01&date_to=2000-01-02")
+        self.assertEqual(response.data["results"], [])
+
+        response = client.get("/api/donations/list/?date_from=yesterday")
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class DonationExportTests(TestCase):
+    def setUp(self):
+        incident = make_incident()
+        self.donor_user = make_user()
+        donor = Donor.objects.create(user=self.donor_user)
+        other = Donor.objects.create(user=make_user())
+        self.donations = [
+            Donation.objects.create(donor=donor, incident=incident, donation_type="money", amount=100),
+            Donation.objects.create(
+                donor=other, incident=incident, donation_type="item", item_name="=SUM(A1)", quantity=3,
+            ),
+            Donation.objects.create(
+                donor=other, incident=incident, donation_type="money", amount=5, is_anonymous=True,
+            ),
+        ]
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_csv_export_streams_every_donation(self):
+        response = api_client(make_user(role=UserRole.ADMIN)).get("/api/donations/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment;", response["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(self.read(response).decode())))
+        self.assertEqual([int(row["id"]) for row in rows], [d.pk for d in reversed(self.donations)])
+        self.assertEqual(rows[0]["donor_name"], "Anonymous")
+        self.assertEqual(rows[1]["item_name"], "'=SUM(A1)")
+
+    def test_gzipped_ndjson_for_a_donor_holds_their_own_donations(self):
+        response = api_client(self.donor_user).get("/api/donations/export/?output=ndjson&gzip=true")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+
+        lines = gzip.decompress(self.read(response)).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], [self.donations[0].pk])
+        self.assertEqual(json.loads(lines[0])["amount"], "100.00")
+
+    def test_unknown_output_is_rejected(self):
+        response = api_client(make_user(role=UserRole.ADMIN)).get("/api/donations/export/?output=xml")
+        self.assertEqual(response.status_code, 400)
+
+
+class DonationSummaryTests(TestCase):
+    def setUp(self):
+        self.incident = make_incident()
+        self.donor = Donor.objects.create(user=make_user())
+
+    def donate(self, **fields):
+        fields.setdefault("incident", self.incident)
+        return Donation.objects.create(donor=self.donor, **fields)
+
+    def buckets(self):
+        return {
+            (summary.incident_id, summary.donation_type, summary.item_name, summary.day): (
+                summary.donation_count, summary.total_amount, summary.total_quantity,
+            )
+            for summary in DonationSummary.objects.all()
+        }
+
+    def test_donations_api_records_the_bucket(self):
+        client = api_client(self.donor.user)
+        for item_name in ("Tent", " Tent "):
+            response = client.post(
+                "/api/donations/donate/",
+                {"incident": self.incident.id, "donation_type": "item", "item_name": item_name, "quantity": 2},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201, response.content)
+
+        summary = DonationSummary.objects.get()
+        self.assertEqual((summary.item_name, summary.donation_count, summary.total_quantity), ("Tent", 2, 4))
+
+    def test_edits_and_deletes_move_the_totals(self):
+        other = make_incident()
+        money = self.donate(donation_type="money", amount=Decimal("100"))
+        self.donate(donation_type="money", amount=Decimal("20"))
+        tent = self.donate(donation_type="item", item_name="Tent", quantity=3)
+
+        money.amount = Decimal("70")
+        money.save()
+        tent = Donation.objects.get(pk=tent.pk)
+        tent.incident = other
+        tent.save()
+        day = money.created_at.date()
+
+        self.assertEqual(self.buckets(), {
+            (self.incident.id, "money", "", day): (2, Decimal("90.00"), 0),
+            (other.id, "item", "Tent", day): (1, Decimal("0.00"), 3),
+        })
+
+        Donation.objects.get(pk=money.pk).delete()
+        tent.delete()
+        self.assertEqual(self.buckets(), {(self.incident.id, "money", "", day): (1, Decimal("20.00"), 0)})
+
+        # Deleting the incident cascades to its donations and its buckets
+        self.incident.delete()
+        self.assertFalse(DonationSummary.objects.exists())
+
+    def test_rebuild_and_backfill_match_the_signals(self):
+        self.donate(donation_type="money", amount=Decimal("12.50"))
+        self.donate(donation_type="item", item_name="Rice ", quantity=5)
+        self.donate(donation_type="item", item_name="Rice", quantity=1, incident=make_incident())
+        incremental = self.buckets()
+
+        call_command("rebuild_donation_summary", stdout=io.StringIO())
+        self.assertEqual(self.buckets(), incremental)
+
+        DonationSummary.objects.all().delete()
+        import_module("donations.migrations.0005_donationsummary").backfill_summaries(apps, None)
+        self.assertEqual(self.buckets(), incremental)
+
+    @override_settings(TIME_ZONE="Asia/Kathmandu")
+    def test_buckets_use_the_local_day_everywhere(self):
+        donation = self.donate(donation_type="money", amount=Decimal("5"))
+        # 20:00 UTC is already the next day in Kathmandu (UTC+5:45)
+        Donation.objects.filter(pk=donation.pk).update(created_at=datetime(2025, 1, 1, 20, tzinfo=dt_timezone.utc))
+
+        DonationSummary.rebuild()
+        self.assertEqual(DonationSummary.objects.get().day, date(2025, 1, 2))
+        DonationSummary.objects.all().delete()
+        import_module("donations.migrations.0005_donationsummary").backfill_summaries(apps, None)
+        self.assertEqual(DonationSummary.objects.get().day, date(2025, 1, 2))
+
+        Donation.objects.get(pk=donation.pk).delete()
+        self.assertFalse(DonationSummary.objects.exists())
+
+    def test_aggregates_read_the_summary(self):
+        self.donate(donation_type="money", amount=Decimal("100"))
+        self.donate(donation_type="money", amount=Decimal("50"))
+        self.donate(donation_type="item", item_name="Tent", quantity=4)
+        client = api_client(make_user())
+
+        response = client.get("/api/donations/aggregates/?bucket=month")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_donations"], 3)
+        self.assertEqual(response.data["money_donations"], 2)
+        self.assertEqual(response.data["total_amount"], Decimal("150"))
+        self.assertEqual(response.data["total_item_quantity"], 4)
+        self.assertEqual(response.data["by_incident"][0]["incident_id"], self.incident.id)
+        self.assertEqual([row["item_name"] for row in response.data["items"]], ["Tent"])
+        self.assertEqual(len(response.data["series"]), 2)
+
+        self.assertEqual(client.get("/api/donations/aggregates/?bucket=year").status_code, 400)
@@ -4,6 +4,8 @@ from .views import (
     DonorMeAPIView,
     CreateDonationAPIView,
     DonationListAPIView,
+    DonationExportAPIView,
+    DonationAggregatesAPIView,
 )
 
 urlpatterns = [
@@ -11,4 +13,6 @@ urlpatterns = [
     path("donor/create/", CreateDonorAPIView.as_view()),
     path("donate/", CreateDonationAPIView.as_view()),
     path("list/", DonationListAPIView.as_view()),
+    path("export/", DonationExportAPIView.as_view()),
+    path("aggregates/", DonationAggregatesAPIView.as_view()),
 ]
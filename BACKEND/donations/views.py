@@ -1,10 +1,15 @@
 from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
 
-from .models import Donor, Donation
+from .exports import DONATIONS
+from .models import Donor, Donation, DonationSummary
 from .serializers import DonorSerializer, DonationSerializer
 from incidents.models import IncidentStatus
+from RapidAid.exports import ExportAPIView
 
 
 # ==================================
@@ -63,7 +68,9 @@ class CreateDonationAPIView(generics.CreateAPIView):
         if incident.status == IncidentStatus.RESOLVED:
             raise PermissionDenied("Donations closed for this incident")
 
-        serializer.save(donor=user.donor_profile)
+        # The summary bucket is updated by the post_save signal
+        with transaction.atomic():
+            serializer.save(donor=user.donor_profile)
 
 
 # ==================================
@@ -72,4 +79,106 @@ class CreateDonationAPIView(generics.CreateAPIView):
 class DonationListAPIView(generics.ListAPIView):
     serializer_class = DonationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Donation.objects.all().order_by("-created_at")
+    cursor_ordering = ("-created_at", "-id")
+    filter_fields = {
+        "incident": "incident",
+        "donation_type": "donation_type",
+    }
+    date_filter_field = "created_at"
+    queryset = Donation.objects.select_related(
+        "donor__user"
+    ).order_by("-created_at", "-id")
+
+
+# ==================================
+# DONATION EXPORT (CSV / NDJSON)
+# ==================================
+class DonationExportAPIView(ExportAPIView):
+    """Every donation for admins; donors get their own."""
+    permission_classes = [permissions.IsAuthenticated]
+    export = DONATIONS
+    filter_fields = DonationListAPIView.filter_fields
+    date_filter_field = "created_at"
+
+    def get_queryset(self):
+        donations = super().get_queryset()
+        if self.request.user.is_admin_role:
+            return donations
+        return donations.filter(donor__user=self.request.user)
+
+
+# ==================================
+# DONATION AGGREGATES (TRANSPARENCY)
+# ==================================
+class DonationAggregatesAPIView(generics.GenericAPIView):
+    """
+    Donation totals read from the summary table.
+    Optional ?bucket=day|week|month controls the time series.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    BUCKETS = {
+        "day": TruncDay,
+        "week": TruncWeek,
+        "month": TruncMonth,
+    }
+
+    def get(self, request):
+        bucket = request.query_params.get("bucket", "day")
+        if bucket not in self.BUCKETS:
+            raise ValidationError({"bucket": "Use one of: day, week, month"})
+
+        totals = {
+            "donation_count": Sum("donation_count"),
+            "total_amount": Sum("total_amount"),
+            "total_quantity": Sum("total_quantity"),
+        }
+        summaries = DonationSummary.objects.order_by()
+
+        by_type = list(
+            summaries.values("donation_type").annotate(**totals).order_by("donation_type")
+        )
+
+        by_incident = list(
+            summaries.values(
+                "incident_id", "incident__title"
+            ).annotate(**totals).order_by("-total_amount", "incident_id")
+        )
+
+        items = list(
+            summaries.filter(donation_type="item").values(
+                "item_name"
+            ).annotate(**totals).order_by("-total_quantity", "item_name")
+        )
+
+        series = list(
+            summaries.annotate(
+                period=self.BUCKETS[bucket]("day")
+            ).values("period", "donation_type").annotate(**totals).order_by("period", "donation_type")
+        )
+
+        type_totals = {row["donation_type"]: row for row in by_type}
+        money = type_totals.get("money", {})
+        item = type_totals.get("item", {})
+
+        return Response({
+            "total_donations": sum(row["donation_count"] for row in by_type),
+            "money_donations": money.get("donation_count", 0),
+            "item_donations": item.get("donation_count", 0),
+            "total_amount": money.get("total_amount") or 0,
+            "total_item_quantity": item.get("total_quantity") or 0,
+            "by_type": by_type,
+            "by_incident": [
+                {
+                    "incident_id": row["incident_id"],
+                    "incident_title": row["incident__title"],
+                    "donation_count": row["donation_count"],
+                    "total_amount": row["total_amount"],
+                    "total_quantity": row["total_quantity"],
+                }
+                for row in by_incident
+            ],
+            "items": items,
+            "bucket": bucket,
+            "series": series,
+        })
@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.utils import timezone
 
-from .models import Incident, IncidentMedia, IncidentTimeline, IncidentStatus
+from .cache import invalidate_incident_lists
+from .models import Incident, IncidentMedia, IncidentTimeline, IncidentStatus, MediaBlob, MediaUpload, TriageLease
+from .search import search_ids
+from .transitions import approval_email
 from RapidAid.email_utils import send_notification_email
 
 
@@ -9,8 +12,20 @@ from RapidAid.email_utils import send_notification_email
 class IncidentAdmin(admin.ModelAdmin):
     list_display = ("title", "status", "reporter", "created_at", "approved_at")
     list_filter = ("status", "incident_type", "severity")
-    search_fields = ("title", "description", "reporter__email", "location")
+    # Words in title/description/location go through the full-text index
+    # (see get_search_results); the reporter is matched by exact email.
+    search_fields = ("=reporter__email",)
+    search_help_text = "Words from the title, description or location, or the reporter's email."
     readonly_fields = ("created_at", "updated_at", "approved_at")
+    search_result_limit = 1000
+
+    def get_search_results(self, request, queryset, search_term):
+        by_email, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term.strip():
+            return by_email, may_have_duplicates
+
+        ids = search_ids(search_term, IncidentStatus.values, self.search_result_limit)
+        return queryset.filter(pk__in=ids) | by_email, may_have_duplicates
 
     def save_model(self, request, obj, form, change):
         previous_status = None
@@ -24,6 +39,9 @@ class IncidentAdmin(admin.ModelAdmin):
 
         super().save_model(request, obj, form, change)
 
+        if previous_status == IncidentStatus.REJECTED and obj.status != previous_status:
+            invalidate_incident_lists()
+
         if previous_status != obj.status:
             IncidentTimeline.objects.create(
                 incident=obj,
@@ -37,17 +55,11 @@ class IncidentAdmin(admin.ModelAdmin):
             and obj.status == IncidentStatus.VERIFIED
             and obj.reporter_id
         ):
-            send_notification_email(
-                to_email=obj.reporter.email,
-                subject="RapidAid: Incident Approved",
-                message=(
-                    f"Hello {obj.reporter.full_name},\n\n"
-                    f"Your incident '{obj.title}' has been approved and marked as verified.\n"
-                    "You can now open RapidAid to track updates and community support.\n\n"
-                    "Thank you,\nRapidAid Team"
-                ),
-            )
+            send_notification_email(*approval_email(obj))
 
 
 admin.site.register(IncidentMedia)
 admin.site.register(IncidentTimeline)
+admin.site.register(TriageLease)
+admin.site.register(MediaUpload)
+admin.site.register(MediaBlob)
@@ -0,0 +1,245 @@
+"""
+Content-addressed storage for incident media.
+
+Files are stored once per distinct content under their sha256:
+
+    incidents/blobs/3f/a9/3fa9...c2.jpg
+
+so a photo re-uploaded to several incidents, or re-sent by a retrying
+client, occupies one file. A MediaBlob row per file counts the
+IncidentMedia rows using it. The name of a blob never changes and its bytes
+never do, so its URL can be cached forever (IMMUTABLE_CACHE_CONTROL).
+
+References are taken in the IncidentMedia pre_save signal and dropped in
+post_delete. `manage.py collect_media_blobs` deletes blobs unreferenced
+for MEDIA_BLOB_GC_GRACE_SECONDS, and stray files without a row. Collection first flips
+refcount from 0 to -1 with a conditional UPDATE; store() only takes a
+reference on a blob whose refcount is not negative and otherwise waits for
+the row to go, so a blob is never deleted under a new reference. Inside a
+transaction it raises BlobCollecting instead of sleeping with the locks
+held; callers run such transactions through retry_while_collected().
+"""
+import hashlib
+import re
+import time
+from datetime import timedelta
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count, F, ProtectedError, Q
+from django.utils import timezone
+
+from .imaging import SIZES
+from .models import IncidentMedia, MediaBlob
+
+BLOB_DIR = "incidents/blobs"
+DERIVED_DIR = f"{BLOB_DIR}/derived"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PRIVATE_IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+# How long store() waits for a blob that is being collected
+COLLECTION_RETRIES = 20
+COLLECTION_RETRY_SECONDS = 0.05
+
+
+class BlobCollecting(RuntimeError):
+    """The blob store() needs is being collected; retry once its row is gone."""
+
+
+def retry_while_collected(operation):
+    """Run `operation`, sleeping and running it again while it raises BlobCollecting."""
+    for _ in range(COLLECTION_RETRIES - 1):
+        try:
+            return operation()
+        except BlobCollecting:
+            time.sleep(COLLECTION_RETRY_SECONDS)
+    return operation()
+
+
+def content_sha256(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_name(sha256, filename):
+    suffix = PurePosixPath(filename).suffix.lower()
+    if not re.fullmatch(r"\.[a-z0-9]{1,8}", suffix):
+        suffix = ""
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{suffix}"
+
+
+def derived_names(sha256):
+    """Every name a derivative of this blob may have (see incidents/derivatives.py)."""
+    return [f"{DERIVED_DIR}/{sha256}-{size}.{extension}" for size in SIZES for extension in ("webp", "jpg")]
+
+
+def store(content, filename, sha256=None):
+    """
+    Take a reference on the blob holding `content`, writing the file if
+    these bytes are new. A content object with temporary_file_path() is
+    moved into place rather than copied.
+    """
+    sha256 = sha256 or content_sha256(content)
+    name = blob_name(sha256, filename)
+
+    def reference():
+        blob, _ = MediaBlob.objects.get_or_create(
+            sha256=sha256,
+            defaults={"file": name, "size": content.size},
+        )
+        referenced = MediaBlob.objects.filter(pk=blob.pk, refcount__gte=0).update(
+            refcount=F("refcount") + 1,
+            released_at=None,
+        )
+        if not referenced:
+            raise BlobCollecting(f"Media blob {sha256} is being collected")
+        return blob
+
+    blob = reference() if transaction.get_connection().in_atomic_block else retry_while_collected(reference)
+
+    if not default_storage.exists(blob.file.name):
+        saved = default_storage.save(blob.file.name, content)
+        if saved != blob.file.name:
+            # A concurrent upload of the same bytes got there first
+            default_storage.delete(saved)
+    return blob
+
+
+def attach(media):
+    """
+    Point `media` at the blob for its newly assigned file, before it is
+    saved, and drop its reference on any blob it used before.
+    """
+    previous = media.blob_id
+    upload = media.file
+    media.blob = store(upload, upload.name)
+    media.file.name = media.blob.file.name
+    media.file._committed = True  # stored already; FileField must not save it again
+
+    if previous and previous != media.blob_id:
+        release([previous])
+
+
+def release(blob_ids):
+    """Drop one reference from each blob id (repeat an id to drop several)."""
+    counts = {}
+    for blob_id in blob_ids:
+        counts[blob_id] = counts.get(blob_id, 0) + 1
+
+    now = timezone.now()
+    for blob_id, count in counts.items():
+        MediaBlob.objects.filter(pk=blob_id).update(refcount=F("refcount") - count, released_at=now)
+
+
+def adopt(queryset):
+    """
+    Move media stored before content addressing into blobs, dropping
+    duplicate copies; returns how many rows moved. A legacy file is
+    deleted once no row refers to it any more.
+    """
+    moved = 0
+    for media in queryset.filter(blob__isnull=True).exclude(file="").iterator():
+        legacy = media.file.name
+        if not default_storage.exists(legacy):
+            continue
+
+        def move():
+            with default_storage.open(legacy, "rb") as content, transaction.atomic():
+                media.blob = store(content, legacy)
+                media.file.name = media.blob.file.name
+                media.save(update_fields=["blob", "file"])
+
+        retry_while_collected(move)
+        if not IncidentMedia.objects.filter(file=legacy).exists():
+            default_storage.delete(legacy)
+        moved += 1
+    return moved
+
+
+def recount():
+    """Reset every refcount from the IncidentMedia rows; returns blobs corrected."""
+    corrected = 0
+    counts = dict(
+        IncidentMedia.objects.filter(blob__isnull=False).values("blob").annotate(
+            total=Count("id")
+        ).values_list("blob", "total")
+    )
+    for blob in MediaBlob.objects.filter(refcount__gte=0).only("pk", "refcount").iterator():
+        actual = counts.get(blob.pk, 0)
+        if blob.refcount != actual:
+            MediaBlob.objects.filter(pk=blob.pk, refcount=blob.refcount).update(
+                refcount=actual,
+                released_at=timezone.now() if actual == 0 else None,
+            )
+            corrected += 1
+    return corrected
+
+
+def _cutoff(grace_seconds, now):
+    if grace_seconds is None:
+        grace_seconds = settings.MEDIA_BLOB_GC_GRACE_SECONDS
+    return (now or timezone.now()) - timedelta(seconds=grace_seconds)
+
+
+def collect(grace_seconds=None, now=None):
+    """Delete blobs unreferenced for longer than the grace period; returns how many."""
+    cutoff = _cutoff(grace_seconds, now)
+
+    candidates = MediaBlob.objects.filter(refcount=0).filter(
+        Q(released_at__lte=cutoff) | Q(released_at__isnull=True, created_at__lte=cutoff)
+    ).values_list("pk", flat=True)
+
+    collected = 0
+    for pk in list(candidates):
+        # Claim it; a concurrent store() may have just taken a reference
+        if not MediaBlob.objects.filter(pk=pk, refcount=0).update(refcount=-1):
+            continue
+        blob = MediaBlob.objects.get(pk=pk)
+        try:
+            blob.delete()
+        except ProtectedError:
+            # The count had drifted and media still uses it
+            MediaBlob.objects.filter(pk=pk).update(refcount=blob.media.count(), released_at=None)
+            continue
+        for name in [blob.file.name] + derived_names(blob.sha256):
+            default_storage.delete(name)
+        collected += 1
+    return collected
+
+
+def _walk(directory):
+    directories, files = default_storage.listdir(directory)
+    for name in files:
+        yield f"{directory}/{name}"
+    for name in directories:
+        yield from _walk(f"{directory}/{name}")
+
+
+def collect_orphan_files(grace_seconds=None, now=None, batch_size=500):
+    """
+    Delete blob files that have no row, left behind by uploads whose
+    transaction rolled back; returns how many.
+    """
+    if not default_storage.exists(BLOB_DIR):
+        return 0
+    cutoff = _cutoff(grace_seconds, now)
+
+    def sha256_of(name):
+        if name.startswith(f"{DERIVED_DIR}/"):
+            return PurePosixPath(name).name.split("-", 1)[0]
+        return PurePosixPath(name).stem
+
+    removed = 0
+    names = list(_walk(BLOB_DIR))
+    for start in range(0, len(names), batch_size):
+        batch = {name: sha256_of(name) for name in names[start:start + batch_size]}
+        known = set(MediaBlob.objects.filter(sha256__in=set(batch.values())).values_list("sha256", flat=True))
+        for name, sha256 in batch.items():
+            if sha256 not in known and default_storage.get_modified_time(name) <= cutoff:
+                default_storage.delete(name)
+                removed += 1
+    return removed
@@ -0,0 +1,157 @@
+"""
+Cache for serialized incident list pages and detail payloads.
+
+Keys:
+- incidents:detail:<pk>            one incident's payload
+- incidents:list:v<n>:<hash>       one list page (host + full path)
+- incidents:filtered:v<n>:<hash>   one filtered or re-ordered list page
+- incidents:generation:<pk>        generation of incident <pk>
+- incidents:generation:head        generation of the pages without a cursor
+
+Every list page records the generation of each incident on it (and of the
+head, for pages without a cursor) and is a miss once one of them is gone
+or differs. A change to an incident deletes its detail key and its
+generation, which drops exactly the pages that contain it; a new incident
+drops the head pages, since cursor pages are keyed by position and do not
+move. store_page() gives a missing generation a fresh value with
+cache.add(), so concurrent writers never lose each other's updates the way
+a shared list of page keys would. When an incident re-enters the list
+(e.g. leaves "rejected") nobody knows which page it lands on, so the list
+version is bumped instead. Filtered and re-ordered pages live under their
+own version, bumped on every incident write: a status or severity change
+moves an incident between filtered lists in ways per-page eviction cannot
+follow. Evictions run on commit.
+
+Payloads carry signed media URLs, which change every
+MEDIA_URL_SIGNATURE_SECONDS window. The window is part of each ETag, and
+an entry stored in an earlier window is treated as a miss, so neither the
+cache nor a revalidating client keeps links past their expiry. There is no
+Last-Modified: updated_at does not move when the links do.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from RapidAid import media
+
+VERSION_KEY = "incidents:list:version"
+FILTERED_VERSION_KEY = "incidents:filtered:version"
+HEAD_GENERATION_KEY = "incidents:generation:head"
+
+
+def detail_key(pk):
+    return f"incidents:detail:{pk}"
+
+
+def generation_key(pk):
+    return f"incidents:generation:{pk}"
+
+
+def list_version(version_key=VERSION_KEY):
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, 1, timeout=None)
+        version = cache.get(version_key, 1)
+    return version
+
+
+def list_key(request, filtered=False):
+    raw = f"{request.get_host()}{request.get_full_path()}"
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    if filtered:
+        return f"incidents:filtered:v{list_version(FILTERED_VERSION_KEY)}:{digest}"
+    return f"incidents:list:v{list_version()}:{digest}"
+
+
+def lookup(key):
+    entry = cache.get(key)
+    if entry is None or entry.get("window") != media._window():
+        return None
+    generations = entry.get("generations")
+    if generations and cache.get_many(list(generations)) != generations:
+        return None
+    return entry
+
+
+def _entry(data, rows):
+    window = media._window()
+    stamps = [(row["id"], row["updated_at"]) for row in rows]
+    digest = hashlib.md5(
+        json.dumps([window, stamps, data.get("next"), data.get("previous")], default=str).encode()
+    )
+    return {
+        "data": data,
+        "etag": f'"{digest.hexdigest()}"',
+        "window": window,
+    }
+
+
+def _generations(keys):
+    """Current value of each generation key, starting the missing ones."""
+    current = cache.get_many(keys)
+    missing = [key for key in keys if key not in current]
+    for key in missing:
+        cache.add(key, time.time_ns(), settings.INCIDENT_CACHE_TIMEOUT)
+    if missing:
+        current.update(cache.get_many(missing))
+    return current
+
+
+def store_page(key, data, is_head):
+    entry = _entry(data, data["results"])
+    keys = [generation_key(row["id"]) for row in data["results"]]
+    entry["generations"] = _generations(keys + [HEAD_GENERATION_KEY] if is_head else keys)
+    cache.set(key, entry, settings.INCIDENT_CACHE_TIMEOUT)
+    return entry
+
+
+def store_detail(pk, data):
+    entry = _entry(data, [data])
+    cache.set(detail_key(pk), entry, settings.INCIDENT_CACHE_TIMEOUT)
+    return entry
+
+
+def conditional_response(request, entry):
+    """Response for a cache entry, or 304 when the client's copy is current."""
+    response = Response(entry["data"])
+    response["ETag"] = entry["etag"]
+    return get_conditional_response(request, etag=entry["etag"], response=response)
+
+
+def invalidate_incident(pk, created=False):
+    def evict():
+        keys = [detail_key(pk), generation_key(pk)]
+        cache.delete_many(keys + [HEAD_GENERATION_KEY] if created else keys)
+
+    transaction.on_commit(evict)
+
+
+def invalidate_incidents(pks):
+    """invalidate_incident() for many incidents changed in one bulk write."""
+    pks = list(pks)
+
+    def evict():
+        cache.delete_many([detail_key(pk) for pk in pks] + [generation_key(pk) for pk in pks])
+
+    transaction.on_commit(evict)
+
+
+def _bump(version_key):
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, 2, timeout=None)
+
+
+def invalidate_incident_lists():
+    transaction.on_commit(lambda: _bump(VERSION_KEY))
+
+
+def invalidate_filtered_incident_lists():
+    transaction.on_commit(lambda: _bump(FILTERED_VERSION_KEY))
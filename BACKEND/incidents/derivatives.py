@@ -0,0 +1,141 @@
+"""
+Thumbnail and preview images for incident photos.
+
+Feeds link these small EXIF-free derivatives instead of the full-resolution
+upload. Resizing is CPU-bound, so once a photo's row is committed the work
+goes to a process pool of MEDIA_DERIVATIVE_WORKERS processes, started on
+first use and shared by every request thread; the request never waits for
+it. When a render finishes, a pool thread records the file names on the
+row. With MEDIA_DERIVATIVE_WORKERS=0 photos are rendered inline instead.
+Rows sharing a content-addressed blob (incidents/blobs.py) share its
+derivatives. `manage.py generate_media_derivatives` backfills older photos.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path, PurePosixPath
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import blobs, imaging
+from .models import IncidentMedia, MediaType
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = "incidents/media/derived"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _new_pool(workers):
+    # Spawned workers import only incidents.imaging, never Django
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool(settings.MEDIA_DERIVATIVE_WORKERS)
+        return _pool
+
+
+def needs_derivatives(media):
+    return media.media_type == MediaType.PHOTO and bool(media.file) and not media.thumbnail
+
+
+def _target(media):
+    """(directory, file stem) for the derivatives of `media`."""
+    if media.blob_id:
+        # Content-addressed like the blob itself, so the URLs never change
+        return blobs.DERIVED_DIR, media.blob.sha256
+    return DERIVED_DIR, f"{media.pk}"
+
+
+def _task(media):
+    directory, stem = _target(media)
+    return (
+        media.file.path,
+        str(Path(settings.MEDIA_ROOT) / directory),
+        stem,
+        imaging.output_format(),
+    )
+
+
+def _record(pk, directory, names):
+    media = IncidentMedia.objects.filter(pk=pk).first()
+    if media is None:
+        return
+    media.thumbnail.name = str(PurePosixPath(directory) / names["thumbnail"])
+    media.preview.name = str(PurePosixPath(directory) / names["preview"])
+    # save() rather than update() so the incident cache signal fires
+    media.save(update_fields=["thumbnail", "preview"])
+
+
+def _reuse_shared(media):
+    """Copy the derivatives of another row with the same blob, if any exist."""
+    if not media.blob_id:
+        return False
+    rendered = IncidentMedia.objects.filter(blob_id=media.blob_id).exclude(pk=media.pk).exclude(
+        thumbnail=""
+    ).values("thumbnail", "preview").first()
+    if rendered is None:
+        return False
+
+    media.thumbnail.name, media.preview.name = rendered["thumbnail"], rendered["preview"]
+    media.save(update_fields=["thumbnail", "preview"])
+    return True
+
+
+def _finished(pk, directory, future):
+    close_old_connections()
+    try:
+        _record(pk, directory, future.result())
+    except Exception:
+        logger.exception("Could not render derivatives for media %s", pk)
+    finally:
+        close_old_connections()
+
+
+def render_now(media):
+    """Render and record derivatives in this process."""
+    _record(media.pk, _target(media)[0], imaging.render(*_task(media)))
+
+
+def schedule(media):
+    """Queue derivatives for a committed photo without waiting for them."""
+    if not needs_derivatives(media) or _reuse_shared(media):
+        return
+    if settings.MEDIA_DERIVATIVE_WORKERS <= 0:
+        try:
+            render_now(media)
+        except Exception:
+            logger.exception("Could not render derivatives for media %s", media.pk)
+        return
+
+    future = _executor().submit(imaging.render, *_task(media))
+    future.add_done_callback(partial(_finished, media.pk, _target(media)[0]))
+
+
+def backfill(queryset):
+    """Render derivatives for the photos in `queryset` and wait for them."""
+    rendered = 0
+    with _new_pool(max(settings.MEDIA_DERIVATIVE_WORKERS, 1)) as pool:
+        futures = {
+            pool.submit(imaging.render, *_task(media)): media
+            for media in queryset.select_related("blob").iterator()
+            if needs_derivatives(media)
+        }
+        for future in as_completed(futures):
+            media = futures[future]
+            try:
+                _record(media.pk, _target(media)[0], future.result())
+            except Exception:
+                logger.exception("Could not render derivatives for media %s", media.pk)
+            else:
+                rendered += 1
+    return rendered
@@ -0,0 +1,52 @@
+"""
+Photo derivative rendering, run in worker processes by
+incidents/derivatives.py.
+
+Only Pillow and the standard library are imported here: a spawned worker
+imports this module to unpickle its task and must not need Django set up.
+"""
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+# Longest edge in pixels; images are only ever shrunk
+SIZES = {
+    "thumbnail": 320,
+    "preview": 1280,
+}
+QUALITY = 80
+
+
+def output_format():
+    return "WEBP" if features.check("webp") else "JPEG"
+
+
+def render(source, target_dir, stem, image_format):
+    """
+    Write one derivative per SIZES entry for the image at `source` into
+    `target_dir` as "<stem>-<size>.<ext>". Returns {size: file name}.
+
+    Orientation is applied to the pixels and EXIF (GPS position, camera
+    serials, ...) is dropped from every derivative.
+    """
+    target_dir = Path(target_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    extension = "webp" if image_format == "WEBP" else "jpg"
+
+    with Image.open(source) as image:
+        # JPEGs decode straight at a reduced scale, far cheaper than a full decode
+        largest = max(SIZES.values())
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA") or (image_format == "JPEG" and image.mode != "RGB"):
+            image = image.convert("RGB")
+
+        names = {}
+        # Largest first, so each size is resampled from the previous one
+        for size, edge in sorted(SIZES.items(), key=lambda item: -item[1]):
+            image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            image.info = {}
+            name = f"{stem}-{size}.{extension}"
+            image.save(target_dir / name, image_format, quality=QUALITY, exif=b"")
+            names[size] = name
+    return names
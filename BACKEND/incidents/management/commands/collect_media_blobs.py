@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from incidents import blobs
+
+
+class Command(BaseCommand):
+    help = "Delete media blobs no incident media references any more, and stray blob files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recompute reference counts from the media rows first.",
+        )
+        parser.add_argument(
+            "--grace-seconds",
+            type=int,
+            default=None,
+            help="Keep blobs released more recently than this (default MEDIA_BLOB_GC_GRACE_SECONDS).",
+        )
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            corrected = blobs.recount()
+            self.stdout.write(f"Corrected {corrected} reference count(s)")
+
+        collected = blobs.collect(options["grace_seconds"])
+        orphans = blobs.collect_orphan_files(options["grace_seconds"])
+        self.stdout.write(self.style.SUCCESS(f"Collected {collected} blob(s) and {orphans} stray file(s)"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from incidents import blobs
+from incidents.models import IncidentMedia
+
+
+class Command(BaseCommand):
+    help = "Move incident media uploaded before content addressing into deduplicated blobs."
+
+    def handle(self, *args, **options):
+        moved = blobs.adopt(IncidentMedia.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} media file(s) into blobs"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from incidents import derivatives
+from incidents.models import IncidentMedia, MediaType
+
+
+class Command(BaseCommand):
+    help = "Render thumbnails and previews for incident photos that have none yet."
+
+    def handle(self, *args, **options):
+        pending = IncidentMedia.objects.filter(media_type=MediaType.PHOTO, thumbnail="").exclude(file="")
+        rendered = derivatives.backfill(pending)
+        self.stdout.write(self.style.SUCCESS(f"Rendered derivatives for {rendered} photo(s)"))
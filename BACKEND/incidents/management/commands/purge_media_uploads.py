@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from incidents.uploads import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete abandoned chunked media uploads and their partial files."
+
+    def handle(self, *args, **options):
+        removed = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} abandoned upload(s)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from incidents.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text index behind /api/incidents/search/."
+
+    def handle(self, *args, **options):
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS("Rebuilt the incident search index"))
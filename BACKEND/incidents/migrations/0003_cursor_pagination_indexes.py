@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0002_incidentmedia_uploaded_by'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['-created_at', '-id'], name='incident_created_id_idx'),
+        ),
+    ]
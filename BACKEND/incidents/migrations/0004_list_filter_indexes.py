@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0003_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='incident',
+            name='incidents_i_status_9a4f12_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='incident',
+            name='incidents_i_inciden_337dba_idx',
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['status', '-created_at'], name='incident_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['severity', '-created_at'], name='incident_severity_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['incident_type', '-created_at'], name='incident_type_created_idx'),
+        ),
+    ]
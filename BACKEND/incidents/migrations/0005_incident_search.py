@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:24
+
+from django.db import migrations
+
+from incidents.search import create_index, drop_index
+
+
+def forwards(apps, schema_editor):
+    create_index(schema_editor.execute, schema_editor.connection.vendor)
+
+
+def backwards(apps, schema_editor):
+    drop_index(schema_editor.execute, schema_editor.connection.vendor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0004_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
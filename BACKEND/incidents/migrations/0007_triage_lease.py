@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0006_coordinates_geohash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TriageLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('claim_token', models.UUIDField()),
+                ('claimed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['status', 'severity', 'created_at'], name='incident_triage_idx'),
+        ),
+        migrations.AddField(
+            model_name='triagelease',
+            name='claimed_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='triage_leases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='triagelease',
+            name='incident',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='triage_lease', to='incidents.incident'),
+        ),
+        migrations.AddIndex(
+            model_name='triagelease',
+            index=models.Index(fields=['expires_at'], name='triage_lease_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='triagelease',
+            index=models.Index(fields=['claimed_by', 'expires_at'], name='triage_lease_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='triagelease',
+            index=models.Index(fields=['claim_token'], name='triage_lease_token_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0008_media_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incidentmedia',
+            name='preview',
+            field=models.FileField(blank=True, editable=False, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='incidentmedia',
+            name='thumbnail',
+            field=models.FileField(blank=True, editable=False, upload_to=''),
+        ),
+    ]
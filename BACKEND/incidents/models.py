@@ -1,7 +1,11 @@
+import uuid
+
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
 
+from RapidAid.geo import LATITUDE_VALIDATORS, LONGITUDE_VALIDATORS, point_geohash, save_fields
+
 User = settings.AUTH_USER_MODEL
 
 
@@ -26,6 +30,11 @@ class IncidentType(models.TextChoices):
     OTHER = "other", "Other"
 
 
+class MediaType(models.TextChoices):
+    PHOTO = "photo", "Photo"
+    VIDEO = "video", "Video"
+
+
 class Severity(models.TextChoices):
     LOW = "low", "Low"
     MEDIUM = "medium", "Medium"
@@ -59,8 +68,24 @@ class Incident(models.Model):
         choices=Severity.choices
     )
 
-    # Location (simple text now, can expand later)
+    # Location (free text) and optional coordinates
     location = models.CharField(max_length=255)
+    latitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        validators=LATITUDE_VALIDATORS
+    )
+    longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        validators=LONGITUDE_VALIDATORS
+    )
+    # Spatial index key, derived from the coordinates in save()
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
 
     # Date of actual incident
     incident_date = models.DateField()
@@ -87,14 +112,52 @@ class Incident(models.Model):
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["status"]),
-            models.Index(fields=["incident_type"]),
+            models.Index(fields=["-created_at", "-id"], name="incident_created_id_idx"),
+            models.Index(fields=["status", "-created_at"], name="incident_status_created_idx"),
+            models.Index(fields=["severity", "-created_at"], name="incident_severity_created_idx"),
+            models.Index(fields=["incident_type", "-created_at"], name="incident_type_created_idx"),
+            models.Index(fields=["geohash"], name="incident_geohash_idx"),
+            models.Index(fields=["status", "severity", "created_at"], name="incident_triage_idx"),
         ]
 
+    def save(self, *args, **kwargs):
+        self.geohash = point_geohash(self.latitude, self.longitude)
+        kwargs["update_fields"] = save_fields(kwargs.get("update_fields"))
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
 
+# ======================================================
+# MEDIA BLOB (CONTENT-ADDRESSED FILE)
+# ======================================================
+
+class MediaBlob(models.Model):
+    """
+    One stored file, named after the sha256 of its bytes and shared by
+    every IncidentMedia row with that content (see incidents/blobs.py).
+    refcount counts those rows; -1 marks a blob being garbage collected.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255)
+    size = models.BigIntegerField()
+    refcount = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the last reference went away; collection waits for a grace period
+    released_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["refcount", "released_at"], name="media_blob_gc_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.refcount} refs)"
+
+
 # ======================================================
 # INCIDENT MEDIA
 # ======================================================
@@ -114,17 +177,79 @@ class IncidentMedia(models.Model):
     )
 
     file = models.FileField(upload_to="incidents/media/")
+    # The stored content; file.name is the blob's name. Empty for media
+    # stored before content addressing.
+    blob = models.ForeignKey(
+        MediaBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="media"
+    )
     media_type = models.CharField(
         max_length=10,
-        choices=[("photo", "Photo"), ("video", "Video")]
+        choices=MediaType.choices
     )
 
+    # Resized, EXIF-free copies of photos, filled in the background
+    # (see incidents/derivatives.py); empty until rendered
+    thumbnail = models.FileField(blank=True, editable=False)
+    preview = models.FileField(blank=True, editable=False)
+
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Media for Incident {self.incident_id}"
 
 
+# ======================================================
+# CHUNKED MEDIA UPLOAD (RESUMABLE)
+# ======================================================
+
+class MediaUpload(models.Model):
+    """
+    An unfinished chunked upload (see incidents/uploads.py). Bytes land in
+    a partial file under MEDIA_UPLOAD_TEMP_DIR; `received` is the offset
+    acknowledged so far, where a client resumes after losing its connection.
+    Finalizing turns the upload into an IncidentMedia row.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    incident = models.ForeignKey(
+        Incident,
+        on_delete=models.CASCADE,
+        related_name="media_uploads"
+    )
+
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="media_uploads"
+    )
+
+    filename = models.CharField(max_length=255)
+    media_type = models.CharField(max_length=10, choices=MediaType.choices)
+    size = models.BigIntegerField()
+
+    # Optional sha256 (hex) of the whole file, checked on finalize
+    checksum = models.CharField(max_length=64, blank=True)
+
+    received = models.BigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="media_upload_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.received}/{self.size} bytes)"
+
+
 # ======================================================
 # INCIDENT TIMELINE (TRANSPARENCY)
 # ======================================================
@@ -161,3 +286,42 @@ class IncidentTimeline(models.Model):
 
     def __str__(self):
         return f"Timeline entry for Incident {self.incident_id}"
+
+
+# ======================================================
+# TRIAGE LEASE (ADMIN WORK QUEUE)
+# ======================================================
+
+class TriageLease(models.Model):
+    """
+    An admin's claim on a reported incident in the triage queue. One lease
+    per incident; it stops counting once expires_at has passed.
+    """
+
+    incident = models.OneToOneField(
+        Incident,
+        on_delete=models.CASCADE,
+        related_name="triage_lease"
+    )
+
+    claimed_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="triage_leases"
+    )
+
+    # Identifies the rows written by one claim request
+    claim_token = models.UUIDField()
+
+    claimed_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="triage_lease_expires_idx"),
+            models.Index(fields=["claimed_by", "expires_at"], name="triage_lease_owner_idx"),
+            models.Index(fields=["claim_token"], name="triage_lease_token_idx"),
+        ]
+
+    def __str__(self):
+        return f"Incident {self.incident_id} claimed by {self.claimed_by_id}"
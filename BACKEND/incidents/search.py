@@ -0,0 +1,165 @@
+"""
+Full-text search over incident title, description and location.
+
+SQLite: an external-content FTS5 table (incidents_incident_fts) whose rowid
+is the incident id, kept in sync by triggers on incidents_incident, so bulk
+inserts and queryset.update() are indexed too. Ranked with bm25.
+
+PostgreSQL: a generated, weighted tsvector column (search_vector) with a GIN
+index, ranked with ts_rank_cd.
+
+Both are created by migration 0005_incident_search. Every word of the query
+must match, and the last word also matches as a prefix ("kath" finds
+"Kathmandu") so search-as-you-type works. Other backends fall back to
+icontains scans.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Incident
+
+FTS_TABLE = "incidents_incident_fts"
+
+# Title and location hits outrank description hits
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0)
+
+SQLITE_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, description, location,
+        content='incidents_incident', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER incidents_incident_fts_insert AFTER INSERT ON incidents_incident BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER incidents_incident_fts_delete AFTER DELETE ON incidents_incident BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER incidents_incident_fts_update
+    AFTER UPDATE OF title, description, location ON incidents_incident BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS incidents_incident_fts_insert",
+    "DROP TRIGGER IF EXISTS incidents_incident_fts_delete",
+    "DROP TRIGGER IF EXISTS incidents_incident_fts_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INDEX_SQL = [
+    """
+    ALTER TABLE incidents_incident ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX incident_search_vector_idx ON incidents_incident USING GIN (search_vector)",
+]
+
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS incident_search_vector_idx",
+    "ALTER TABLE incidents_incident DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def create_index(execute, vendor):
+    statements = {"sqlite": SQLITE_INDEX_SQL, "postgresql": POSTGRES_INDEX_SQL}
+    for sql in statements.get(vendor, []):
+        execute(sql)
+
+
+def drop_index(execute, vendor):
+    statements = {"sqlite": SQLITE_DROP_SQL, "postgresql": POSTGRES_DROP_SQL}
+    for sql in statements.get(vendor, []):
+        execute(sql)
+
+
+def rebuild_index():
+    """
+    Drop and recreate the index from the incident rows. On SQLite a
+    migration that makes Django rebuild incidents_incident drops the sync
+    triggers with the old table, so such migrations call this afterwards.
+    """
+    with connection.cursor() as cursor:
+        drop_index(cursor.execute, connection.vendor)
+        create_index(cursor.execute, connection.vendor)
+
+
+def terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def _sqlite_match(words):
+    # Words are \w+ so quoting them as FTS5 strings is always safe
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _postgres_match(words):
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"])
+
+
+def search_ids(query, statuses, limit, offset=0):
+    """
+    Ids of incidents matching `query` with a status in `statuses`, best
+    match first.
+    """
+    words = terms(query)
+    if not words or not statuses:
+        return []
+
+    placeholders = ", ".join(["%s"] * len(statuses))
+
+    if connection.vendor == "sqlite":
+        sql = f"""
+            SELECT f.rowid FROM {FTS_TABLE} f
+            JOIN incidents_incident i ON i.id = f.rowid
+            WHERE {FTS_TABLE} MATCH %s AND i.status IN ({placeholders})
+            ORDER BY bm25({FTS_TABLE}, {", ".join(map(str, SQLITE_WEIGHTS))}), f.rowid DESC
+            LIMIT %s OFFSET %s
+        """
+        params = [_sqlite_match(words), *statuses, limit, offset]
+    elif connection.vendor == "postgresql":
+        sql = f"""
+            SELECT id FROM incidents_incident, to_tsquery('simple', %s) query
+            WHERE search_vector @@ query AND status IN ({placeholders})
+            ORDER BY ts_rank_cd(search_vector, query) DESC, id DESC
+            LIMIT %s OFFSET %s
+        """
+        params = [_postgres_match(words), *statuses, limit, offset]
+    else:
+        return _fallback_ids(words, statuses, limit, offset)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _fallback_ids(words, statuses, limit, offset):
+    queryset = Incident.objects.filter(status__in=statuses)
+    for word in words:
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(description__icontains=word) | Q(location__icontains=word)
+        )
+    return list(queryset.order_by("-created_at", "-id").values_list("id", flat=True)[offset:offset + limit])
@@ -1,15 +1,18 @@
 from rest_framework import serializers
-from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
 
 from .models import (
     Incident,
     IncidentMedia,
     IncidentTimeline,
-    IncidentStatus
+    MediaUpload
 )
+from .transitions import TARGET_STATUSES, apply_transition, transition_error
+from .triage import held_by_others
 from volunteer.models import VolunteerStatus
-from RapidAid.email_utils import send_notification_email
+from RapidAid.geo import validate_point
+from RapidAid.media import SignedMediaField
 
 User = settings.AUTH_USER_MODEL
 
@@ -19,15 +22,69 @@ User = settings.AUTH_USER_MODEL
 # ======================================================
 
 class IncidentMediaSerializer(serializers.ModelSerializer):
+    file = SignedMediaField()
+    thumbnail = SignedMediaField(read_only=True)
+    preview = SignedMediaField(read_only=True)
+
     class Meta:
         model = IncidentMedia
         fields = [
             "id",
             "file",
+            "thumbnail",
+            "preview",
             "media_type",
             "uploaded_at"
         ]
-        read_only_fields = ["id", "uploaded_at"]
+        read_only_fields = ["id", "thumbnail", "preview", "uploaded_at"]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Feeds (context media_originals=False) link the derivatives only;
+        # the original stays for media that has none yet, e.g. videos
+        if not self.context.get("media_originals", True) and data["thumbnail"]:
+            del data["file"]
+        return data
+
+
+class MediaUploadSerializer(serializers.ModelSerializer):
+    upload_id = serializers.UUIDField(source="id", read_only=True)
+    offset = serializers.IntegerField(source="received", read_only=True)
+    size = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, allow_blank=True)
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MediaUpload
+        fields = [
+            "upload_id",
+            "filename",
+            "media_type",
+            "size",
+            "checksum",
+            "offset",
+            "chunk_size",
+            "expires_at"
+        ]
+        read_only_fields = ["expires_at"]
+
+    def get_chunk_size(self, obj):
+        return settings.MEDIA_UPLOAD_CHUNK_BYTES
+
+    def validate_filename(self, value):
+        # Only the base name is kept; storage picks the directory
+        name = value.replace("\\", "/").rsplit("/", 1)[-1].strip()
+        if not name or name in (".", ".."):
+            raise serializers.ValidationError("Invalid file name")
+        return name
+
+    def validate_size(self, value):
+        if value > settings.MEDIA_UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(f"Files are limited to {settings.MEDIA_UPLOAD_MAX_BYTES} bytes")
+        return value
+
+    def validate_checksum(self, value):
+        return value.lower()
 
 
 # ======================================================
@@ -71,6 +128,8 @@ class IncidentCreateSerializer(serializers.ModelSerializer):
             "incident_type",
             "severity",
             "location",
+            "latitude",
+            "longitude",
             "incident_date",
             "media",
             "status",
@@ -82,6 +141,9 @@ class IncidentCreateSerializer(serializers.ModelSerializer):
             "created_at"
         ]
 
+    def validate(self, attrs):
+        return validate_point(attrs, self.instance)
+
     def create(self, validated_data):
         request = self.context["request"]
 
@@ -115,9 +177,12 @@ class IncidentPublicSerializer(serializers.ModelSerializer):
     approved_volunteers = serializers.SerializerMethodField()
 
     def get_approved_volunteers(self, obj):
-        approved = obj.volunteers.filter(
-            status=VolunteerStatus.APPROVED
-        ).select_related("user").order_by("-approved_at")
+        # Filled by the Prefetch in views.public_incident_queryset
+        approved = getattr(obj, "approved_volunteer_list", None)
+        if approved is None:
+            approved = obj.volunteers.filter(
+                status=VolunteerStatus.APPROVED
+            ).select_related("user").order_by("-approved_at")
 
         return [
             {
@@ -140,6 +205,8 @@ class IncidentPublicSerializer(serializers.ModelSerializer):
             "incident_type",
             "severity",
             "location",
+            "latitude",
+            "longitude",
             "incident_date",
             "status",
             "reporter_name",
@@ -164,61 +231,86 @@ class IncidentAdminUpdateSerializer(serializers.ModelSerializer):
         ]
 
     def validate_status(self, value):
-        instance = self.instance
-
-        if instance.status == IncidentStatus.RESOLVED:
-            raise serializers.ValidationError(
-                "Resolved incident cannot be modified"
-            )
-
-        allowed = [
-            IncidentStatus.VERIFIED,
-            IncidentStatus.REJECTED,
-            IncidentStatus.IN_RESCUE,
-            IncidentStatus.RESOLVED,
-        ]
+        error = transition_error(self.instance.status, value)
+        if error:
+            raise serializers.ValidationError(error)
 
-        if value not in allowed:
-            raise serializers.ValidationError("Invalid status transition")
+        if held_by_others([self.instance.pk], self.context["request"].user):
+            raise serializers.ValidationError("Claimed by another admin in the triage queue")
 
         return value
 
     def update(self, instance, validated_data):
         request = self.context["request"]
-        new_status = validated_data["status"]
-        previous_status = instance.status
 
-        instance.status = new_status
+        with transaction.atomic():
+            apply_transition([instance], validated_data["status"], request.user)
 
-        # Admin approval info
-        if new_status == IncidentStatus.VERIFIED:
-            instance.approved_by = request.user
-            instance.approved_at = timezone.now()
+        return instance
 
-        instance.save()
 
-        # Timeline entry
-        IncidentTimeline.objects.create(
-            incident=instance,
-            title=f"Incident {new_status.replace('_', ' ').title()}",
-            description=f"Status updated to {new_status}",
-            created_by=request.user
-        )
+# ======================================================
+# BULK INCIDENT TRIAGE (ADMIN)
+# ======================================================
 
-        if (
-            previous_status != IncidentStatus.VERIFIED
-            and new_status == IncidentStatus.VERIFIED
-            and instance.reporter_id
-        ):
-            send_notification_email(
-                to_email=instance.reporter.email,
-                subject="RapidAid: Incident Approved",
-                message=(
-                    f"Hello {instance.reporter.full_name},\n\n"
-                    f"Your incident '{instance.title}' has been approved and marked as verified.\n"
-                    "You can now open RapidAid to track updates and community support.\n\n"
-                    "Thank you,\nRapidAid Team"
-                ),
-            )
+class IncidentBulkTransitionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+    status = serializers.ChoiceField(choices=TARGET_STATUSES)
 
-        return instance
+    def save(self):
+        request = self.context["request"]
+        ids = list(dict.fromkeys(self.validated_data["ids"]))
+        target = self.validated_data["status"]
+
+        with transaction.atomic():
+            incidents = Incident.objects.select_related("reporter").select_for_update(
+                of=("self",)
+            ).in_bulk(ids)
+
+            claimed = held_by_others(list(incidents), request.user)
+
+            movable, skipped = [], []
+            for pk in ids:
+                incident = incidents.get(pk)
+                if incident is None:
+                    error = "Not found"
+                elif pk in claimed:
+                    error = "Claimed by another admin"
+                elif incident.status == target:
+                    error = f"Already {target}"
+                else:
+                    error = transition_error(incident.status, target)
+
+                if error:
+                    skipped.append({"id": pk, "error": error})
+                else:
+                    movable.append(incident)
+
+            if movable:
+                apply_transition(movable, target, request.user)
+
+        return {
+            "status": target,
+            "updated": [incident.pk for incident in movable],
+            "skipped": skipped,
+        }
+
+
+# ======================================================
+# TRIAGE QUEUE (ADMIN)
+# ======================================================
+
+class TriageClaimSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class TriageReleaseSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
@@ -0,0 +1,55 @@
+"""
+Keep cached incident payloads and Incident.updated_at in step with the
+rows IncidentPublicSerializer embeds, store media files by content and
+queue derivatives for new photos.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import blobs, derivatives
+from .cache import invalidate_filtered_incident_lists, invalidate_incident
+from .models import Incident, IncidentMedia, IncidentTimeline
+from volunteer.models import VolunteerAssignment
+
+
+@receiver(post_save, sender=Incident)
+def incident_saved(sender, instance, created, **kwargs):
+    invalidate_incident(instance.pk, created=created)
+    invalidate_filtered_incident_lists()
+
+
+@receiver(post_delete, sender=Incident)
+def incident_deleted(sender, instance, **kwargs):
+    invalidate_incident(instance.pk)
+    invalidate_filtered_incident_lists()
+
+
+def related_row_changed(sender, instance, **kwargs):
+    # Bumping updated_at keeps the ETag of the incident honest
+    Incident.objects.filter(pk=instance.incident_id).update(updated_at=timezone.now())
+    invalidate_incident(instance.incident_id)
+
+
+for model in (IncidentTimeline, IncidentMedia, VolunteerAssignment):
+    post_save.connect(related_row_changed, sender=model, dispatch_uid=f"incident_cache_save_{model.__name__}")
+    post_delete.connect(related_row_changed, sender=model, dispatch_uid=f"incident_cache_delete_{model.__name__}")
+
+
+@receiver(post_save, sender=IncidentMedia)
+def media_created(sender, instance, created, **kwargs):
+    if created and derivatives.needs_derivatives(instance):
+        transaction.on_commit(lambda: derivatives.schedule(instance))
+
+
+@receiver(pre_save, sender=IncidentMedia)
+def media_file_assigned(sender, instance, **kwargs):
+    if instance.file and not instance.file._committed:
+        blobs.attach(instance)
+
+
+@receiver(post_delete, sender=IncidentMedia)
+def media_deleted(sender, instance, **kwargs):
+    if instance.blob_id:
+        blobs.release([instance.blob_id])
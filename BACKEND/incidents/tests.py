@@ -1,3 +1,777 @@
-from django.test import TestCase
+import hashlib
+import io
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from PIL import Image
+from rest_framework.exceptions import NotFound
+
+from . import blobs, uploads
+from .serializers import IncidentMediaSerializer
+from .models import (
+    Incident,
+    IncidentMedia,
+    IncidentStatus,
+    IncidentTimeline,
+    MediaBlob,
+    MediaUpload,
+    Severity,
+    TriageLease,
+)
+from Authapp.models import UserRole
+from dashboard.models import DashboardCounter
+from notifications.models import OutboxEmail
+from RapidAid import media as media_views
+from RapidAid.testing import QueryCountMixin, TemporaryMediaMixin, api_client, make_incident, make_user
+from volunteer.models import VolunteerAssignment, VolunteerStatus
+
+
+class IncidentQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = make_user(role=UserRole.ADMIN)
+        self.client = api_client(self.admin)
+
+    def add_incident(self):
+        incident = make_incident(
+            reporter=make_user(),
+            status=IncidentStatus.VERIFIED,
+        )
+        IncidentTimeline.objects.create(
+            incident=incident,
+            title="Incident Verified",
+            created_by=self.admin,
+        )
+        IncidentMedia.objects.create(
+            incident=incident,
+            file="incidents/media/photo.jpg",
+            media_type="photo",
+        )
+        for status in [VolunteerStatus.APPROVED, VolunteerStatus.PENDING]:
+            VolunteerAssignment.objects.create(
+                user=make_user(),
+                incident=incident,
+                status=status,
+            )
+        return incident
+
+    def test_incident_list_queries_do_not_grow_with_rows(self):
+        self.assertConstantQueries(self.client, "/api/incidents/", self.add_incident)
+
+    def test_incident_detail_queries_do_not_grow_with_related_rows(self):
+        incident = self.add_incident()
+
+        def add_related_rows():
+            IncidentTimeline.objects.create(incident=incident, title="Update", created_by=make_user())
+            VolunteerAssignment.objects.create(
+                user=make_user(),
+                incident=incident,
+                status=VolunteerStatus.APPROVED,
+            )
+
+        self.assertConstantQueries(self.client, f"/api/incidents/{incident.id}/", add_related_rows)
+
+    def test_only_approved_volunteers_are_listed(self):
+        incident = self.add_incident()
+
+        response = self.client.get(f"/api/incidents/{incident.id}/")
+
+        self.assertEqual(len(response.data["approved_volunteers"]), 1)
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class IncidentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = make_user(role=UserRole.ADMIN)
+        self.client = api_client(self.admin)
+        self.incident = make_incident(reporter=make_user(), status=IncidentStatus.VERIFIED)
+
+    def test_detail_is_served_from_cache(self):
+        url = f"/api/incidents/{self.incident.id}/"
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.data["id"], self.incident.id)
+
+    def test_matching_etag_returns_not_modified(self):
+        url = f"/api/incidents/{self.incident.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_the_media_signature_window(self):
+        url = f"/api/incidents/{self.incident.id}/"
+        first = self.client.get(url)
+        self.assertNotIn("Last-Modified", first)
+
+        later = time.time() + 2 * settings.MEDIA_URL_SIGNATURE_SECONDS
+        with mock.patch("RapidAid.media.time.time", return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    def test_new_timeline_entry_evicts_detail_and_pages(self):
+        detail_url = f"/api/incidents/{self.incident.id}/"
+        etag = self.client.get(detail_url)["ETag"]
+        self.client.get("/api/incidents/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            IncidentTimeline.objects.create(incident=self.incident, title="Rescue started")
+
+        detail = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(len(detail.data["timeline"]), 1)
+        listed = self.client.get("/api/incidents/").data["results"][0]
+        self.assertEqual(len(listed["timeline"]), 1)
+
+    def test_change_refreshes_every_page_holding_the_incident(self):
+        urls = ["/api/incidents/", "/api/incidents/?page_size=1"]
+        for url in urls:
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.incident.title = "Bridge collapsed"
+            self.incident.save()
+
+        for url in urls:
+            self.assertEqual(self.client.get(url).data["results"][0]["title"], "Bridge collapsed")
+
+    def test_new_incident_appears_on_first_page(self):
+        self.client.get("/api/incidents/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            created = make_incident(reporter=make_user())
+
+        ids = [row["id"] for row in self.client.get("/api/incidents/").data["results"]]
+        self.assertEqual(ids[0], created.id)
+
+    def test_unrejecting_an_incident_refreshes_lists(self):
+        rejected = make_incident(reporter=make_user(), status=IncidentStatus.REJECTED)
+        self.client.get("/api/incidents/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/incidents/admin/{rejected.id}/update/",
+                {"status": IncidentStatus.VERIFIED},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        ids = [row["id"] for row in self.client.get("/api/incidents/").data["results"]]
+        self.assertIn(rejected.id, ids)
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class IncidentFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = api_client(make_user())
+        self.verified = make_incident(status=IncidentStatus.VERIFIED, severity="high")
+        self.reported = make_incident(status=IncidentStatus.REPORTED, severity="low")
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_filters_by_status_and_severity(self):
+        self.assertEqual(self.ids("/api/incidents/?status=verified"), [self.verified.id])
+        self.assertEqual(self.ids("/api/incidents/?severity=low"), [self.reported.id])
+        self.assertEqual(
+            self.ids("/api/incidents/?status=verified,reported"),
+            [self.reported.id, self.verified.id],
+        )
+
+    def test_invalid_choice_is_rejected(self):
+        response = self.client.get("/api/incidents/?status=unknown")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.data)
+
+    def test_ordering_flips_direction(self):
+        self.assertEqual(
+            self.ids("/api/incidents/?ordering=created_at"),
+            [self.verified.id, self.reported.id],
+        )
+
+    def test_status_change_refreshes_filtered_pages(self):
+        self.assertEqual(self.ids("/api/incidents/?status=verified"), [self.verified.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reported.status = IncidentStatus.VERIFIED
+            self.reported.save()
+
+        self.assertEqual(
+            self.ids("/api/incidents/?status=verified"),
+            [self.reported.id, self.verified.id],
+        )
+
+
+class IncidentSearchTests(TestCase):
+    def setUp(self):
+        self.client = api_client(make_user())
+        self.flood = make_incident(
+            title="Flood in Kathmandu valley",
+            description="River overflowed near the bridge",
+            location="Kathmandu",
+            status=IncidentStatus.VERIFIED,
+        )
+        self.fire = make_incident(
+            title="Market fire",
+            description="Smoke reported, flood of calls from Kathmandu residents",
+            location="Pokhara",
+            status=IncidentStatus.REPORTED,
+        )
+        self.rejected = make_incident(title="Flood rumour", status=IncidentStatus.REJECTED)
+
+    def ids(self, query, **params):
+        response = self.client.get("/api/incidents/search/", {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_title_matches_rank_first_and_rejected_are_hidden(self):
+        self.assertEqual(self.ids("flood"), [self.flood.id, self.fire.id])
+
+    def test_last_word_matches_as_prefix(self):
+        self.assertEqual(self.ids("river kath"), [self.flood.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.fire.title = "Market blaze"
+        self.fire.description = "Smoke reported"
+        self.fire.save()
+        self.assertEqual(self.ids("blaze"), [self.fire.id])
+        self.assertEqual(self.ids("flood"), [self.flood.id])
+
+        self.flood.delete()
+        self.assertEqual(self.ids("flood"), [])
+
+    def test_status_filter_and_missing_query(self):
+        self.assertEqual(self.ids("flood", status="reported"), [self.fire.id])
+        self.assertEqual(self.client.get("/api/incidents/search/").status_code, 400)
+
+
+class IncidentGeoTests(TestCase):
+    def setUp(self):
+        self.client = api_client(make_user())
+        # Kathmandu, Lalitpur (~5 km away) and Pokhara (~140 km away)
+        self.kathmandu = make_incident(latitude="27.717200", longitude="85.324000")
+        self.lalitpur = make_incident(latitude="27.666700", longitude="85.316700")
+        self.pokhara = make_incident(latitude="28.209600", longitude="83.985600")
+        make_incident(latitude="27.717300", longitude="85.324100", status=IncidentStatus.REJECTED)
+        make_incident()
+
+    def test_geohash_follows_coordinates(self):
+        self.assertEqual(self.kathmandu.geohash[:7], "tuutttg")
+
+        self.kathmandu.latitude = self.kathmandu.longitude = None
+        self.kathmandu.save(update_fields=["latitude", "longitude"])
+        self.kathmandu.refresh_from_db()
+        self.assertIsNone(self.kathmandu.geohash)
+
+    def test_nearby_returns_closest_within_radius(self):
+        response = self.client.get("/api/incidents/nearby/", {"lat": 27.7172, "lng": 85.324})
+
+        self.assertEqual(response.status_code, 200)
+        rows = response.data["results"]
+        self.assertEqual([row["id"] for row in rows], [self.kathmandu.id, self.lalitpur.id])
+        self.assertLess(rows[1]["distance_km"], 6)
+
+        response = self.client.get(
+            "/api/incidents/nearby/", {"lat": 27.7172, "lng": 85.324, "radius_km": 200, "limit": 5}
+        )
+        self.assertEqual(response.data["results"][-1]["id"], self.pokhara.id)
+
+    def test_within_box(self):
+        response = self.client.get(
+            "/api/incidents/within/",
+            {"min_lat": 27.6, "min_lng": 85.2, "max_lat": 27.7, "max_lng": 85.4},
+        )
+
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.lalitpur.id])
+
+    def test_invalid_coordinates_are_rejected(self):
+        response = self.client.get("/api/incidents/nearby/", {"lat": 95, "lng": 85})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            "/api/incidents/report/",
+            {
+                "title": "Flood",
+                "description": "Water rising",
+                "incident_type": "flood",
+                "severity": "high",
+                "location": "Kathmandu",
+                "incident_date": "2025-01-01",
+                "latitude": "27.7",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class IncidentBulkTransitionTests(TestCase):
+    url = "/api/incidents/admin/bulk-transition/"
+
+    def setUp(self):
+        self.admin = make_user(role=UserRole.ADMIN)
+        self.client = api_client(self.admin)
+
+    def triage(self, ids, status=IncidentStatus.VERIFIED):
+        return self.client.post(self.url, {"ids": ids, "status": status}, format="json")
+
+    def test_verifies_batch_and_reports_skipped(self):
+        reported = [make_incident(reporter=make_user()) for _ in range(3)]
+        resolved = make_incident(status=IncidentStatus.RESOLVED)
+        verified = make_incident(status=IncidentStatus.VERIFIED)
+
+        response = self.triage([incident.id for incident in reported] + [resolved.id, verified.id, 999999])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], [incident.id for incident in reported])
+        self.assertEqual(
+            [row["id"] for row in response.data["skipped"]],
+            [resolved.id, verified.id, 999999],
+        )
+        self.assertEqual(
+            Incident.objects.filter(status=IncidentStatus.VERIFIED, approved_by=self.admin).count(), 3
+        )
+        self.assertEqual(IncidentTimeline.objects.filter(incident__in=reported).count(), 3)
+        self.assertEqual(OutboxEmail.objects.count(), 3)
+        self.assertEqual(
+            DashboardCounter.objects.get(metric="incident_status", key=IncidentStatus.VERIFIED).value, 4
+        )
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def queries_for(count):
+            ids = [make_incident(reporter=make_user()).id for _ in range(count)]
+            with self.captureOnCommitCallbacks() as callbacks:
+                with CaptureQueriesContext(connection) as queries:
+                    self.triage(ids)
+            self.assertTrue(callbacks)
+            return len(queries)
+
+        queries_for(1)  # creates the dashboard counter rows
+        self.assertEqual(queries_for(2), queries_for(20))
+
+    def test_non_admin_is_forbidden(self):
+        incident = make_incident()
+        client = api_client(make_user())
+
+        response = client.post(self.url, {"ids": [incident.id], "status": "verified"}, format="json")
+
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class TriageQueueTests(TestCase):
+    def setUp(self):
+        self.first_admin = make_user(role=UserRole.ADMIN)
+        self.second_admin = make_user(role=UserRole.ADMIN)
+        self.low = make_incident(severity=Severity.LOW)
+        self.old_high = make_incident(severity=Severity.HIGH)
+        self.new_high = make_incident(severity=Severity.HIGH)
+        self.critical = make_incident(severity=Severity.CRITICAL)
+        make_incident(severity=Severity.CRITICAL, status=IncidentStatus.VERIFIED)
+
+    def claim(self, admin, count):
+        response = api_client(admin).post("/api/incidents/admin/triage/claim/", {"count": count}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_claims_most_severe_then_oldest_without_overlap(self):
+        self.assertEqual(self.claim(self.first_admin, 2), [self.critical.id, self.old_high.id])
+        self.assertEqual(self.claim(self.second_admin, 5), [self.new_high.id, self.low.id])
+        self.assertEqual(self.claim(self.second_admin, 5), [])
+
+        response = api_client(self.first_admin).get("/api/incidents/admin/triage/")
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.critical.id, self.old_high.id])
+        self.assertEqual(response.data["waiting"], 0)
+
+    def test_expired_leases_return_to_the_queue(self):
+        self.claim(self.first_admin, 4)
+        TriageLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(len(self.claim(self.second_admin, 4)), 4)
+        self.assertEqual(TriageLease.objects.count(), 4)
+
+    def test_claimed_reports_are_protected_and_released_on_transition(self):
+        self.claim(self.first_admin, 1)
+
+        response = api_client(self.second_admin).post(
+            "/api/incidents/admin/bulk-transition/",
+            {"ids": [self.critical.id], "status": IncidentStatus.VERIFIED},
+            format="json",
+        )
+        self.assertEqual(response.data["skipped"][0]["error"], "Claimed by another admin")
+
+        response = api_client(self.first_admin).patch(
+            f"/api/incidents/admin/{self.critical.id}/update/",
+            {"status": IncidentStatus.VERIFIED},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(TriageLease.objects.exists())
+
+
+@override_settings(MEDIA_UPLOAD_CHUNK_BYTES=4)
+class MediaUploadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.reporter = make_user()
+        self.client = api_client(self.reporter)
+        self.incident = make_incident(reporter=self.reporter)
+
+    def start(self, data, **extra):
+        return self.client.post(
+            f"/api/incidents/media/uploads/{self.incident.id}/",
+            {"filename": "../flood.jpg", "media_type": "photo", "size": len(data), **extra},
+            format="json",
+        )
+
+    def put(self, upload_id, offset, chunk, **headers):
+        return self.client.put(
+            f"/api/incidents/media/uploads/{upload_id}/",
+            chunk,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+            **headers,
+        )
+
+    def test_upload_resumes_from_acknowledged_offset(self):
+        data = b"0123456789"
+        upload_id = self.start(data, checksum=hashlib.sha256(data).hexdigest()).data["upload_id"]
+
+        self.assertEqual(self.put(upload_id, 0, data[:4]).data["offset"], 4)
+
+        # A retry of an acknowledged chunk is told where to continue
+        conflict = self.put(upload_id, 0, data[:4])
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.data["offset"], 4)
+
+        corrupted = self.put(upload_id, 4, b"XXXX", HTTP_UPLOAD_CHECKSUM=hashlib.sha256(data[4:8]).hexdigest())
+        self.assertEqual(corrupted.status_code, 400)
+        self.assertEqual(self.client.get(f"/api/incidents/media/uploads/{upload_id}/").data["offset"], 4)
+
+        self.put(upload_id, 4, data[4:8], HTTP_UPLOAD_CHECKSUM=hashlib.sha256(data[4:8]).hexdigest())
+        self.put(upload_id, 8, data[8:])
+        response = self.client.post(f"/api/incidents/media/uploads/{upload_id}/finalize/")
+
+        self.assertEqual(response.status_code, 201)
+        media = IncidentMedia.objects.get()
+        self.assertEqual((media.incident_id, media.uploaded_by_id), (self.incident.id, self.reporter.id))
+        sha256 = hashlib.sha256(data).hexdigest()
+        self.assertEqual(media.file.name, f"incidents/blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}.jpg")
+        with media.file.open("rb") as stored:
+            self.assertEqual(stored.read(), data)
+        self.assertFalse(MediaUpload.objects.exists())
+        self.assertEqual(list((self.media_root / "partial").iterdir()), [])
+
+    def test_rejects_bad_uploads(self):
+        data = b"0123456789"
+        upload_id = self.start(data, checksum=hashlib.sha256(b"other").hexdigest()).data["upload_id"]
+
+        self.assertEqual(self.put(upload_id, 0, data[:5]).status_code, 400)  # over chunk size
+        self.assertEqual(self.client.post(f"/api/incidents/media/uploads/{upload_id}/finalize/").status_code, 400)
+
+        stranger = api_client(make_user())
+        self.assertEqual(stranger.get(f"/api/incidents/media/uploads/{upload_id}/").status_code, 404)
+        self.assertEqual(
+            stranger.post(
+                f"/api/incidents/media/uploads/{self.incident.id}/",
+                {"filename": "a.jpg", "media_type": "photo", "size": 1},
+                format="json",
+            ).status_code,
+            403,
+        )
+
+        for offset in range(0, 10, 4):
+            self.put(upload_id, offset, data[offset:offset + 4])
+        # Whole-file checksum mismatch discards the upload
+        self.assertEqual(self.client.post(f"/api/incidents/media/uploads/{upload_id}/finalize/").status_code, 400)
+        self.assertFalse(MediaUpload.objects.exists())
+        self.assertFalse(IncidentMedia.objects.exists())
+
+    def test_chunks_are_claimed_and_expire(self):
+        data = b"0123"
+        upload_id = self.start(data).data["upload_id"]
+        stale = MediaUpload.objects.get(pk=upload_id)
+        self.put(upload_id, 0, data[:2])
+
+        # A writer that loaded the upload before the first chunk landed
+        with self.assertRaises(uploads.UploadError) as raised:
+            uploads.write_chunk(stale, 0, 2, io.BytesIO(b"XX"))
+        self.assertEqual(raised.exception.status_code, 409)
+        with open(uploads.partial_path(stale), "rb") as part:
+            self.assertEqual(part.read(), data[:2])
+
+        MediaUpload.objects.filter(pk=upload_id).update(expires_at=timezone.now())
+        expired = self.put(upload_id, 2, data[2:])
+        self.assertEqual(expired.status_code, 410)
+        self.assertEqual(expired.data["offset"], 2)
+
+    def test_racing_finalize_is_refused_not_a_server_error(self):
+        data = b"0123"
+        upload_id = self.start(data).data["upload_id"]
+        self.put(upload_id, 0, data)
+        stale = MediaUpload.objects.get(pk=upload_id)
+
+        # The partial file already moved by a finalize still in progress
+        uploads.partial_path(stale).rename(self.media_root / "moved")
+        response = self.client.post(f"/api/incidents/media/uploads/{upload_id}/finalize/")
+        self.assertEqual(response.status_code, 409)
+        (self.media_root / "moved").rename(uploads.partial_path(stale))
+
+        self.assertEqual(self.client.post(f"/api/incidents/media/uploads/{upload_id}/finalize/").status_code, 201)
+        # One that loaded the upload before the first finished finds it gone
+        with self.assertRaises(NotFound):
+            uploads.finalize(stale)
+        self.assertEqual(self.client.post(f"/api/incidents/media/uploads/{upload_id}/finalize/").status_code, 404)
+        self.assertEqual(IncidentMedia.objects.count(), 1)
+
+
+@override_settings(MEDIA_DERIVATIVE_WORKERS=0, EMAIL_OUTBOX_AUTOSEND=False)
+class MediaDerivativeTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.reporter = make_user()
+        self.client = api_client(self.reporter)
+        self.incident = make_incident(reporter=self.reporter)
+
+    def photo(self):
+        image = Image.new("RGB", (2000, 1000), "red")
+        exif = Image.Exif()
+        exif[0x0112] = 6  # orientation: rotate 90 degrees
+        exif[0x010F] = "Camera Maker"
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", exif=exif)
+        return SimpleUploadedFile("flood.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+    def upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/incidents/media/upload/{self.incident.id}/",
+                {"file": self.photo(), "media_type": "photo"},
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        return IncidentMedia.objects.get(pk=response.data["id"])
+
+    def test_upload_renders_rotated_exif_free_derivatives(self):
+        media = self.upload()
+
+        with Image.open(media.thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.size, (160, 320))
+            self.assertEqual(len(thumbnail.getexif()), 0)
+        with Image.open(media.preview.path) as preview:
+            self.assertEqual(preview.size, (640, 1280))
+
+    def test_feed_links_derivatives_and_original_on_demand(self):
+        self.upload()
+
+        feed = self.client.get("/api/incidents/").data["results"][0]["media"][0]
+        self.assertNotIn("file", feed)
+        self.assertIn("/media/incidents/blobs/derived/", feed["thumbnail"])
+
+        original = self.client.get("/api/incidents/?media=original").data["results"][0]["media"][0]
+        self.assertIn("/media/incidents/blobs/", original["file"])
+
+        detail = self.client.get(f"/api/incidents/{self.incident.id}/").data["media"][0]
+        self.assertIn("file", detail)
+
+    def test_backfill_command_uses_worker_processes(self):
+        media = IncidentMedia.objects.create(incident=self.incident, file=self.photo(), media_type="photo")
+        self.assertFalse(media.thumbnail)
+
+        with override_settings(MEDIA_DERIVATIVE_WORKERS=1):
+            call_command("generate_media_derivatives", stdout=io.StringIO())
+
+        media.refresh_from_db()
+        self.assertTrue(media.thumbnail.name.endswith((".webp", ".jpg")))
+
+
+@override_settings(MEDIA_DERIVATIVE_WORKERS=0, EMAIL_OUTBOX_AUTOSEND=False)
+class MediaBlobTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.photo_bytes = io.BytesIO()
+        Image.new("RGB", (640, 480), "green").save(self.photo_bytes, "JPEG")
+
+    def add_media(self, incident=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return IncidentMedia.objects.create(
+                incident=incident or make_incident(),
+                file=SimpleUploadedFile("photo.JPG", self.photo_bytes.getvalue()),
+                media_type="photo",
+            )
+
+    def test_identical_uploads_share_one_blob(self):
+        first, second = self.add_media(), self.add_media()
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.refcount, 2)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.endswith(f"{blob.sha256}.jpg"))
+        self.assertEqual(len(list((self.media_root / "incidents" / "blobs").rglob("*.jpg"))), 1)
+        # The second row reuses the first one's derivatives
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertTrue(first.thumbnail)
+        self.assertEqual(second.thumbnail.name, first.thumbnail.name)
+
+    def test_collection_waits_for_last_reference_and_grace_period(self):
+        first, second = self.add_media(), self.add_media()
+        blob = MediaBlob.objects.get()
+        stray = self.media_root / blobs.BLOB_DIR / "00" / "00" / ("0" * 64 + ".jpg")
+        stray.parent.mkdir(parents=True)
+        stray.write_bytes(b"left behind")
+
+        first.incident.delete()
+        self.assertEqual(MediaBlob.objects.get().refcount, 1)
+        self.assertEqual(blobs.collect(grace_seconds=0), 0)
+
+        second.delete()
+        self.assertEqual(blobs.collect(), 0)  # still within the grace period
+        self.assertEqual(blobs.collect(grace_seconds=0), 1)
+        self.assertEqual(blobs.collect_orphan_files(grace_seconds=0), 1)
+
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(default_storage.exists(blob.file.name))
+        self.assertEqual(list((self.media_root / blobs.BLOB_DIR).rglob("*.*")), [])
+
+    def test_store_waits_for_collection_outside_the_transaction(self):
+        blob = self.add_media().blob
+        MediaBlob.objects.filter(pk=blob.pk).update(refcount=-1)
+        depth = len(connection.atomic_blocks)
+
+        def collected(seconds):
+            self.assertEqual(len(connection.atomic_blocks), depth)
+            IncidentMedia.objects.all().delete()
+            MediaBlob.objects.filter(pk=blob.pk).delete()
+
+        def store():
+            with transaction.atomic():
+                return blobs.store(SimpleUploadedFile("photo.jpg", self.photo_bytes.getvalue()), "photo.jpg")
+
+        with mock.patch.object(blobs.time, "sleep", side_effect=collected) as sleep:
+            stored = blobs.retry_while_collected(store)
+        sleep.assert_called_once()
+        self.assertEqual((stored.sha256, stored.refcount), (blob.sha256, 0))
+        self.assertEqual(MediaBlob.objects.get().refcount, 1)
+
+    def test_adopt_keeps_a_legacy_file_until_its_last_row_moves(self):
+        default_storage.save("incidents/legacy.jpg", io.BytesIO(self.photo_bytes.getvalue()))
+        incident = make_incident()
+        IncidentMedia.objects.bulk_create([
+            IncidentMedia(incident=incident, file="incidents/legacy.jpg", media_type="photo") for _ in range(2)
+        ])
+
+        self.assertEqual(blobs.adopt(IncidentMedia.objects.all()), 2)
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.refcount, 2)
+        self.assertEqual(set(IncidentMedia.objects.values_list("file", flat=True)), {blob.file.name})
+        self.assertFalse(default_storage.exists("incidents/legacy.jpg"))
+
+
+@override_settings(MEDIA_DERIVATIVE_WORKERS=0, EMAIL_OUTBOX_AUTOSEND=False)
+class MediaServingTests(TemporaryMediaMixin, TestCase):
+    content = bytes(range(256)) * 4
+
+    def setUp(self):
+        super().setUp()
+        self.media = IncidentMedia.objects.create(
+            incident=make_incident(),
+            file=SimpleUploadedFile("clip.mp4", self.content),
+            media_type="video",
+        )
+        self.url = media_views.signed_url(self.media.file.name)
+
+    def test_incident_media_needs_a_current_signature(self):
+        self.assertEqual(self.client.get(f"/media/{self.media.file.name}").status_code, 403)
+
+        stale = media_views.sign(self.media.file.name, now=time.time() - 3 * settings.MEDIA_URL_SIGNATURE_SECONDS)
+        self.assertEqual(self.client.get(f"/media/{self.media.file.name}?sig={stale}").status_code, 403)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Type"], "video/mp4")
+        self.assertEqual(response["ETag"], f'"{self.media.blob.sha256}"')
+
+    def test_signed_access_is_cached_privately_until_expiry(self):
+        window = settings.MEDIA_URL_SIGNATURE_SECONDS
+        for signed_at, longest in [(time.time(), 2 * window), (time.time() - window, window)]:
+            sig = media_views.sign(self.media.file.name, now=signed_at)
+            response = self.client.get(f"/media/{self.media.file.name}?sig={sig}")
+
+            directives = response["Cache-Control"].split(", ")
+            self.assertEqual(directives[0], "private")
+            self.assertEqual(directives[2], "immutable")
+            max_age = int(directives[1].removeprefix("max-age="))
+            self.assertLessEqual(max_age, longest)
+            self.assertGreater(max_age, longest - window - 5)
+
+    def test_dot_segments_do_not_skip_the_signature(self):
+        name = self.media.file.name
+        self.assertEqual(self.client.get(f"/media/./{name}").status_code, 403)
+        for path in [f"x/../{name}", f"/{name}", f"incidents/../{name}"]:
+            self.assertEqual(self.client.get(f"/media/{path}").status_code, 404, path)
+
+        self.assertEqual(self.client.get(f"/media/./{name}?sig={media_views.sign(name)}").status_code, 200)
+
+    def test_session_access_is_only_cached_privately(self):
+        admin = make_user(role=UserRole.ADMIN)
+        self.client.force_login(admin)
+
+        response = self.client.get(f"/media/{self.media.file.name}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], blobs.PRIVATE_IMMUTABLE_CACHE_CONTROL)
+        self.assertIn("Cookie", response["Vary"])
+
+    def test_serializer_links_signed_urls(self):
+        data = IncidentMediaSerializer(self.media).data
+        self.assertEqual(self.client.get(data["file"]).status_code, 200)
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_range_requests(self):
+        partial = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial["Content-Range"], f"bytes 10-19/{len(self.content)}")
+        self.assertEqual(b"".join(partial.streaming_content), self.content[10:20])
+
+        suffix = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(suffix.streaming_content), self.content[-5:])
+
+        beyond = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(beyond.status_code, 416)
+
+        stale = self.client.get(self.url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(stale.status_code, 200)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND="nginx", MEDIA_SENDFILE_PREFIX="/protected-media/")
+    def test_sendfile_offload(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.media.file.name}")
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["Content-Type"], "video/mp4")
@@ -0,0 +1,97 @@
+"""
+Incident status transitions, for one incident or a whole batch.
+
+apply_transition() writes a batch with a fixed number of queries: one
+bulk_update for the incidents, one bulk_create for the timeline rows and
+one for the queued emails. bulk writes skip model signals, so the cache
+evictions and dashboard counters the signals would handle are done here.
+Moved incidents leave the triage queue, so their leases are dropped.
+"""
+from django.utils import timezone
+
+from .cache import (
+    invalidate_filtered_incident_lists,
+    invalidate_incident_lists,
+    invalidate_incidents,
+)
+from .models import Incident, IncidentStatus, IncidentTimeline, TriageLease
+from dashboard.signals import record_bulk_update
+from ledger.audit import record_bulk_update as record_audit_update
+from RapidAid.email_utils import queue_notification_emails
+
+TARGET_STATUSES = (
+    IncidentStatus.VERIFIED,
+    IncidentStatus.REJECTED,
+    IncidentStatus.IN_RESCUE,
+    IncidentStatus.RESOLVED,
+)
+
+
+def transition_error(current, target):
+    """Why `current` cannot move to `target`, or None if it can."""
+    if current == IncidentStatus.RESOLVED:
+        return "Resolved incident cannot be modified"
+    if target not in TARGET_STATUSES:
+        return "Invalid status transition"
+    return None
+
+
+def approval_email(incident):
+    reporter = incident.reporter
+    return (
+        reporter.email,
+        "RapidAid: Incident Approved",
+        (
+            f"Hello {reporter.full_name},\n\n"
+            f"Your incident '{incident.title}' has been approved and marked as verified.\n"
+            "You can now open RapidAid to track updates and community support.\n\n"
+            "Thank you,\nRapidAid Team"
+        ),
+    )
+
+
+def apply_transition(incidents, target, user):
+    """
+    Move already validated `incidents` to `target`. Load them with
+    select_related("reporter") and call inside a transaction.
+    """
+    now = timezone.now()
+    reopened = False
+    emails = []
+
+    for incident in incidents:
+        previous = incident.status
+        reopened |= previous == IncidentStatus.REJECTED and target != previous
+
+        incident.status = target
+        incident.updated_at = now
+        if target == IncidentStatus.VERIFIED:
+            incident.approved_by = user
+            incident.approved_at = now
+            if previous != IncidentStatus.VERIFIED and incident.reporter_id:
+                emails.append(approval_email(incident))
+
+    Incident.objects.bulk_update(incidents, ["status", "approved_by", "approved_at", "updated_at"])
+
+    IncidentTimeline.objects.bulk_create([
+        IncidentTimeline(
+            incident=incident,
+            title=f"Incident {target.replace('_', ' ').title()}",
+            description=f"Status updated to {target}",
+            created_by=user,
+        )
+        for incident in incidents
+    ])
+
+    TriageLease.objects.filter(incident__in=incidents).delete()
+
+    record_bulk_update(incidents)
+    record_audit_update(incidents)
+    invalidate_incidents(incident.pk for incident in incidents)
+    invalidate_filtered_incident_lists()
+    # Leaving "rejected" puts incidents back into list pages
+    if reopened:
+        invalidate_incident_lists()
+
+    queue_notification_emails(emails)
+    return incidents
@@ -0,0 +1,99 @@
+"""
+Admin triage queue over reported incidents.
+
+Reports are handed out most severe first, oldest first within a severity,
+each severity read through incident_triage_idx (status, severity,
+created_at). A claim is a TriageLease row; the unique incident column means
+two admins can never hold the same report. Leases expire after
+TRIAGE_LEASE_SECONDS without any cleanup job: expired rows are ignored by
+every check and deleted by the next claim.
+
+On PostgreSQL the candidate rows are read with SELECT ... FOR UPDATE SKIP
+LOCKED, so parallel claimers pick disjoint reports without waiting on each
+other. SQLite has no row locks and serializes writers instead; a claimer
+that loses a race simply gets fewer rows, since conflicting leases are
+skipped and only rows carrying its claim token are returned.
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Incident, IncidentStatus, Severity, TriageLease
+
+SEVERITY_ORDER = (Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW)
+
+
+def active_leases(now=None):
+    return TriageLease.objects.filter(expires_at__gt=now or timezone.now())
+
+
+def waiting_count():
+    """Reported incidents nobody holds a live lease on."""
+    return Incident.objects.filter(status=IncidentStatus.REPORTED).exclude(
+        pk__in=active_leases().values("incident_id")
+    ).count()
+
+
+def claim(user, count):
+    """Lease up to `count` of the next reports to `user`; returns their ids."""
+    now = timezone.now()
+    token = uuid.uuid4()
+    expires_at = now + timedelta(seconds=settings.TRIAGE_LEASE_SECONDS)
+
+    with transaction.atomic():
+        TriageLease.objects.filter(expires_at__lte=now).delete()
+
+        candidates = []
+        for severity in SEVERITY_ORDER:
+            remaining = count - len(candidates)
+            if remaining <= 0:
+                break
+
+            queryset = Incident.objects.filter(
+                status=IncidentStatus.REPORTED,
+                severity=severity,
+                triage_lease__isnull=True,
+            ).order_by("created_at", "id")
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True, of=("self",))
+            candidates += queryset.values_list("pk", flat=True)[:remaining]
+
+        TriageLease.objects.bulk_create(
+            [
+                TriageLease(
+                    incident_id=pk,
+                    claimed_by=user,
+                    claim_token=token,
+                    claimed_at=now,
+                    expires_at=expires_at,
+                )
+                for pk in candidates
+            ],
+            ignore_conflicts=True,
+        )
+        won = set(TriageLease.objects.filter(claim_token=token).values_list("incident_id", flat=True))
+
+    return [pk for pk in candidates if pk in won]
+
+
+def claimed_by(user):
+    """Ids of the reports `user` currently holds, in the order claimed."""
+    return list(
+        active_leases().filter(claimed_by=user).order_by("claimed_at", "id").values_list("incident_id", flat=True)
+    )
+
+
+def release(user, incident_ids):
+    return TriageLease.objects.filter(claimed_by=user, incident_id__in=incident_ids).delete()[0]
+
+
+def held_by_others(incident_ids, user):
+    """Ids among `incident_ids` under a live lease of another admin."""
+    return set(
+        active_leases().filter(incident_id__in=incident_ids).exclude(claimed_by=user).values_list(
+            "incident_id", flat=True
+        )
+    )
@@ -0,0 +1,220 @@
+"""
+Resumable chunked uploads for incident photos and videos.
+
+    POST /api/incidents/media/uploads/<incident_id>/          start
+         {"filename", "media_type", "size", "checksum"}
+    PUT  /api/incidents/media/uploads/<upload_id>/            one chunk
+         raw bytes, Upload-Offset: <offset>, Upload-Checksum: <sha256>
+    GET  /api/incidents/media/uploads/<upload_id>/            offset to resume from
+    POST /api/incidents/media/uploads/<upload_id>/finalize/   -> IncidentMedia
+
+Every chunk is a short request whose body is copied from the socket to the
+partial file in READ_BLOCK_BYTES blocks, so neither the chunk nor the file
+is ever held in memory and a dropped connection costs at most one chunk.
+A chunk must start at the acknowledged offset; anything else gets a 409
+carrying the offset to resume from, and an expired upload gets a 410. A
+writer first claims the offset with a conditional UPDATE, which holds the
+row (the whole database on SQLite) until the chunk is acknowledged, so a
+second writer at the same offset waits and is then refused rather than
+writing the same bytes of the file. The offset only moves once the chunk
+is fully written and its optional sha256 matches. Finalize checks the
+sha256 of the whole file and moves (renames, not copies) it into
+content-addressed storage, or drops it if those bytes are stored already;
+it holds the upload row locked, so a repeated finalize gets a 404 once the
+first is done.
+"""
+import hashlib
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+
+from . import blobs
+from .models import IncidentMedia, MediaUpload
+
+READ_BLOCK_BYTES = 64 * 1024
+
+
+class UploadError(APIException):
+    """A rejected chunk; the response carries the offset to resume from."""
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "upload_error"
+
+    def __init__(self, detail, offset, status_code=None):
+        super().__init__(detail)
+        self.detail = {"detail": self.detail, "offset": offset}
+        if status_code:
+            self.status_code = status_code
+
+
+def _conflict(offset):
+    return UploadError("Chunk does not start at the upload offset", offset, status.HTTP_409_CONFLICT)
+
+
+class _PartialFile(File):
+    """Lets FileSystemStorage move the finished file into place instead of copying it."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def partial_path(upload):
+    return Path(settings.MEDIA_UPLOAD_TEMP_DIR) / f"{upload.pk}.part"
+
+
+def _expiry():
+    return timezone.now() + timedelta(seconds=settings.MEDIA_UPLOAD_EXPIRY_SECONDS)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as part:
+        for block in iter(lambda: part.read(READ_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def start(incident, user, filename, media_type, size, checksum=""):
+    upload = MediaUpload.objects.create(
+        incident=incident,
+        uploaded_by=user,
+        filename=filename,
+        media_type=media_type,
+        size=size,
+        checksum=checksum,
+        expires_at=_expiry(),
+    )
+    path = partial_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return upload
+
+
+def write_chunk(upload, offset, length, stream, checksum=""):
+    """
+    Append `length` bytes read from `stream` at `offset` and acknowledge
+    them. Returns the new offset.
+    """
+    if length <= 0:
+        raise UploadError("Empty chunk", offset)
+    if length > settings.MEDIA_UPLOAD_CHUNK_BYTES:
+        raise UploadError(f"Chunks are limited to {settings.MEDIA_UPLOAD_CHUNK_BYTES} bytes", offset)
+    if offset + length > upload.size:
+        raise UploadError("Chunk runs past the declared file size", offset)
+
+    with transaction.atomic():
+        now = timezone.now()
+        claimed = MediaUpload.objects.filter(pk=upload.pk, received=offset, expires_at__gt=now).update(
+            expires_at=_expiry(),
+        )
+        if not claimed:
+            current = MediaUpload.objects.filter(pk=upload.pk).first()
+            if current is None:
+                raise NotFound("Upload was already finalized or discarded")
+            if current.expires_at <= now:
+                raise UploadError("Upload has expired; start it again", current.received, status.HTTP_410_GONE)
+            raise _conflict(current.received)
+
+        digest = hashlib.sha256()
+        remaining = length
+        # Bytes past the acknowledged offset are never trusted, so a chunk cut
+        # off halfway is simply overwritten by the retry.
+        with open(partial_path(upload), "r+b") as part:
+            part.seek(offset)
+            while remaining:
+                block = stream.read(min(READ_BLOCK_BYTES, remaining))
+                if not block:
+                    break
+                part.write(block)
+                digest.update(block)
+                remaining -= len(block)
+
+        if remaining:
+            raise UploadError("Chunk ended early", offset)
+        if checksum and digest.hexdigest() != checksum.lower():
+            raise UploadError("Chunk checksum mismatch", offset)
+
+        MediaUpload.objects.filter(pk=upload.pk).update(received=offset + length)
+
+    upload.received = offset + length
+    return upload.received
+
+
+def finalize(upload):
+    """Turn a complete upload into an IncidentMedia row."""
+    path = partial_path(upload)
+    media, mismatch = blobs.retry_while_collected(lambda: _finalize_locked(upload.pk, path))
+
+    if mismatch:
+        raise ValidationError("File checksum mismatch; start the upload again")
+    if path.exists():  # bytes stored already, or a storage that copies
+        path.unlink()
+    return media
+
+
+def _finalize_locked(pk, path):
+    """(media, False) for the stored upload, or (None, True) when a checksum mismatch discarded it."""
+    with transaction.atomic():
+        # A second finalize of the same upload waits here, then finds it gone
+        upload = MediaUpload.objects.select_for_update().filter(pk=pk).first()
+        if upload is None:
+            raise NotFound("Upload was already finalized or discarded")
+        if upload.received != upload.size:
+            raise UploadError("Upload is incomplete", upload.received)
+
+        try:
+            sha256 = file_sha256(path)
+            mismatch = bool(upload.checksum) and sha256 != upload.checksum
+            if not mismatch:
+                media = IncidentMedia(
+                    incident_id=upload.incident_id,
+                    uploaded_by_id=upload.uploaded_by_id,
+                    media_type=upload.media_type,
+                )
+                with open(path, "rb") as part:
+                    media.blob = blobs.store(_PartialFile(part), upload.filename, sha256)
+        except FileNotFoundError:
+            # Moved by a finalize the row lock did not hold off (SQLite takes none)
+            raise UploadError("Upload is being finalized", upload.received, status.HTTP_409_CONFLICT)
+
+        if mismatch:
+            discard([upload])
+            return None, True
+        media.file.name = media.blob.file.name
+        media.save()
+        upload.delete()
+    return media, False
+
+
+def discard(uploads):
+    """Delete uploads with their partial files."""
+    for upload in uploads:
+        partial_path(upload).unlink(missing_ok=True)
+    MediaUpload.objects.filter(pk__in=[upload.pk for upload in uploads]).delete()
+
+
+def purge_expired(now=None):
+    """
+    Drop abandoned uploads, plus partial files whose row is already gone
+    (e.g. deleted along with its incident). Returns the files removed.
+    """
+    now = now or timezone.now()
+    expired = list(MediaUpload.objects.filter(expires_at__lte=now))
+    discard(expired)
+
+    removed = len(expired)
+    directory = Path(settings.MEDIA_UPLOAD_TEMP_DIR)
+    if directory.is_dir():
+        live = {str(pk) for pk in MediaUpload.objects.values_list("pk", flat=True)}
+        cutoff = (now - timedelta(seconds=settings.MEDIA_UPLOAD_EXPIRY_SECONDS)).timestamp()
+        for path in directory.glob("*.part"):
+            if path.stem not in live and os.path.getmtime(path) < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return removed
@@ -2,9 +2,19 @@ from django.urls import path
 from .views import (
     ReportIncidentAPIView,
     IncidentMediaUploadAPIView,
+    MediaUploadStartAPIView,
+    MediaUploadAPIView,
+    MediaUploadFinalizeAPIView,
     IncidentListAPIView,
+    IncidentSearchAPIView,
+    IncidentNearbyAPIView,
+    IncidentWithinAPIView,
     IncidentDetailAPIView,
     IncidentAdminUpdateAPIView,
+    IncidentBulkTransitionAPIView,
+    TriageQueueAPIView,
+    TriageClaimAPIView,
+    TriageReleaseAPIView,
 )
 
 urlpatterns = [
@@ -22,11 +32,41 @@ urlpatterns = [
         name="incident-media-upload"
     ),
 
+    # ----------------------------------------
+    # Resumable chunked media upload
+    # ----------------------------------------
+    path(
+        "media/uploads/<int:incident_id>/",
+        MediaUploadStartAPIView.as_view(),
+        name="incident-media-upload-start"
+    ),
+    path(
+        "media/uploads/<uuid:upload_id>/",
+        MediaUploadAPIView.as_view(),
+        name="incident-media-upload-chunk"
+    ),
+    path(
+        "media/uploads/<uuid:upload_id>/finalize/",
+        MediaUploadFinalizeAPIView.as_view(),
+        name="incident-media-upload-finalize"
+    ),
+
     # ----------------------------------------
     # List of incidents (all approved/reported)
     # ----------------------------------------
     path("", IncidentListAPIView.as_view(), name="incident-list"),
 
+    # ----------------------------------------
+    # Full-text search (ranked, prefix matching)
+    # ----------------------------------------
+    path("search/", IncidentSearchAPIView.as_view(), name="incident-search"),
+
+    # ----------------------------------------
+    # Geospatial: k-nearest and bounding box
+    # ----------------------------------------
+    path("nearby/", IncidentNearbyAPIView.as_view(), name="incident-nearby"),
+    path("within/", IncidentWithinAPIView.as_view(), name="incident-within"),
+
     # ----------------------------------------
     # Incident detail
     # ----------------------------------------
@@ -40,4 +80,20 @@ urlpatterns = [
         IncidentAdminUpdateAPIView.as_view(),
         name="admin-incident-update"
     ),
+
+    # ----------------------------------------
+    # Admin: move many incidents to one status
+    # ----------------------------------------
+    path(
+        "admin/bulk-transition/",
+        IncidentBulkTransitionAPIView.as_view(),
+        name="admin-incident-bulk-transition"
+    ),
+
+    # ----------------------------------------
+    # Admin: triage queue of reported incidents
+    # ----------------------------------------
+    path("admin/triage/", TriageQueueAPIView.as_view(), name="admin-triage-queue"),
+    path("admin/triage/claim/", TriageClaimAPIView.as_view(), name="admin-triage-claim"),
+    path("admin/triage/release/", TriageReleaseAPIView.as_view(), name="admin-triage-release"),
 ]
@@ -1,15 +1,53 @@
-from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from django.conf import settings
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
 
-from .models import Incident, IncidentMedia, IncidentStatus
+from . import cache as incident_cache
+from . import triage
+from . import uploads
+from .search import search_ids
+from .models import Incident, IncidentMedia, IncidentStatus, IncidentTimeline, MediaUpload
 from .serializers import (
     IncidentCreateSerializer,
     IncidentPublicSerializer,
     IncidentAdminUpdateSerializer,
-    IncidentMediaSerializer
+    IncidentBulkTransitionSerializer,
+    TriageClaimSerializer,
+    TriageReleaseSerializer,
+    IncidentMediaSerializer,
+    MediaUploadSerializer
 )
 
 from Authapp.permissions import IsAdminRole
+from RapidAid import geo
+from RapidAid.filters import QueryParamFilterBackend
+from volunteer.models import VolunteerAssignment, VolunteerStatus
+
+
+def public_incident_queryset():
+    """
+    Incidents with everything IncidentPublicSerializer reads, loaded in a
+    fixed number of queries regardless of how many incidents are returned.
+    """
+    return Incident.objects.select_related(
+        "reporter"
+    ).prefetch_related(
+        "media",
+        Prefetch(
+            "timeline",
+            queryset=IncidentTimeline.objects.select_related("created_by"),
+        ),
+        Prefetch(
+            "volunteers",
+            queryset=VolunteerAssignment.objects.filter(
+                status=VolunteerStatus.APPROVED
+            ).select_related("user").order_by("-approved_at"),
+            to_attr="approved_volunteer_list",
+        ),
+    )
 
 
 # ======================================================
@@ -30,6 +68,11 @@ class ReportIncidentAPIView(generics.CreateAPIView):
 # INCIDENT MEDIA UPLOAD
 # ======================================================
 
+def check_media_permission(user, incident):
+    if user != incident.reporter and not user.is_admin_role:
+        raise PermissionDenied("Not allowed")
+
+
 class IncidentMediaUploadAPIView(generics.CreateAPIView):
     serializer_class = IncidentMediaSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -37,12 +80,7 @@ class IncidentMediaUploadAPIView(generics.CreateAPIView):
     def perform_create(self, serializer):
         incident_id = self.kwargs.get("incident_id")
         incident = Incident.objects.get(id=incident_id)
-
-        if (
-            self.request.user != incident.reporter
-            and not self.request.user.is_admin_role
-        ):
-            raise PermissionDenied("Not allowed")
+        check_media_permission(self.request.user, incident)
 
         serializer.save(
             incident=incident,
@@ -50,24 +88,221 @@ class IncidentMediaUploadAPIView(generics.CreateAPIView):
         )
 
 
+# ======================================================
+# RESUMABLE CHUNKED MEDIA UPLOAD
+# ======================================================
+
+class MediaUploadStartAPIView(generics.CreateAPIView):
+    """
+    POST {"filename", "media_type", "size", "checksum"}
+
+    Opens a resumable upload; checksum (sha256 hex of the whole file) is
+    optional. Send the bytes in chunks of at most chunk_size to
+    MediaUploadAPIView, then finalize. See incidents/uploads.py.
+    """
+    serializer_class = MediaUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        incident = get_object_or_404(Incident, id=self.kwargs["incident_id"])
+        check_media_permission(self.request.user, incident)
+
+        serializer.instance = uploads.start(incident, self.request.user, **serializer.validated_data)
+
+
+class MediaUploadMixin:
+    serializer_class = MediaUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_url_kwarg = "upload_id"
+
+    def get_queryset(self):
+        return MediaUpload.objects.filter(uploaded_by=self.request.user)
+
+
+class MediaUploadAPIView(MediaUploadMixin, generics.RetrieveAPIView):
+    """
+    GET: the acknowledged offset, where an interrupted upload resumes.
+    PUT: one chunk as the raw request body, starting at the Upload-Offset
+    header, with an optional Upload-Checksum (sha256 hex of the chunk).
+    """
+
+    def put(self, request, *args, **kwargs):
+        upload = self.get_object()
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            raise ValidationError({"Upload-Offset": "This header must be an integer"})
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+
+        offset = uploads.write_chunk(
+            upload,
+            offset,
+            length,
+            request.stream,
+            request.headers.get("Upload-Checksum", ""),
+        )
+        return Response(
+            {"upload_id": upload.pk, "offset": offset},
+            headers={"Upload-Offset": str(offset)},
+        )
+
+
+class MediaUploadFinalizeAPIView(MediaUploadMixin, generics.GenericAPIView):
+    """POST: verifies a complete upload and attaches it to the incident."""
+
+    def post(self, request, *args, **kwargs):
+        media = uploads.finalize(self.get_object())
+        return Response(IncidentMediaSerializer(media).data, status=status.HTTP_201_CREATED)
+
+
 # ======================================================
 # PUBLIC INCIDENT LIST
 # ======================================================
 
-class IncidentListAPIView(generics.ListAPIView):
+class IncidentFeedMixin:
+    """
+    Incident listings link photo thumbnails and previews; the original
+    files are included with ?media=original.
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["media_originals"] = self.request.query_params.get("media") == "original"
+        return context
+
+
+class IncidentListAPIView(IncidentFeedMixin, generics.ListAPIView):
     serializer_class = IncidentPublicSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
+    filter_fields = {
+        "status": "status",
+        "severity": "severity",
+        "incident_type": "incident_type",
+    }
+    date_filter_field = "created_at"
 
     def get_queryset(self):
-        return Incident.objects.exclude(
+        return public_incident_queryset().exclude(
             status=IncidentStatus.REJECTED
-        ).select_related(
-            "reporter"
-        ).prefetch_related(
-            "media",
-            "timeline",
-            "volunteers__user",
-        ).order_by("-created_at")
+        ).order_by("-created_at", "-id")
+
+    def list(self, request, *args, **kwargs):
+        filtered = (
+            QueryParamFilterBackend.is_filtered(request, self)
+            or self.paginator.ordering_param in request.query_params
+        )
+        key = incident_cache.list_key(request, filtered=filtered)
+        entry = incident_cache.lookup(key)
+
+        if entry is None:
+            data = super().list(request, *args, **kwargs).data
+            is_head = self.paginator.cursor_query_param not in request.query_params
+            entry = incident_cache.store_page(key, data, is_head)
+
+        return incident_cache.conditional_response(request, entry)
+
+
+# ======================================================
+# INCIDENT SEARCH
+# ======================================================
+
+class IncidentSearchAPIView(IncidentFeedMixin, generics.ListAPIView):
+    """
+    GET /api/incidents/search/?q=flood kath&status=verified&limit=20&offset=0
+
+    Ranked full-text search over title, description and location; the last
+    word matches as a prefix. Served by the index in incidents/search.py.
+    """
+    serializer_class = IncidentPublicSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_statuses(self):
+        visible = [value for value in IncidentStatus.values if value != IncidentStatus.REJECTED]
+        raw = self.request.query_params.get("status")
+        if not raw:
+            return visible
+
+        field = Incident._meta.get_field("status")
+        backend = QueryParamFilterBackend()
+        requested = {backend.clean("status", field, value) for value in raw.split(",")}
+        return [value for value in visible if value in requested]
+
+    def get_int_param(self, name, default, maximum=None):
+        try:
+            value = int(self.request.query_params.get(name, default))
+        except ValueError:
+            raise ValidationError({name: "Must be an integer"})
+        if value < 0:
+            raise ValidationError({name: "Must not be negative"})
+        return min(value, maximum) if maximum else value
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required"})
+
+        limit = self.get_int_param("limit", settings.REST_FRAMEWORK["PAGE_SIZE"], settings.API_MAX_PAGE_SIZE)
+        limit = max(limit, 1)
+        offset = self.get_int_param("offset", 0)
+
+        ids = search_ids(query, self.get_statuses(), limit, offset)
+        incidents = public_incident_queryset().in_bulk(ids)
+        results = [incidents[pk] for pk in ids if pk in incidents]
+
+        return Response({
+            "query": query,
+            "results": self.get_serializer(results, many=True).data,
+            "next_offset": offset + limit if len(ids) == limit else None,
+        })
+
+
+# ======================================================
+# INCIDENTS NEAR A POINT / INSIDE A BOX
+# ======================================================
+
+class IncidentNearbyAPIView(IncidentFeedMixin, generics.ListAPIView):
+    """
+    GET /api/incidents/nearby/?lat=27.7&lng=85.3&radius_km=10&limit=20
+
+    The closest incidents within radius_km, closest first, each with a
+    distance_km. Accepts the same filters as the incident list.
+    """
+    serializer_class = IncidentPublicSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    filter_fields = IncidentListAPIView.filter_fields
+    date_filter_field = "created_at"
+
+    def list(self, request, *args, **kwargs):
+        lat, lng, radius_km, limit = geo.nearby_params(request)
+        visible = self.filter_queryset(Incident.objects.exclude(status=IncidentStatus.REJECTED))
+
+        found = geo.nearest(visible, lat, lng, limit, radius_km)
+        incidents = public_incident_queryset().in_bulk([pk for pk, _ in found])
+        results = self.get_serializer([incidents[pk] for pk, _ in found], many=True).data
+        for row, (_, distance) in zip(results, found):
+            row["distance_km"] = round(distance, 3)
+
+        return Response({"results": results})
+
+
+class IncidentWithinAPIView(IncidentFeedMixin, generics.ListAPIView):
+    """
+    GET /api/incidents/within/?min_lat=&min_lng=&max_lat=&max_lng=
+
+    Incidents inside a bounding box, newest first, paginated like the list.
+    """
+    serializer_class = IncidentPublicSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
+    filter_fields = IncidentListAPIView.filter_fields
+    date_filter_field = "created_at"
+
+    def get_queryset(self):
+        visible = public_incident_queryset().exclude(status=IncidentStatus.REJECTED)
+        return geo.within_box(visible, *geo.box_params(self.request)).order_by("-created_at", "-id")
 
 
 # ======================================================
@@ -77,13 +312,19 @@ class IncidentListAPIView(generics.ListAPIView):
 class IncidentDetailAPIView(generics.RetrieveAPIView):
     serializer_class = IncidentPublicSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Incident.objects.select_related(
-        "reporter"
-    ).prefetch_related(
-        "media",
-        "timeline",
-        "volunteers__user",
-    )
+
+    def get_queryset(self):
+        return public_incident_queryset()
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs["pk"]
+        entry = incident_cache.lookup(incident_cache.detail_key(pk))
+
+        if entry is None:
+            data = super().retrieve(request, *args, **kwargs).data
+            entry = incident_cache.store_detail(pk, data)
+
+        return incident_cache.conditional_response(request, entry)
 
 
 # ======================================================
@@ -93,4 +334,75 @@ class IncidentDetailAPIView(generics.RetrieveAPIView):
 class IncidentAdminUpdateAPIView(generics.UpdateAPIView):
     serializer_class = IncidentAdminUpdateSerializer
     permission_classes = [IsAdminRole]
-    queryset = Incident.objects.all()
+    queryset = Incident.objects.select_related("reporter")
+
+
+# ======================================================
+# ADMIN BULK TRIAGE
+# ======================================================
+
+class IncidentBulkTransitionAPIView(generics.GenericAPIView):
+    """
+    POST {"ids": [1, 2, 3], "status": "verified"}
+
+    Moves every listed incident that allows the transition; the others are
+    returned under "skipped" with the reason.
+    """
+    serializer_class = IncidentBulkTransitionSerializer
+    permission_classes = [IsAdminRole]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save())
+
+
+# ======================================================
+# ADMIN TRIAGE QUEUE
+# ======================================================
+
+class TriageQueueMixin:
+    serializer_class = IncidentPublicSerializer
+    permission_classes = [IsAdminRole]
+
+    def queue_response(self, ids, **extra):
+        incidents = public_incident_queryset().in_bulk(ids)
+        results = IncidentPublicSerializer([incidents[pk] for pk in ids if pk in incidents], many=True).data
+        return Response({"results": results, "waiting": triage.waiting_count(), **extra})
+
+
+class TriageQueueAPIView(TriageQueueMixin, generics.GenericAPIView):
+    """GET: the reports this admin holds, plus how many are still unclaimed."""
+
+    def get(self, request, *args, **kwargs):
+        return self.queue_response(triage.claimed_by(request.user))
+
+
+class TriageClaimAPIView(TriageQueueMixin, generics.GenericAPIView):
+    """
+    POST {"count": 10}
+
+    Claims the next unclaimed reports, most severe and oldest first. The
+    claim lapses after TRIAGE_LEASE_SECONDS unless the incidents are moved
+    to another status first.
+    """
+    serializer_class = TriageClaimSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ids = triage.claim(request.user, serializer.validated_data["count"])
+        return self.queue_response(ids, lease_seconds=settings.TRIAGE_LEASE_SECONDS)
+
+
+class TriageReleaseAPIView(TriageQueueMixin, generics.GenericAPIView):
+    """POST {"ids": [...]} hands claimed reports back to the queue."""
+    serializer_class = TriageReleaseSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        released = triage.release(request.user, serializer.validated_data["ids"])
+        return Response({"released": released, "waiting": triage.waiting_count()})
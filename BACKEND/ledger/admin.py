@@ -1,4 +1,32 @@
 from django.contrib import admin
-from .models import LedgerEntry
-# Register your models here.
-admin.site.register(LedgerEntry)
\ No newline at end of file
+from .models import LedgerCheckpoint, LedgerEntry
+
+
+# Entries are append-only and added by the application, never by hand
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ("sequence", "module", "reference_id", "action", "changed_by", "timestamp")
+    list_filter = ("module", "action")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LedgerCheckpoint)
+class LedgerCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("size", "root", "created_at", "verified_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
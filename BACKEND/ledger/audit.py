@@ -0,0 +1,243 @@
+"""
+Automatic audit capture into LedgerEntry.
+
+Saving or deleting a model listed in AUDITED_FIELDS records an entry
+holding only the audited fields that changed: old_data/new_data map each
+changed field to its value before/after, under the model's label
+(e.g. "assessments.lossassessment") and the row's pk. Creates record the audited
+fields they set, deletes the values the row had. Entries for anonymous
+donations name no actor, so the ledger cannot tie them to the donor. A
+save that changes no audited field (e.g. an updated_at bump) records
+nothing. As with the
+dashboard counters, every instance remembers its audited values when it
+is loaded (ledger/signals.py), so finding the changes costs no query.
+
+Entries are written in batches. Inside a transaction each capture waits
+on its own on_commit callback, so rolling back a savepoint drops exactly
+what was captured inside it; instances whose capture was dropped go back
+to the snapshot they had before it. During a request
+AuditMiddleware collects everything the request captured and writes it
+with one chain.append() when the response is ready, so a bulk operation over
+hundreds of rows adds a single INSERT. The response has been committed by
+then, so a failing batch is logged and retried entry by entry rather than
+turned into an error. Outside both (management commands,
+shells) entries go out as soon as they are captured. QuerySet.update() and
+bulk_update() skip the signals, so code using them calls
+record_bulk_update() like it does for the dashboard counters.
+"""
+import contextvars
+import logging
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from . import chain
+from .models import LedgerEntry
+
+logger = logging.getLogger(__name__)
+
+# {model label: audited field names}; foreign keys are recorded by id
+AUDITED_FIELDS = {
+    "incidents.Incident": (
+        "title", "incident_type", "severity", "location", "status", "approved_by",
+    ),
+    "volunteer.VolunteerAssignment": ("status", "remarks"),
+    "donations.Donation": ("donation_type", "amount", "item_name", "quantity", "is_anonymous"),
+    "rescue.RescueAssignment": ("status", "started_at", "completed_at", "notes"),
+    "assessments.AffectedFamily": (
+        "head_of_family_name", "total_members", "injured_members", "deceased_members", "is_verified",
+    ),
+    "assessments.LossAssessment": (
+        "house_damage", "estimated_property_loss", "livestock_lost", "crops_lost", "remarks",
+    ),
+}
+
+SNAPSHOT_ATTR = "_audit_snapshot"
+PENDING_ATTR = "_audit_pending"
+
+_encoder = DjangoJSONEncoder()
+
+# Set by AuditMiddleware for the duration of a request
+_request = contextvars.ContextVar("ledger_audit_request", default=None)
+_request_entries = contextvars.ContextVar("ledger_audit_entries", default=None)
+
+
+def _json(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Decimal):
+        return str(value)
+    return _encoder.default(value)
+
+
+def snapshot(instance):
+    meta = instance._meta
+    return {
+        name: _json(getattr(instance, meta.get_field(name).attname))
+        for name in AUDITED_FIELDS[meta.label]
+    }
+
+
+def _actor_id(instance):
+    # Whoever saves an anonymous donation is usually its donor
+    if instance._meta.label == "donations.Donation" and instance.is_anonymous:
+        return None
+    request = _request.get()
+    user = getattr(request, "user", None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _entry(instance, action, old_data, new_data):
+    return LedgerEntry(
+        module=instance._meta.label_lower,
+        reference_id=instance.pk,
+        action=action,
+        changed_by_id=_actor_id(instance),
+        old_data=old_data,
+        new_data=new_data,
+    )
+
+
+def write(entries):
+    chain.append(entries)
+
+
+def write_request_entries(entries):
+    """Write a request's entries after its changes committed; logs failures instead of raising."""
+    try:
+        write(entries)
+        return
+    except Exception:
+        logger.exception("Could not write %d audit entries; retrying one at a time", len(entries))
+    for entry in entries:
+        # A rolled-back bulk_create may have left the pk set
+        entry.pk = None
+        try:
+            write([entry])
+        except Exception:
+            logger.exception("Lost audit entry for %s %s", entry.module, entry.reference_id)
+
+
+def _deliver(entries):
+    """Entries whose transaction committed: to the request's buffer, or out now."""
+    collected = _request_entries.get()
+    if collected is None:
+        write(entries)
+    else:
+        collected.extend(entries)
+
+
+class _Capture:
+    """Entries waiting for the transaction (or savepoint) they were captured in."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.delivered = False
+
+    def deliver(self):
+        self.delivered = True
+        _deliver(self.entries)
+
+    def dropped(self):
+        """True once a rollback discarded the callback before it ran."""
+        if self.delivered:
+            return False
+        connection = transaction.get_connection()
+        return not any(hook[1] == self.deliver for hook in connection.run_on_commit)
+
+
+class _Pending:
+    """An instance's snapshot before a capture that may still be rolled back."""
+
+    def __init__(self, capture, previous, before):
+        self.capture = capture
+        self.previous = previous
+        self.before = before
+
+
+def capture(entries):
+    """Hand `entries` over now, or once the current transaction commits; returns the _Capture."""
+    if not entries:
+        return None
+    if not transaction.get_connection().in_atomic_block:
+        _deliver(entries)
+        return None
+    pending = _Capture(entries)
+    transaction.on_commit(pending.deliver)
+    return pending
+
+
+def _settled_snapshot(instance):
+    """The instance's snapshot, undoing captures that were rolled back."""
+    pending = getattr(instance, PENDING_ATTR, None)
+    while pending is not None and pending.capture.dropped():
+        if pending.previous is None:
+            instance.__dict__.pop(SNAPSHOT_ATTR, None)
+        else:
+            setattr(instance, SNAPSHOT_ATTR, pending.previous)
+        pending = pending.before
+    if pending is not None and pending.capture.delivered:
+        pending = None
+    setattr(instance, PENDING_ATTR, pending)
+    return getattr(instance, SNAPSHOT_ATTR, None)
+
+
+def _remember(instance, current, captured):
+    """Make `current` the instance's snapshot, undoable while `captured` may roll back."""
+    if captured is not None:
+        setattr(instance, PENDING_ATTR, _Pending(
+            captured, getattr(instance, SNAPSHOT_ATTR, None), getattr(instance, PENDING_ATTR, None)
+        ))
+    setattr(instance, SNAPSHOT_ATTR, current)
+
+
+def audit_created(instance):
+    new_data = snapshot(instance)
+    _remember(instance, new_data, capture([_entry(instance, "created", None, new_data)]))
+
+
+def audit_deleted(instance):
+    old_data = _settled_snapshot(instance) or snapshot(instance)
+    capture([_entry(instance, "deleted", old_data, None)])
+
+
+def _changes(instance):
+    """(old_data, new_data, current snapshot) restricted to the audited fields that changed."""
+    previous = _settled_snapshot(instance) or {}
+    current = snapshot(instance)
+    changed = [name for name, value in current.items() if previous.get(name, value) != value]
+    return {name: previous[name] for name in changed}, {name: current[name] for name in changed}, current
+
+
+def record_bulk_update(instances):
+    """Audit instances changed with bulk_update() or QuerySet.update()."""
+    entries, snapshots = [], []
+    for instance in instances:
+        old_data, new_data, current = _changes(instance)
+        snapshots.append((instance, current))
+        if new_data:
+            entries.append(_entry(instance, "updated", old_data, new_data))
+    captured = capture(entries)
+    for instance, current in snapshots:
+        _remember(instance, current, captured)
+
+
+class AuditMiddleware:
+    """Write the audit entries captured while handling a request in one INSERT."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_token = _request.set(request)
+        entries_token = _request_entries.set([])
+        try:
+            return self.get_response(request)
+        finally:
+            entries = _request_entries.get()
+            _request_entries.reset(entries_token)
+            try:
+                write_request_entries(entries)
+            finally:
+                _request.reset(request_token)
@@ -0,0 +1,218 @@
+"""
+The append-only, hash-chained ledger.
+
+append() numbers new entries after the current head, hashes each over its
+fields and its predecessor's hash (merkle.entry_hash), adds the hashes to
+the Merkle mountain range and stores everything in one transaction that
+holds the LedgerHead row lock. Every LEDGER_CHECKPOINT_INTERVAL entries
+the root of the range is saved as a LedgerCheckpoint; published roots
+let anyone hold the ledger to its past.
+
+Verification never rehashes the whole table:
+
+- prove(entry) checks one entry in O(log n): it rehashes the entry,
+  checks the link to its predecessor and rebuilds the root of the nearest
+  checkpoint (or the head) from log n stored nodes;
+- verify() replays only the entries after the last verified checkpoint,
+  recomputing hashes and peaks from that checkpoint's state, and marks
+  each later checkpoint verified as its root is matched.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import merkle
+from .models import LedgerCheckpoint, LedgerEntry, LedgerHead, LedgerNode
+
+BULK_BATCH_SIZE = 500
+
+
+def _locked_head():
+    LedgerHead.objects.get_or_create(pk=1, defaults={"last_hash": merkle.GENESIS_HASH})
+    return LedgerHead.objects.select_for_update().get(pk=1)
+
+
+def append(entries):
+    """Chain and store unsaved `entries`, in order; returns them."""
+    if not entries:
+        return entries
+
+    with transaction.atomic():
+        head = _locked_head()
+        nodes, checkpoints = [], []
+        interval = settings.LEDGER_CHECKPOINT_INTERVAL
+
+        for entry in entries:
+            entry.sequence = head.size + 1
+            entry.prev_hash = head.last_hash
+            entry.entry_hash = merkle.entry_hash(entry.prev_hash, entry.hashed_fields())
+            nodes.extend(merkle.append(head.peaks, head.size, entry.entry_hash))
+            head.size, head.last_hash = entry.sequence, entry.entry_hash
+
+            if head.size % interval == 0:
+                checkpoints.append(_checkpoint(head))
+
+        LedgerEntry.objects.bulk_create(entries, batch_size=BULK_BATCH_SIZE)
+        LedgerNode.objects.bulk_create(
+            [LedgerNode(level=level, index=index, hash=digest) for level, index, digest in nodes],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        LedgerCheckpoint.objects.bulk_create(checkpoints)
+        head.save(update_fields=["size", "last_hash", "peaks"])
+    return entries
+
+
+def _checkpoint(head):
+    return LedgerCheckpoint(
+        size=head.size,
+        root=merkle.root_hash(head.size, [digest for _, _, digest in head.peaks]),
+        last_hash=head.last_hash,
+        peaks=[list(peak) for peak in head.peaks],
+    )
+
+
+def checkpoint_now():
+    """Checkpoint the current head unless it already is; returns the checkpoint."""
+    with transaction.atomic():
+        head = _locked_head()
+        if not head.size:
+            return None
+        checkpoint = LedgerCheckpoint.objects.filter(size=head.size).first()
+        if checkpoint is None:
+            checkpoint = _checkpoint(head)
+            checkpoint.save()
+    return checkpoint
+
+
+def _node_hashes(positions):
+    """{(level, index): hash} for node positions, entries standing in for leaves."""
+    hashes = {}
+    leaves = [index + 1 for level, index in positions if level == 0]
+    if leaves:
+        for sequence, digest in LedgerEntry.objects.filter(sequence__in=leaves).values_list(
+            "sequence", "entry_hash"
+        ):
+            hashes[(0, sequence - 1)] = digest
+
+    inner = [(level, index) for level, index in positions if level > 0]
+    if inner:
+        by_level = {}
+        for level, index in inner:
+            by_level.setdefault(level, []).append(index)
+        query = LedgerNode.objects.none()
+        for level, indexes in by_level.items():
+            query = query | LedgerNode.objects.filter(level=level, index__in=indexes)
+        for level, index, digest in query.values_list("level", "index", "hash"):
+            hashes[(level, index)] = digest
+    return hashes
+
+
+def prove(entry):
+    """
+    Inclusion proof for `entry` against the first checkpoint covering it,
+    or the head when none does yet, with the checks a verifier would make.
+    """
+    checkpoint = LedgerCheckpoint.objects.filter(size__gte=entry.sequence).order_by("size").first()
+    if checkpoint is not None:
+        size, root, anchor = checkpoint.size, checkpoint.root, "checkpoint"
+    else:
+        head = LedgerHead.objects.get(pk=1)
+        size, anchor = head.size, "head"
+        root = merkle.root_hash(size, [digest for _, _, digest in head.peaks])
+
+    leaf_index = entry.sequence - 1
+    siblings, peak = merkle.proof_positions(leaf_index, size)
+    other_peaks = [position for position in merkle.peak_positions(size) if position != peak]
+    hashes = _node_hashes(siblings + other_peaks)
+
+    if entry.sequence == 1:
+        previous = merkle.GENESIS_HASH
+    else:
+        previous = LedgerEntry.objects.filter(sequence=entry.sequence - 1).values_list(
+            "entry_hash", flat=True
+        ).first()
+
+    content_valid = merkle.entry_hash(entry.prev_hash, entry.hashed_fields()) == entry.entry_hash
+    chain_valid = previous == entry.prev_hash
+    complete = all(position in hashes for position in siblings + other_peaks)
+    root_valid = complete and merkle.root_from_proof(
+        leaf_index,
+        entry.entry_hash,
+        size,
+        [hashes[position] for position in siblings],
+        {position: hashes[position] for position in other_peaks},
+    ) == root
+
+    return {
+        "sequence": entry.sequence,
+        "entry_hash": entry.entry_hash,
+        "prev_hash": entry.prev_hash,
+        "anchor": anchor,
+        "size": size,
+        "root": root,
+        "siblings": [
+            {"level": level, "index": index, "hash": hashes.get((level, index))}
+            for level, index in siblings
+        ],
+        "peaks": [
+            {"level": level, "index": index, "hash": hashes.get((level, index))}
+            for level, index in other_peaks
+        ],
+        "content_valid": content_valid,
+        "chain_valid": chain_valid,
+        "root_valid": root_valid,
+        "valid": content_valid and chain_valid and root_valid,
+    }
+
+
+def verify(full=False, chunk_size=2000):
+    """
+    Replay the chain from the last verified checkpoint (or from the start
+    when `full`), checking every hash, link and checkpoint root on the way.
+    Returns {"valid", "verified_from", "checked", "size", "error"}.
+    """
+    start = None
+    if not full:
+        start = LedgerCheckpoint.objects.filter(verified_at__isnull=False).order_by("-size").first()
+
+    size = start.size if start else 0
+    last_hash = start.last_hash if start else merkle.GENESIS_HASH
+    peaks = [list(peak) for peak in start.peaks] if start else []
+    pending = {checkpoint.size: checkpoint for checkpoint in LedgerCheckpoint.objects.filter(size__gt=size)}
+    result = {"valid": True, "verified_from": size, "checked": 0, "size": size, "error": None}
+
+    def fail(message):
+        result.update(valid=False, size=size, error=message)
+        return result
+
+    verified = []
+    for entry in LedgerEntry.objects.filter(sequence__gt=size).order_by("sequence").iterator(chunk_size=chunk_size):
+        if entry.sequence != size + 1:
+            return fail(f"Entry {size + 1} is missing")
+        if entry.prev_hash != last_hash:
+            return fail(f"Entry {entry.sequence} does not link to entry {size}")
+        if merkle.entry_hash(entry.prev_hash, entry.hashed_fields()) != entry.entry_hash:
+            return fail(f"Entry {entry.sequence} was modified")
+
+        merkle.append(peaks, size, entry.entry_hash)
+        size, last_hash = entry.sequence, entry.entry_hash
+        result["checked"] += 1
+
+        checkpoint = pending.pop(size, None)
+        if checkpoint is not None:
+            if merkle.root_hash(size, [digest for _, _, digest in peaks]) != checkpoint.root:
+                return fail(f"Checkpoint at {size} does not match the entries")
+            verified.append(checkpoint.pk)
+            if len(verified) >= 100:
+                LedgerCheckpoint.objects.filter(pk__in=verified).update(verified_at=timezone.now())
+                verified = []
+
+    LedgerCheckpoint.objects.filter(pk__in=verified).update(verified_at=timezone.now())
+    if pending:
+        return fail(f"Checkpoint at {min(pending)} is past the last entry")
+
+    head = LedgerHead.objects.filter(pk=1).first()
+    if head is not None and (head.size, head.last_hash) != (size, last_hash):
+        return fail("The chain head does not match the last entry")
+    result["size"] = size
+    return result
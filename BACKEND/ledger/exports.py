@@ -0,0 +1,23 @@
+from RapidAid.exports import Export
+
+from .models import LedgerEntry
+
+# In chain order, with the hashes, so an export can be verified offline
+LEDGER = Export(
+    "ledger",
+    LedgerEntry.objects.order_by("sequence"),
+    [
+        ("sequence", "sequence"),
+        ("id", "id"),
+        ("timestamp", "timestamp"),
+        ("module", "module"),
+        ("reference_id", "reference_id"),
+        ("action", "action"),
+        ("changed_by", "changed_by_id"),
+        ("old_data", "old_data"),
+        ("new_data", "new_data"),
+        ("note", "note"),
+        ("prev_hash", "prev_hash"),
+        ("entry_hash", "entry_hash"),
+    ],
+)
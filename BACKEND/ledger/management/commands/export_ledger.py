@@ -0,0 +1,7 @@
+from ledger.exports import LEDGER
+from RapidAid.exports import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream the ledger, in chain order with its hashes, as CSV or NDJSON."
+    export = LEDGER
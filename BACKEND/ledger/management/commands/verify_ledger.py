@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ledger import chain
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify the ledger's hash chain and Merkle checkpoints, from the last "
+        "verified checkpoint or, with --full, from the first entry."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Replay the whole chain.")
+        parser.add_argument(
+            "--checkpoint",
+            action="store_true",
+            help="Checkpoint the current head first, so the next run starts from it.",
+        )
+
+    def handle(self, *args, **options):
+        if options["checkpoint"]:
+            checkpoint = chain.checkpoint_now()
+            if checkpoint is not None:
+                self.stdout.write(f"Checkpoint at {checkpoint.size}: {checkpoint.root}")
+
+        result = chain.verify(full=options["full"])
+        if not result["valid"]:
+            raise CommandError(f"Ledger verification failed: {result['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Verified {result['checked']} entr{'y' if result['checked'] == 1 else 'ies'} "
+            f"from {result['verified_from']}; the ledger holds {result['size']}"
+        ))
@@ -0,0 +1,94 @@
+"""
+Hashing for the append-only ledger (ledger/chain.py).
+
+Entry hashes chain each entry to its predecessor. The same hashes are the
+leaves of a Merkle mountain range: one perfect binary tree per set bit of
+the leaf count, so appending a leaf only merges the trees on the right
+and never rewrites a node. The nodes on the right edge (the "peaks") are
+all an append needs, and the root of the whole range is the hash of the
+peaks.
+
+A node is addressed by (level, index): leaves are level 0, and node
+(level, index) covers leaves [index * 2**level, (index + 1) * 2**level).
+
+Nothing here touches the database, so migrations can use it too.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+GENESIS_HASH = "0" * 64
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def canonical(fields):
+    return json.dumps(fields, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":"))
+
+
+def entry_hash(prev_hash, fields):
+    """Hash of one entry's fields, chained to the hash before it."""
+    return _sha256(f"entry:{prev_hash}:{canonical(fields)}")
+
+
+def node_hash(left, right):
+    return _sha256(f"node:{left}:{right}")
+
+
+def root_hash(size, peak_hashes):
+    return _sha256(f"root:{size}:{':'.join(peak_hashes)}")
+
+
+def append(peaks, leaf_index, leaf_hash):
+    """
+    Add leaf `leaf_index` to `peaks` ([level, index, hash] left to right),
+    in place; returns the new inner nodes as (level, index, hash).
+    """
+    nodes = []
+    level, index, digest = 0, leaf_index, leaf_hash
+    while peaks and peaks[-1][0] == level:
+        _, _, left = peaks.pop()
+        level, index, digest = level + 1, index // 2, node_hash(left, digest)
+        nodes.append((level, index, digest))
+    peaks.append([level, index, digest])
+    return nodes
+
+
+def peak_positions(size):
+    """(level, index) of every peak of a range of `size` leaves, left to right."""
+    positions, start = [], 0
+    for level in reversed(range(size.bit_length())):
+        if size & (1 << level):
+            positions.append((level, start >> level))
+            start += 1 << level
+    return positions
+
+
+def proof_positions(leaf_index, size):
+    """
+    (siblings, peak): the (level, index) of each sibling on the way from a
+    leaf up to the peak holding it, in a range of `size` leaves.
+    """
+    siblings, level, index = [], 0, leaf_index
+    while ((index // 2) + 1) << (level + 1) <= size:
+        siblings.append((level, index ^ 1))
+        level, index = level + 1, index // 2
+    return siblings, (level, index)
+
+
+def root_from_proof(leaf_index, leaf_hash, size, sibling_hashes, peak_hashes):
+    """
+    The root implied by an inclusion proof; `peak_hashes` maps each peak
+    position of `size` other than the leaf's own to its hash.
+    """
+    siblings, peak = proof_positions(leaf_index, size)
+    digest, index = leaf_hash, leaf_index
+    for (_, sibling_index), sibling in zip(siblings, sibling_hashes):
+        digest = node_hash(sibling, digest) if sibling_index < index else node_hash(digest, sibling)
+        index //= 2
+    return root_hash(size, [
+        digest if position == peak else peak_hashes[position] for position in peak_positions(size)
+    ])
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledger', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['-timestamp', '-id'], name='ledger_timestamp_id_idx'),
+        ),
+    ]
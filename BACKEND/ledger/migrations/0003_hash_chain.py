@@ -0,0 +1,132 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+from ledger import merkle
+
+
+def chain_entries(apps, schema_editor):
+    LedgerEntry = apps.get_model("ledger", "LedgerEntry")
+    LedgerHead = apps.get_model("ledger", "LedgerHead")
+    LedgerNode = apps.get_model("ledger", "LedgerNode")
+    LedgerCheckpoint = apps.get_model("ledger", "LedgerCheckpoint")
+
+    size, last_hash, peaks = 0, merkle.GENESIS_HASH, []
+    entries, nodes, checkpoints = [], [], []
+    for entry in LedgerEntry.objects.order_by("id").iterator(chunk_size=2000):
+        entry.sequence = size + 1
+        entry.prev_hash = last_hash
+        # Same fields as LedgerEntry.hashed_fields()
+        entry.entry_hash = merkle.entry_hash(entry.prev_hash, {
+            "sequence": entry.sequence,
+            "module": entry.module,
+            "reference_id": entry.reference_id,
+            "action": entry.action,
+            "changed_by": entry.changed_by_id,
+            "timestamp": entry.timestamp,
+            "old_data": entry.old_data,
+            "new_data": entry.new_data,
+            "note": entry.note,
+        })
+        nodes.extend(
+            LedgerNode(level=level, index=index, hash=digest)
+            for level, index, digest in merkle.append(peaks, size, entry.entry_hash)
+        )
+        size, last_hash = entry.sequence, entry.entry_hash
+        entries.append(entry)
+
+        if size % settings.LEDGER_CHECKPOINT_INTERVAL == 0:
+            checkpoints.append(LedgerCheckpoint(
+                size=size,
+                root=merkle.root_hash(size, [digest for _, _, digest in peaks]),
+                last_hash=last_hash,
+                peaks=[list(peak) for peak in peaks],
+            ))
+        if len(entries) >= 2000:
+            LedgerEntry.objects.bulk_update(entries, ["sequence", "prev_hash", "entry_hash"])
+            entries = []
+
+    LedgerEntry.objects.bulk_update(entries, ["sequence", "prev_hash", "entry_hash"], batch_size=2000)
+    LedgerNode.objects.bulk_create(nodes, batch_size=2000)
+    LedgerCheckpoint.objects.bulk_create(checkpoints, batch_size=2000)
+    LedgerHead.objects.create(pk=1, size=size, last_hash=last_hash, peaks=peaks)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledger', '0002_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='changed_by',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ledgerentry',
+            name='sequence',
+            field=models.PositiveBigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ledgerentry',
+            name='prev_hash',
+            field=models.CharField(default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='ledgerentry',
+            name='entry_hash',
+            field=models.CharField(default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name='LedgerHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('last_hash', models.CharField(max_length=64)),
+                ('peaks', models.JSONField(default=list)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LedgerNode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.PositiveSmallIntegerField()),
+                ('index', models.PositiveBigIntegerField()),
+                ('hash', models.CharField(max_length=64)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('level', 'index'), name='ledger_node_position_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.PositiveBigIntegerField(unique=True)),
+                ('root', models.CharField(max_length=64)),
+                ('last_hash', models.CharField(max_length=64)),
+                ('peaks', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(chain_entries, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='sequence',
+            field=models.PositiveBigIntegerField(editable=False, unique=True),
+        ),
+    ]
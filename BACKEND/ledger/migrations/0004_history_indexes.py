@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledger', '0003_hash_chain'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['module', 'reference_id', '-timestamp', '-id'], name='ledger_entity_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['changed_by', '-timestamp', '-id'], name='ledger_actor_history_idx'),
+        ),
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='changed_by',
+            field=models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,12 +1,108 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
 
 class LedgerEntry(models.Model):
+    """
+    One append-only ledger entry. Entries are added through
+    ledger/chain.py, which numbers them and chains each one's hash to the
+    previous entry; saving an existing entry or deleting one is refused.
+    """
+    NOTE = "note"
+
+    # Model label of the changed row for captured entries, e.g. "donations.donation"
     module = models.CharField(max_length=50)
     reference_id = models.IntegerField()
-    action = models.CharField(max_length=20)  # created/updated
-    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # created/updated/deleted when captured (ledger/audit.py), NOTE when
+    # written by hand through the API
+    action = models.CharField(max_length=20)
+    # Kept when the user is deleted: the id is part of the entry's hash.
+    # ledger_actor_history_idx leads with it, so it needs no index of its own.
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True
+    )
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     old_data = models.JSONField(null=True, blank=True)
     new_data = models.JSONField(null=True, blank=True)
     note = models.TextField(null=True, blank=True)
+
+    # Position in the chain, from 1, and the hashes linking it
+    sequence = models.PositiveBigIntegerField(unique=True, editable=False)
+    prev_hash = models.CharField(max_length=64, editable=False)
+    entry_hash = models.CharField(max_length=64, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-timestamp", "-id"], name="ledger_timestamp_id_idx"),
+            # History of one entity and of one actor, in cursor order
+            models.Index(
+                fields=["module", "reference_id", "-timestamp", "-id"], name="ledger_entity_history_idx"
+            ),
+            models.Index(fields=["changed_by", "-timestamp", "-id"], name="ledger_actor_history_idx"),
+        ]
+
+    def hashed_fields(self):
+        return {
+            "sequence": self.sequence,
+            "module": self.module,
+            "reference_id": self.reference_id,
+            "action": self.action,
+            "changed_by": self.changed_by_id,
+            "timestamp": self.timestamp,
+            "old_data": self.old_data,
+            "new_data": self.new_data,
+            "note": self.note,
+        }
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ledger entries cannot be changed")
+        from .chain import append
+        append([self])
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Ledger entries cannot be deleted")
+
+
+class LedgerHead(models.Model):
+    """
+    The single row (pk 1) describing the end of the chain: its length,
+    last hash and Merkle peaks. Appends lock it, so they are serialized.
+    """
+    size = models.PositiveBigIntegerField(default=0)
+    last_hash = models.CharField(max_length=64)
+    peaks = models.JSONField(default=list)
+
+
+class LedgerNode(models.Model):
+    """Inner Merkle node (level >= 1); leaves are the entries' entry_hash."""
+    level = models.PositiveSmallIntegerField()
+    index = models.PositiveBigIntegerField()
+    hash = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["level", "index"], name="ledger_node_position_unique"),
+        ]
+
+
+class LedgerCheckpoint(models.Model):
+    """
+    Merkle root of the first `size` entries, taken every
+    LEDGER_CHECKPOINT_INTERVAL entries. `verified_at` is set once a
+    verification pass has replayed the chain up to it.
+    """
+    size = models.PositiveBigIntegerField(unique=True)
+    root = models.CharField(max_length=64)
+    last_hash = models.CharField(max_length=64)
+    peaks = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    verified_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Ledger checkpoint at {self.size}: {self.root}"
@@ -28,8 +28,12 @@ class LedgerEntrySerializer(serializers.ModelSerializer):
             "old_data",
             "new_data",
             "note",
+            "sequence",
+            "prev_hash",
+            "entry_hash",
         ]
         read_only_fields = [
+            "action",
             "changed_by",
             "timestamp",
         ]
@@ -0,0 +1,43 @@
+"""
+Audit saves and deletes of the models in ledger.audit.AUDITED_FIELDS.
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from .audit import AUDITED_FIELDS, SNAPSHOT_ATTR, audit_created, audit_deleted, record_bulk_update, snapshot
+
+
+def _snapshot_on_init(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    deferred = instance.get_deferred_fields()
+    if any(sender._meta.get_field(name).attname in deferred for name in AUDITED_FIELDS[sender._meta.label]):
+        return
+    setattr(instance, SNAPSHOT_ATTR, snapshot(instance))
+
+
+def _snapshot_before_save(sender, instance, **kwargs):
+    if instance._state.adding or hasattr(instance, SNAPSHOT_ATTR):
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).first()
+    if previous is not None:
+        setattr(instance, SNAPSHOT_ATTR, snapshot(previous))
+
+
+def _audit_save(sender, instance, created, **kwargs):
+    if created or not hasattr(instance, SNAPSHOT_ATTR):
+        audit_created(instance)
+    else:
+        record_bulk_update([instance])
+
+
+def _audit_delete(sender, instance, **kwargs):
+    audit_deleted(instance)
+
+
+for label in AUDITED_FIELDS:
+    model = apps.get_model(label)
+    post_init.connect(_snapshot_on_init, sender=model, dispatch_uid=f"audit_init_{label}")
+    pre_save.connect(_snapshot_before_save, sender=model, dispatch_uid=f"audit_pre_save_{label}")
+    post_save.connect(_audit_save, sender=model, dispatch_uid=f"audit_save_{label}")
+    post_delete.connect(_audit_delete, sender=model, dispatch_uid=f"audit_delete_{label}")
@@ -1,3 +1,345 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import chain
+from .models import LedgerCheckpoint, LedgerEntry, LedgerHead
+from Authapp.models import UserRole
+from assessments.models import AffectedFamily, LossAssessment
+from donations.models import Donor
+from incidents.models import IncidentStatus
+from volunteer.models import VolunteerAssignment
+from RapidAid.testing import QueryCountMixin, api_client, make_incident, make_user
+
+
+class LedgerQueryCountTests(QueryCountMixin, TestCase):
+    def test_ledger_list_queries_do_not_grow_with_rows(self):
+        def add_entry():
+            LedgerEntry.objects.create(
+                module="donations.donation",
+                reference_id=1,
+                action="created",
+                changed_by=make_user(),
+            )
+
+        client = api_client(make_user(role=UserRole.ADMIN))
+        self.assertConstantQueries(client, "/api/ledger/ledger-entries/", add_entry)
+
+
+class LedgerHistoryTests(TestCase):
+    def setUp(self):
+        self.admin = make_user(role=UserRole.ADMIN)
+        self.other = make_user()
+        self.client = api_client(self.admin)
+        start = timezone.now() - timedelta(days=1)
+        chain.append([
+            LedgerEntry(
+                module=module,
+                reference_id=reference_id,
+                action="updated",
+                changed_by=actor,
+                timestamp=start + timedelta(minutes=minute),
+            )
+            for minute, (module, reference_id, actor) in enumerate([
+                ("donations.donation", 1, self.admin),
+                ("donations.donation", 2, self.other),
+                ("donations.donation", 1, self.other),
+                ("incidents.incident", 1, self.admin),
+                ("donations.donation", 1, self.admin),
+            ])
+        ])
+
+    def pages(self, url):
+        sequences = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            sequences.extend(row["sequence"] for row in response.data["results"])
+            url = response.data["next"]
+        return sequences
+
+    def test_entity_history_is_paginated_newest_first(self):
+        self.assertEqual(self.pages("/api/ledger/history/donations.donation/1/?page_size=2"), [5, 3, 1])
+
+    def test_actor_history(self):
+        self.assertEqual(self.pages(f"/api/ledger/history/users/{self.other.pk}/"), [3, 2])
+        url = f"/api/ledger/history/users/{self.admin.pk}/"
+        self.assertEqual(api_client(self.other).get(url).status_code, 403)
+
+    def test_history_reads_use_the_composite_indexes(self):
+        entity = LedgerEntry.objects.filter(module="donations.donation", reference_id=1).order_by("-timestamp", "-id")
+        actor = LedgerEntry.objects.filter(changed_by=self.admin).order_by("-timestamp", "-id")
+        self.assertIn("ledger_entity_history_idx", entity.explain())
+        self.assertIn("ledger_actor_history_idx", actor.explain())
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class AuditCaptureTests(TestCase):
+    def setUp(self):
+        self.admin = make_user(role=UserRole.ADMIN)
+        self.client = api_client(self.admin)
+        self.seen = 0
+
+    def committed(self, create):
+        """Run `create` as its own committed transaction and ignore what it recorded."""
+        with self.captureOnCommitCallbacks(execute=True):
+            result = create()
+        self.seen = LedgerHead.objects.get().size
+        return result
+
+    def recorded(self):
+        return LedgerEntry.objects.filter(sequence__gt=self.seen)
+
+    def test_status_change_records_only_changed_fields(self):
+        incident = self.committed(make_incident)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/incidents/admin/{incident.pk}/update/",
+                {"status": IncidentStatus.VERIFIED},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        entry = self.recorded().get()
+        self.assertEqual((entry.module, entry.reference_id, entry.action), ("incidents.incident", incident.pk, "updated"))
+        self.assertEqual(entry.changed_by, self.admin)
+        self.assertEqual(entry.old_data, {"status": IncidentStatus.REPORTED, "approved_by": None})
+        self.assertEqual(entry.new_data, {"status": IncidentStatus.VERIFIED, "approved_by": self.admin.pk})
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        incident = self.committed(make_incident)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    incident.severity = "low"
+                    incident.save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            incident.title = "Renamed"
+            incident.save()
+
+        # The second save writes the in-memory severity the rollback discarded
+        self.assertEqual(
+            list(self.recorded().values_list("new_data", flat=True)), [{"severity": "low", "title": "Renamed"}]
+        )
+
+    def test_entries_are_keyed_by_model_label(self):
+        family = self.committed(lambda: AffectedFamily.objects.create(
+            incident=make_incident(), head_of_family_name="Sita", contact_number="9800000000",
+            address="Ward 4", total_members=4,
+        ))
+        with self.captureOnCommitCallbacks(execute=True):
+            LossAssessment.objects.create(family=family, house_damage="full", estimated_property_loss=1000)
+
+        entry = self.recorded().get()
+        self.assertEqual((entry.module, entry.action), ("assessments.lossassessment", "created"))
+        history = self.client.get(f"/api/ledger/history/assessments.affectedfamily/{family.pk}/").data["results"]
+        self.assertEqual([row["action"] for row in history], ["created"])
+
+    def test_anonymous_donations_record_no_actor(self):
+        donor = make_user()
+        Donor.objects.create(user=donor)
+        incident = self.committed(make_incident)
+
+        for is_anonymous in (True, False):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = api_client(donor).post("/api/donations/donate/", {
+                    "incident": incident.pk, "donation_type": "money", "amount": "10", "is_anonymous": is_anonymous,
+                }, format="json")
+            self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(
+            list(self.recorded().values_list("new_data__is_anonymous", "changed_by")), [(True, None), (False, donor.pk)]
+        )
+
+    def test_savepoint_rollback_drops_only_its_entries(self):
+        incident = self.committed(make_incident)
+        title = incident.title
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                incident.title = "Renamed"
+                incident.save()
+                try:
+                    with transaction.atomic():
+                        incident.severity = "low"
+                        incident.save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            incident.refresh_from_db()
+            incident.location = "Pokhara"
+            incident.save()
+
+        self.assertEqual(
+            list(self.recorded().order_by("sequence").values_list("old_data", "new_data")),
+            [
+                ({"title": title}, {"title": "Renamed"}),
+                ({"location": "Kathmandu"}, {"location": "Pokhara"}),
+            ],
+        )
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class AuditBatchingTests(TransactionTestCase):
+    """Real commits, so on_commit callbacks run inside the request as they do in production."""
+
+    def setUp(self):
+        self.client = api_client(make_user(role=UserRole.ADMIN))
+
+    def test_bulk_approval_is_one_insert(self):
+        incident = make_incident()
+        ids = [VolunteerAssignment.objects.create(user=make_user(), incident=incident).pk for _ in range(30)]
+        recorded = LedgerEntry.objects.filter(sequence__gt=LedgerHead.objects.get().size)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/volunteer/bulk-update/", {"ids": ids, "status": "approved"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+        inserts = [q for q in context.captured_queries if q["sql"].startswith('INSERT INTO "ledger_ledgerentry"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(sorted(recorded.filter(module="volunteer.volunteerassignment").values_list("reference_id", flat=True)), ids)
+        self.assertEqual(recorded.filter(new_data={"status": "approved"}).count(), 30)
+
+    def test_failed_batch_falls_back_to_single_entries(self):
+        incident = make_incident()
+        ids = [VolunteerAssignment.objects.create(user=make_user(), incident=incident).pk for _ in range(3)]
+        recorded = LedgerEntry.objects.filter(sequence__gt=LedgerHead.objects.get().size)
+        append = chain.append
+
+        def batches_fail(entries):
+            if len(entries) > 1:
+                raise DatabaseError("batch rejected")
+            return append(entries)
+
+        with mock.patch.object(chain, "append", side_effect=batches_fail), self.assertLogs("ledger.audit", "ERROR"):
+            response = self.client.post(
+                "/api/volunteer/bulk-update/", {"ids": ids, "status": "approved"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        assignments = recorded.filter(module="volunteer.volunteerassignment")
+        self.assertEqual(sorted(assignments.values_list("reference_id", flat=True)), ids)
+        self.assertTrue(chain.verify()["valid"])
+
+
+@override_settings(LEDGER_CHECKPOINT_INTERVAL=4)
+class LedgerChainTests(TestCase):
+    def setUp(self):
+        self.admin = make_user(role=UserRole.ADMIN)
+        self.client = api_client(self.admin)
+
+    def add(self, count):
+        return chain.append([
+            LedgerEntry(module="donations.donation", reference_id=number, action="created", new_data={"n": number})
+            for number in range(count)
+        ])
+
+    def test_entries_are_chained_and_checkpointed(self):
+        entries = self.add(10)
+
+        self.assertEqual([entry.sequence for entry in entries], list(range(1, 11)))
+        self.assertEqual(entries[1].prev_hash, entries[0].entry_hash)
+        self.assertEqual(list(LedgerCheckpoint.objects.values_list("size", flat=True)), [4, 8])
+        for entry in LedgerEntry.objects.all():
+            self.assertTrue(chain.prove(entry)["valid"], entry.sequence)
+
+    def test_proof_endpoint_uses_a_logarithmic_path(self):
+        entry = self.add(8)[2]
+
+        response = self.client.get(f"/api/ledger/ledger-entries/{entry.pk}/proof/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["valid"])
+        self.assertEqual((response.data["anchor"], response.data["size"]), ("checkpoint", 4))
+        self.assertEqual(len(response.data["siblings"]), 2)
+
+    def test_entries_cannot_be_changed_or_deleted(self):
+        entry = self.add(1)[0]
+
+        entry.note = "edited"
+        with self.assertRaises(ValueError):
+            entry.save()
+        with self.assertRaises(ValueError):
+            entry.delete()
+
+        url = f"/api/ledger/ledger-entries/{entry.pk}/"
+        self.assertEqual(self.client.patch(url, {"note": "edited"}, format="json").status_code, 405)
+        self.assertEqual(self.client.delete(url).status_code, 405)
+
+    def test_only_admins_add_entries_and_they_are_notes(self):
+        forged = {"module": "donations.donation", "reference_id": 1, "action": "deleted"}
+        self.assertEqual(api_client(make_user()).post("/api/ledger/ledger-entries/", forged, format="json").status_code, 403)
+
+        response = self.client.post("/api/ledger/ledger-entries/", {**forged, "note": "Refund agreed"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["action"], LedgerEntry.NOTE)
+        self.assertEqual(LedgerEntry.objects.get(pk=response.data["id"]).changed_by, self.admin)
+
+    def test_tampering_is_detected(self):
+        entries = self.add(6)
+        LedgerEntry.objects.filter(pk=entries[1].pk).update(new_data={"n": 99})
+
+        self.assertFalse(chain.prove(LedgerEntry.objects.get(pk=entries[1].pk))["content_valid"])
+        result = chain.verify(full=True)
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["error"], "Entry 2 was modified")
+
+    def test_verify_resumes_from_the_last_verified_checkpoint(self):
+        self.add(9)
+        self.assertEqual(chain.verify()["checked"], 9)
+        self.assertEqual(LedgerCheckpoint.objects.filter(verified_at__isnull=False).count(), 2)
+
+        self.add(3)
+        response = self.client.get("/api/ledger/verify/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.data["valid"], response.data["verified_from"], response.data["checked"], response.data["size"]),
+            (True, 8, 4, 12),
+        )
+
+
+class LedgerExportTests(TestCase):
+    def setUp(self):
+        chain.append([
+            LedgerEntry(module=module, reference_id=1, action="created", new_data={"amount": "10.00"})
+            for module in ["donations.donation", "incidents.incident", "donations.donation"]
+        ])
+
+    def test_export_is_in_chain_order_with_hashes(self):
+        response = api_client(make_user(role=UserRole.ADMIN)).get("/api/ledger/export/?output=ndjson&module=donations.donation")
+        self.assertEqual(response.status_code, 200)
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row["sequence"] for row in rows], [1, 3])
+        self.assertEqual(rows[0]["new_data"], {"amount": "10.00"})
+        self.assertEqual(rows[1]["entry_hash"], LedgerEntry.objects.get(sequence=3).entry_hash)
+
+    def test_export_is_admin_only(self):
+        self.assertEqual(api_client(make_user()).get("/api/ledger/export/").status_code, 403)
+
+    def test_export_command_writes_gzip(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "ledger.csv.gz")
+
+        call_command("export_ledger", "--gzip", "--path", path, "--chunk-size", "1", stdout=io.StringIO())
+
+        with gzip.open(path, "rt") as handle:
+            lines = handle.read().splitlines()
+        self.assertEqual(lines[0].split(",")[:2], ["sequence", "id"])
+        self.assertEqual(len(lines), 4)
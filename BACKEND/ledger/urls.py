@@ -1,11 +1,27 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import LedgerEntryViewSet
+from .views import (
+    ActorLedgerHistoryAPIView,
+    EntityLedgerHistoryAPIView,
+    LedgerEntryProofAPIView,
+    LedgerEntryViewSet,
+    LedgerExportAPIView,
+    LedgerVerifyAPIView,
+)
 
 router = DefaultRouter()
 router.register(r"ledger-entries", LedgerEntryViewSet)
 
 urlpatterns = [
+    path("ledger-entries/<int:pk>/proof/", LedgerEntryProofAPIView.as_view(), name="ledger-entry-proof"),
+    path("history/users/<int:user_id>/", ActorLedgerHistoryAPIView.as_view(), name="ledger-actor-history"),
+    path(
+        "history/<str:module>/<int:reference_id>/",
+        EntityLedgerHistoryAPIView.as_view(),
+        name="ledger-entity-history",
+    ),
+    path("export/", LedgerExportAPIView.as_view(), name="ledger-export"),
+    path("verify/", LedgerVerifyAPIView.as_view(), name="ledger-verify"),
     path("", include(router.urls)),
 ]
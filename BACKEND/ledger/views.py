@@ -1,5 +1,11 @@
-from rest_framework import viewsets, permissions
+from rest_framework import generics, mixins, permissions, viewsets
+from rest_framework.response import Response
 
+from Authapp.permissions import IsAdminRole
+from RapidAid.exports import ExportAPIView
+
+from . import chain
+from .exports import LEDGER
 from .models import LedgerEntry
 from .serializers import LedgerEntrySerializer
 
@@ -7,10 +13,104 @@ from .serializers import LedgerEntrySerializer
 # --------------------------------------------------
 #              LEDGER ENTRY API
 # --------------------------------------------------
-class LedgerEntryViewSet(viewsets.ModelViewSet):
-    queryset = LedgerEntry.objects.select_related("changed_by").order_by("-timestamp")
+class LedgerEntryViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Append-only: entries can be added and read, never changed or removed.
+    Entries added here are admins' notes (action "note"); only audit
+    capture records created/updated/deleted, so a note cannot pass for one.
+    """
+    queryset = LedgerEntry.objects.select_related("changed_by").order_by("-timestamp", "-id")
     serializer_class = LedgerEntrySerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-timestamp", "-id")
+
+    def get_permissions(self):
+        if self.action == "create":
+            return [IsAdminRole()]
+        return super().get_permissions()
 
     def perform_create(self, serializer):
-        serializer.save(changed_by=self.request.user)
+        serializer.save(changed_by=self.request.user, action=LedgerEntry.NOTE)
+
+
+# --------------------------------------------------
+#              LEDGER HISTORY
+# --------------------------------------------------
+class LedgerHistoryAPIView(generics.ListAPIView):
+    """
+    Newest-first history read from one of the composite history indexes;
+    ?date_from= / ?date_to= narrow it by timestamp.
+    """
+    serializer_class = LedgerEntrySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-timestamp", "-id")
+    date_filter_field = "timestamp"
+
+    def get_queryset(self):
+        return LedgerEntry.objects.filter(**self.history_filter()).select_related(
+            "changed_by"
+        ).order_by("-timestamp", "-id")
+
+
+class EntityLedgerHistoryAPIView(LedgerHistoryAPIView):
+    """
+    GET /api/ledger/history/<module>/<reference_id>/: every change to one
+    record, <module> being its model label (e.g. donations.donation/12/).
+    """
+
+    def history_filter(self):
+        return {"module": self.kwargs["module"], "reference_id": self.kwargs["reference_id"]}
+
+
+class ActorLedgerHistoryAPIView(LedgerHistoryAPIView):
+    """GET /api/ledger/history/users/<user_id>/: every change made by one user; admins only."""
+    permission_classes = [IsAdminRole]
+
+    def history_filter(self):
+        return {"changed_by_id": self.kwargs["user_id"]}
+
+
+# --------------------------------------------------
+#              LEDGER EXPORT
+# --------------------------------------------------
+class LedgerExportAPIView(ExportAPIView):
+    """The ledger in chain order; ?module=, ?action=, ?date_from= / ?date_to=."""
+    permission_classes = [IsAdminRole]
+    export = LEDGER
+    filter_fields = {
+        "module": "module",
+        "action": "action",
+    }
+    date_filter_field = "timestamp"
+
+
+# --------------------------------------------------
+#              LEDGER VERIFICATION
+# --------------------------------------------------
+class LedgerEntryProofAPIView(generics.GenericAPIView):
+    """
+    Inclusion proof for one entry: its hashes, the Merkle path to the
+    covering checkpoint's root and whether each check holds.
+    """
+    queryset = LedgerEntry.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        return Response(chain.prove(self.get_object()))
+
+
+class LedgerVerifyAPIView(generics.GenericAPIView):
+    """
+    Replay the chain from the last verified checkpoint, or from the first
+    entry with ?full=true.
+    """
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        full = request.query_params.get("full", "").lower() in ("1", "true", "yes")
+        return Response(chain.verify(full=full))
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to_email", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("to_email", "subject")
+    readonly_fields = ("created_at", "sent_at", "claim_token", "claimed_at")
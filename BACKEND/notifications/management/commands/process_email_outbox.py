@@ -0,0 +1,36 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import deliver_pending, metrics
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notification emails from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain due emails and exit.")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to sleep when idle.")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--metrics", action="store_true", help="Print queue metrics and exit.")
+
+    def handle(self, *args, **options):
+        if options["metrics"]:
+            self.stdout.write(json.dumps(metrics(), indent=2))
+            return
+
+        while True:
+            delivered = 0
+            while True:
+                claimed = deliver_pending(options["batch_size"])
+                if not claimed:
+                    break
+                delivered += claimed
+
+            if delivered:
+                self.stdout.write(f"Processed {delivered} emails; queue: {json.dumps(metrics())}")
+
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
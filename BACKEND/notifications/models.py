@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENDING = "sending", "Sending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+# =========================================
+# OUTBOX EMAIL
+# =========================================
+class OutboxEmail(models.Model):
+    """
+    Notification email waiting to be sent.
+    Rows are written in the same transaction as the change that triggered
+    them and delivered after commit by notifications.outbox.
+    """
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+
+    status = models.CharField(
+        max_length=20,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    # Set while a worker holds the row
+    claim_token = models.UUIDField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_next_idx"),
+            models.Index(fields=["claim_token"], name="outbox_claim_token_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.get_status_display()})"
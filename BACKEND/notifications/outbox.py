@@ -0,0 +1,186 @@
+"""
+Email outbox delivery.
+
+Workers claim a batch of due rows with a single conditional UPDATE (so two
+workers never send the same message), send the batch over one SMTP
+connection, then mark rows sent or reschedule them with exponential
+backoff. Delivery runs either in a background thread started after commit
+(EMAIL_OUTBOX_AUTOSEND) or in `manage.py process_email_outbox`.
+"""
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection
+from django.db.models import Avg, F, Min, Q
+from django.utils import timezone
+
+from .models import OutboxEmail, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# A SENDING row older than this belongs to a worker that died mid-batch
+CLAIM_LEASE = timedelta(minutes=5)
+MAX_BACKOFF = timedelta(hours=1)
+
+
+def _due(now):
+    return (
+        Q(status=OutboxStatus.PENDING, next_attempt_at__lte=now)
+        | Q(status=OutboxStatus.SENDING, claimed_at__lt=now - CLAIM_LEASE)
+    )
+
+
+def claim_batch(batch_size):
+    now = timezone.now()
+    token = uuid.uuid4()
+
+    ids = list(
+        OutboxEmail.objects.filter(_due(now)).order_by(
+            "next_attempt_at", "id"
+        ).values_list("id", flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    OutboxEmail.objects.filter(_due(now), id__in=ids).update(
+        status=OutboxStatus.SENDING,
+        claim_token=token,
+        claimed_at=now,
+    )
+    return list(OutboxEmail.objects.filter(claim_token=token).order_by("id"))
+
+
+def backoff(attempts):
+    delay = timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return min(delay, MAX_BACKOFF)
+
+
+def _reschedule(email, error, token):
+    email.attempts += 1
+    email.last_error = error
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxStatus.FAILED
+        logger.error("Giving up on email %s to %s: %s", email.pk, email.to_email, error)
+    else:
+        email.status = OutboxStatus.PENDING
+        email.next_attempt_at = timezone.now() + backoff(email.attempts)
+    # Only while `token` (the batch claim) is still ours; see deliver_pending()
+    OutboxEmail.objects.filter(pk=email.pk, claim_token=token).update(
+        attempts=email.attempts,
+        last_error=email.last_error,
+        claim_token=None,
+        status=email.status,
+        next_attempt_at=email.next_attempt_at,
+    )
+
+
+def deliver_pending(batch_size=None):
+    """Send one batch of due emails. Returns how many were claimed."""
+    batch = claim_batch(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0
+    token = batch[0].claim_token
+
+    smtp = get_connection(fail_silently=False)
+    try:
+        smtp.open()
+    except Exception as exc:
+        logger.exception("Could not open email connection")
+        for email in batch:
+            _reschedule(email, str(exc), token)
+        return len(batch)
+
+    sent_ids = []
+    try:
+        for email in batch:
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[email.to_email],
+                    connection=smtp,
+                ).send()
+            except Exception as exc:
+                logger.warning("Failed to send notification email to %s", email.to_email)
+                _reschedule(email, str(exc), token)
+            else:
+                sent_ids.append(email.pk)
+    finally:
+        smtp.close()
+
+    # A batch that outlived CLAIM_LEASE may have been reclaimed by another
+    # worker; its rows are that worker's to update now
+    OutboxEmail.objects.filter(id__in=sent_ids, claim_token=token).update(
+        status=OutboxStatus.SENT,
+        sent_at=timezone.now(),
+        attempts=F("attempts") + 1,
+        claim_token=None,
+    )
+    return len(batch)
+
+
+def metrics():
+    """Queue depth and delivery latency for monitoring."""
+    now = timezone.now()
+    waiting = OutboxEmail.objects.filter(
+        status__in=[OutboxStatus.PENDING, OutboxStatus.SENDING]
+    )
+    oldest = waiting.aggregate(oldest=Min("created_at"))["oldest"]
+    recent_latency = OutboxEmail.objects.filter(
+        status=OutboxStatus.SENT,
+        sent_at__gte=now - timedelta(hours=1),
+    ).aggregate(latency=Avg(F("sent_at") - F("created_at")))["latency"]
+
+    return {
+        "pending": waiting.filter(status=OutboxStatus.PENDING).count(),
+        "sending": waiting.filter(status=OutboxStatus.SENDING).count(),
+        "failed": OutboxEmail.objects.filter(status=OutboxStatus.FAILED).count(),
+        "oldest_pending_age_seconds": (now - oldest).total_seconds() if oldest else 0,
+        "avg_delivery_seconds_last_hour": recent_latency.total_seconds() if recent_latency else None,
+    }
+
+
+# ------------------------------------------------------------
+# In-process worker, started after commit
+# ------------------------------------------------------------
+_worker_lock = threading.Lock()
+_worker_wake = threading.Event()
+_worker_thread = None
+
+
+def _drain():
+    global _worker_thread
+    try:
+        while True:
+            _worker_wake.clear()
+            try:
+                while deliver_pending():
+                    pass
+            except Exception:
+                logger.exception("Email outbox worker failed")
+
+            with _worker_lock:
+                if not _worker_wake.is_set():
+                    _worker_thread = None
+                    return
+    finally:
+        connection.close()
+
+
+def wake_worker():
+    """Deliver queued mail in a background thread without blocking the request."""
+    global _worker_thread
+    with _worker_lock:
+        _worker_wake.set()
+        if _worker_thread is None:
+            _worker_thread = threading.Thread(
+                target=_drain,
+                name="email-outbox",
+                daemon=True,
+            )
+            _worker_thread.start()
@@ -0,0 +1,89 @@
+import uuid
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import OutboxEmail, OutboxStatus
+from .outbox import deliver_pending, metrics
+from RapidAid.email_utils import send_notification_email
+
+
+class OutboxTests(TestCase):
+    def queue(self, count=1):
+        for number in range(count):
+            send_notification_email(f"user{number}@rapidaid.test", "Subject", "Body")
+
+    def test_queueing_does_not_send(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.queue()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxStatus.PENDING).count(), 1)
+
+    def test_batch_is_sent_over_one_connection(self):
+        self.queue(3)
+
+        with mock.patch("notifications.outbox.get_connection", wraps=mail.get_connection) as get_connection:
+            self.assertEqual(deliver_pending(), 3)
+
+        get_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxStatus.SENT).count(), 3)
+        self.assertEqual(deliver_pending(), 0)
+        self.assertEqual(metrics()["pending"], 0)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        self.queue()
+
+        with mock.patch("notifications.outbox.EmailMessage.send", side_effect=OSError("timeout")):
+            deliver_pending()
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxStatus.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(deliver_pending(), 0)
+
+    def test_failure_first_in_batch_still_settles_the_rest(self):
+        self.queue(3)
+
+        with mock.patch("notifications.outbox.EmailMessage.send", side_effect=[OSError("timeout"), 1, 1]):
+            deliver_pending()
+
+        self.assertEqual(
+            list(OutboxEmail.objects.order_by("id").values_list("status", "attempts", "claim_token")),
+            [(OutboxStatus.PENDING, 1, None), (OutboxStatus.SENT, 1, None), (OutboxStatus.SENT, 1, None)],
+        )
+
+    def test_gives_up_after_max_attempts(self):
+        self.queue()
+        OutboxEmail.objects.update(attempts=4)
+
+        with mock.patch("notifications.outbox.EmailMessage.send", side_effect=OSError("timeout")):
+            deliver_pending()
+
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxStatus.FAILED)
+
+    def test_reclaimed_rows_are_left_to_the_new_worker(self):
+        self.queue(2)
+        other_token = uuid.uuid4()
+
+        # The lease runs out mid-batch and another worker claims the rows;
+        # then one send succeeds and one fails
+        outcomes = iter([1, OSError("timeout")])
+
+        def send(*args, **kwargs):
+            OutboxEmail.objects.update(claim_token=other_token)
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with mock.patch("notifications.outbox.EmailMessage.send", side_effect=send):
+            deliver_pending()
+
+        for email in OutboxEmail.objects.all():
+            self.assertEqual((email.status, email.claim_token, email.attempts), (OutboxStatus.SENDING, other_token, 0))
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import OutboxMetricsAPIView
+
+urlpatterns = [
+    path("admin/outbox/metrics/", OutboxMetricsAPIView.as_view(), name="outbox-metrics"),
+]
@@ -0,0 +1,15 @@
+from rest_framework import generics
+from rest_framework.response import Response
+
+from .outbox import metrics
+from Authapp.permissions import IsAdminRole
+
+
+# =========================================
+# ADMIN: EMAIL OUTBOX METRICS
+# =========================================
+class OutboxMetricsAPIView(generics.GenericAPIView):
+    permission_classes = [IsAdminRole]
+
+    def get(self, request):
+        return Response(metrics())
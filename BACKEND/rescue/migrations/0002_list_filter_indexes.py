@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0004_list_filter_indexes'),
+        ('rescue', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rescueassignment',
+            index=models.Index(fields=['incident', '-id'], name='rescue_incident_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rescueassignment',
+            index=models.Index(fields=['status', '-id'], name='rescue_status_id_idx'),
+        ),
+    ]
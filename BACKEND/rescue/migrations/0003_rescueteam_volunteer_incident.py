@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0007_triage_lease'),
+        ('rescue', '0002_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rescueteam',
+            name='volunteer_incident',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='volunteer_team', to='incidents.incident'),
+        ),
+    ]
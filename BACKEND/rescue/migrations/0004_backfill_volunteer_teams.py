@@ -0,0 +1,63 @@
+import re
+
+from django.db import migrations
+
+VOLUNTEER_TEAM_NAME = re.compile(r"^Volunteer Team - Incident (\d+)$")
+
+
+def link_volunteer_teams(apps, schema_editor):
+    """
+    Point volunteer teams at their incident, parsed from the team name.
+    Teams duplicated by concurrent approvals are merged into the oldest one
+    first, so the unique constraints of the next migration hold.
+    """
+    Incident = apps.get_model("incidents", "Incident")
+    RescueTeam = apps.get_model("rescue", "RescueTeam")
+    RescueTeamMember = apps.get_model("rescue", "RescueTeamMember")
+    RescueAssignment = apps.get_model("rescue", "RescueAssignment")
+
+    teams_by_incident = {}
+    for team_id, name in RescueTeam.objects.filter(
+        name__startswith="Volunteer Team - Incident ",
+        volunteer_incident__isnull=True,
+    ).order_by("id").values_list("id", "name"):
+        match = VOLUNTEER_TEAM_NAME.match(name)
+        if match:
+            teams_by_incident.setdefault(int(match.group(1)), []).append(team_id)
+
+    existing = set(Incident.objects.filter(pk__in=teams_by_incident).values_list("pk", flat=True))
+    for incident_id, (team_id, *duplicates) in teams_by_incident.items():
+        if incident_id not in existing:
+            continue
+        if duplicates:
+            RescueTeamMember.objects.filter(team_id__in=duplicates).update(team_id=team_id)
+            RescueAssignment.objects.filter(team_id__in=duplicates).update(team_id=team_id)
+            RescueTeam.objects.filter(pk__in=duplicates).delete()
+        RescueTeam.objects.filter(pk=team_id).update(volunteer_incident_id=incident_id)
+
+    _drop_duplicates(RescueTeamMember, "team_id", "user_id")
+    _drop_duplicates(RescueAssignment, "incident_id", "team_id")
+
+
+def _drop_duplicates(model, *fields):
+    """Keep the oldest row of each `fields` combination."""
+    seen = set()
+    duplicates = []
+    for pk, *key in model.objects.order_by("id").values_list("id", *fields).iterator():
+        key = tuple(key)
+        if key in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(key)
+    model.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rescue', '0003_rescueteam_volunteer_incident'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_volunteer_teams, migrations.RunPython.noop),
+    ]
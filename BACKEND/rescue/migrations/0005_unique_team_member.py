@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rescue', '0004_backfill_volunteer_teams'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='rescueassignment',
+            constraint=models.UniqueConstraint(fields=('incident', 'team'), name='unique_incident_team'),
+        ),
+        migrations.AddConstraint(
+            model_name='rescueteammember',
+            constraint=models.UniqueConstraint(fields=('team', 'user'), name='unique_team_member'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rescue', '0005_unique_team_member'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rescueassignment',
+            index=models.Index(fields=['team', '-id'], name='rescue_team_id_idx'),
+        ),
+        migrations.AlterField(
+            model_name='rescueassignment',
+            name='team',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='rescue.rescueteam'),
+        ),
+    ]
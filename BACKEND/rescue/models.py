@@ -11,6 +11,16 @@ class RescueTeam(models.Model):
     organization = models.CharField(max_length=150)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Set on the team volunteers join when approved for an incident;
+    # at most one per incident
+    volunteer_incident = models.OneToOneField(
+        Incident,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="volunteer_team"
+    )
+
     def __str__(self):
         return self.name
 
@@ -34,6 +44,11 @@ class RescueTeamMember(models.Model):
         help_text="e.g. Leader, Medic, Engineer"
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team", "user"], name="unique_team_member"),
+        ]
+
     def __str__(self):
         return f"{self.user.full_name} ({self.team.name})"
 
@@ -54,10 +69,12 @@ class RescueAssignment(models.Model):
         related_name="rescue_assignments"
     )
 
+    # Led by rescue_team_id_idx, so no index of its own
     team = models.ForeignKey(
         RescueTeam,
         on_delete=models.CASCADE,
-        related_name="assignments"
+        related_name="assignments",
+        db_index=False
     )
 
     status = models.CharField(
@@ -71,5 +88,15 @@ class RescueAssignment(models.Model):
 
     notes = models.TextField(blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["incident", "team"], name="unique_incident_team"),
+        ]
+        indexes = [
+            models.Index(fields=["incident", "-id"], name="rescue_incident_id_idx"),
+            models.Index(fields=["status", "-id"], name="rescue_status_id_idx"),
+            models.Index(fields=["team", "-id"], name="rescue_team_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.team.name} → {self.incident.title}"
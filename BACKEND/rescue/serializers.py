@@ -9,6 +9,7 @@ class RescueTeamSerializer(serializers.ModelSerializer):
     class Meta:
         model = RescueTeam
         fields = "__all__"
+        read_only_fields = ["volunteer_incident"]
 
 
 # -----------------------------------------
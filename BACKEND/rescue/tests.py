@@ -1,3 +1,55 @@
+from importlib import import_module
+
+from django.apps import apps
 from django.test import TestCase
 
-# Create your tests here.
+from .models import RescueTeam, RescueAssignment, RescueTeamMember
+from Authapp.models import UserRole
+from RapidAid.testing import QueryCountMixin, api_client, make_incident, make_user
+from volunteer.provisioning import volunteer_team
+
+
+class RescueQueryCountTests(QueryCountMixin, TestCase):
+    def test_assignment_list_queries_do_not_grow_with_rows(self):
+        def add_assignment():
+            team = RescueTeam.objects.create(name="Team", organization="Red Cross")
+            RescueAssignment.objects.create(incident=make_incident(), team=team)
+
+        client = api_client(make_user(role=UserRole.ADMIN))
+        self.assertConstantQueries(client, "/api/rescue/assignments/", add_assignment)
+
+    def test_team_filter_uses_its_index(self):
+        team = RescueTeam.objects.create(name="Team", organization="Red Cross")
+        self.assertIn("rescue_team_id_idx", RescueAssignment.objects.filter(team=team).order_by("-id").explain())
+
+
+class VolunteerTeamLinkTests(TestCase):
+    def test_team_is_found_by_incident_not_name(self):
+        incident = make_incident()
+        team = volunteer_team(incident)
+        RescueTeam.objects.filter(pk=team.pk).update(name="Kathmandu Volunteers")
+
+        self.assertEqual(volunteer_team(incident).pk, team.pk)
+        self.assertEqual(RescueTeam.objects.count(), 1)
+        self.assertEqual(RescueAssignment.objects.count(), 1)
+
+    def test_backfill_links_and_merges_named_teams(self):
+        backfill = import_module("rescue.migrations.0004_backfill_volunteer_teams")
+        incident, user = make_incident(), make_user()
+        first, duplicate = (
+            RescueTeam.objects.create(name=f"Volunteer Team - Incident {incident.id}", organization="x")
+            for _ in range(2)
+        )
+        other = RescueTeam.objects.create(name="Volunteer Team - Incident 999999", organization="x")
+        RescueAssignment.objects.create(incident=incident, team=duplicate)
+        RescueTeamMember.objects.create(team=duplicate, user=user, role="Volunteer")
+
+        backfill.link_volunteer_teams(apps, None)
+
+        first.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(first.volunteer_incident_id, incident.id)
+        self.assertIsNone(other.volunteer_incident_id)
+        self.assertFalse(RescueTeam.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(list(first.members.values_list("user_id", flat=True)), [user.id])
+        self.assertEqual(list(first.assignments.values_list("incident_id", flat=True)), [incident.id])
@@ -50,7 +50,15 @@ class AssignRescueTeamAPIView(generics.CreateAPIView):
 class RescueAssignmentListAPIView(generics.ListAPIView):
     serializer_class = RescueAssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = RescueAssignment.objects.all().order_by("-id")
+    cursor_ordering = ("-id",)
+    filter_fields = {
+        "incident": "incident",
+        "status": "status",
+        "team": "team",
+    }
+    queryset = RescueAssignment.objects.select_related(
+        "team", "incident"
+    ).order_by("-id")
 
 
 # =========================================
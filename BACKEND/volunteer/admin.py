@@ -3,7 +3,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from .models import VolunteerAssignment, VolunteerStatus
-from rescue.models import RescueTeam, RescueTeamMember, RescueAssignment
+from .provisioning import provision_teams, status_email
 from RapidAid.email_utils import send_notification_email
 
 
@@ -44,46 +44,8 @@ class VolunteerAssignmentAdmin(admin.ModelAdmin):
             super().save_model(request, obj, form, change)
 
             if obj.status == VolunteerStatus.APPROVED:
-                team, _ = RescueTeam.objects.get_or_create(
-                    name=f"Volunteer Team - Incident {obj.incident.id}",
-                    defaults={"organization": "RapidAid Volunteer Network"},
-                )
+                provision_teams([obj])
 
-                RescueAssignment.objects.get_or_create(
-                    incident=obj.incident,
-                    team=team,
-                    defaults={
-                        "status": "assigned",
-                        "notes": "Auto-created from approved volunteer applications.",
-                    },
-                )
-
-                RescueTeamMember.objects.get_or_create(
-                    team=team,
-                    user=obj.user,
-                    defaults={"role": "Volunteer"},
-                )
-
-            if previous_status != obj.status:
-                if obj.status == VolunteerStatus.APPROVED:
-                    send_notification_email(
-                        to_email=obj.user.email,
-                        subject="RapidAid: Volunteer Application Approved",
-                        message=(
-                            f"Hello {obj.user.full_name},\n\n"
-                            f"Your volunteer application for incident '{obj.incident.title}' has been approved.\n"
-                            "Thank you for stepping up to help your community.\n\n"
-                            "Regards,\nRapidAid Team"
-                        ),
-                    )
-                elif obj.status == VolunteerStatus.REJECTED:
-                    send_notification_email(
-                        to_email=obj.user.email,
-                        subject="RapidAid: Volunteer Application Update",
-                        message=(
-                            f"Hello {obj.user.full_name},\n\n"
-                            f"Your volunteer application for incident '{obj.incident.title}' was not approved at this time.\n"
-                            "You can still support the platform by applying to future verified incidents.\n\n"
-                            "Regards,\nRapidAid Team"
-                        ),
-                    )
+            email = status_email(obj) if previous_status != obj.status else None
+            if email:
+                send_notification_email(*email)
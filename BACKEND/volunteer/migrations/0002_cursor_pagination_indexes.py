@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0003_cursor_pagination_indexes'),
+        ('volunteer', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volunteerassignment',
+            index=models.Index(fields=['-applied_at', '-id'], name='volunteer_applied_id_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0004_list_filter_indexes'),
+        ('volunteer', '0002_cursor_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volunteerassignment',
+            index=models.Index(fields=['incident', '-applied_at'], name='volunteer_incident_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerassignment',
+            index=models.Index(fields=['status', '-applied_at'], name='volunteer_status_applied_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0003_list_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volunteerassignment',
+            index=models.Index(fields=['user', '-applied_at', '-id'], name='volunteer_user_applied_idx'),
+        ),
+        migrations.AlterField(
+            model_name='volunteerassignment',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='volunteer_assignments', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
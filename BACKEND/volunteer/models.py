@@ -11,10 +11,12 @@ class VolunteerStatus(models.TextChoices):
 
 
 class VolunteerAssignment(models.Model):
+    # Led by volunteer_user_applied_idx, so no index of its own
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
-        related_name="volunteer_assignments"
+        related_name="volunteer_assignments",
+        db_index=False
     )
 
     incident = models.ForeignKey(
@@ -37,6 +39,12 @@ class VolunteerAssignment(models.Model):
 
     class Meta:
         unique_together = ("user", "incident")
+        indexes = [
+            models.Index(fields=["-applied_at", "-id"], name="volunteer_applied_id_idx"),
+            models.Index(fields=["incident", "-applied_at"], name="volunteer_incident_applied_idx"),
+            models.Index(fields=["status", "-applied_at"], name="volunteer_status_applied_idx"),
+            models.Index(fields=["user", "-applied_at", "-id"], name="volunteer_user_applied_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.incident.title}"
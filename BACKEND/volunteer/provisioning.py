@@ -0,0 +1,154 @@
+"""
+Status changes for volunteer applications, for one application or a batch.
+
+Approving a volunteer puts them on the incident's volunteer rescue team.
+apply_status() resolves each incident's team once, adds the missing team
+members with a single bulk_create and queues every notification email
+with one INSERT; the outbox worker only wakes after commit. Bulk writes
+skip model signals, so the dashboard counters, activity totals and
+incident cache updates they would make are done here.
+"""
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .models import VolunteerAssignment, VolunteerStatus
+from Authapp.activity import refresh_rescue
+from dashboard.signals import record_bulk_update
+from ledger.audit import record_bulk_update as record_audit_update
+from incidents.cache import invalidate_incidents
+from incidents.models import Incident
+from rescue.models import RescueAssignment, RescueTeam, RescueTeamMember
+from RapidAid.email_utils import queue_notification_emails
+
+BULK_STATUSES = (
+    VolunteerStatus.APPROVED,
+    VolunteerStatus.REJECTED,
+    VolunteerStatus.COMPLETED,
+)
+
+
+def volunteer_team(incident):
+    """
+    The incident's volunteer rescue team, created on first approval.
+
+    Looked up through the unique volunteer_incident column, so concurrent
+    approvals cannot create a second team: get_or_create() re-reads the
+    winner's row when its INSERT hits the constraint.
+    """
+    team, _ = RescueTeam.objects.get_or_create(
+        volunteer_incident=incident,
+        defaults={
+            "name": f"Volunteer Team - Incident {incident.id}",
+            "organization": "RapidAid Volunteer Network",
+        },
+    )
+
+    RescueAssignment.objects.get_or_create(
+        incident=incident,
+        team=team,
+        defaults={
+            "status": "assigned",
+            "notes": "Auto-created from approved volunteer applications.",
+        },
+    )
+    return team
+
+
+def provision_teams(assignments):
+    """Add approved volunteers to their incident teams, one team lookup per incident."""
+    by_incident = defaultdict(list)
+    for assignment in assignments:
+        by_incident[assignment.incident].append(assignment.user_id)
+
+    wanted = set()
+    for incident, user_ids in by_incident.items():
+        team = volunteer_team(incident)
+        wanted.update((team.pk, user_id) for user_id in user_ids)
+    existing = set(
+        RescueTeamMember.objects.filter(
+            team_id__in={team_id for team_id, _ in wanted},
+            user_id__in={user_id for _, user_id in wanted},
+        ).values_list("team_id", "user_id")
+    )
+
+    # A concurrent approval may add the same member first
+    RescueTeamMember.objects.bulk_create(
+        [
+            RescueTeamMember(team_id=team_id, user_id=user_id, role="Volunteer")
+            for team_id, user_id in sorted(wanted - existing)
+        ],
+        ignore_conflicts=True,
+    )
+    refresh_rescue(user_id for _, user_id in wanted - existing)
+
+
+def status_email(assignment):
+    """(to_email, subject, message) telling the volunteer about a decision, or None."""
+    user = assignment.user
+    title = assignment.incident.title
+
+    if assignment.status == VolunteerStatus.APPROVED:
+        return (
+            user.email,
+            "RapidAid: Volunteer Application Approved",
+            (
+                f"Hello {user.full_name},\n\n"
+                f"Your volunteer application for incident '{title}' has been approved.\n"
+                "Thank you for stepping up to help your community.\n\n"
+                "Regards,\nRapidAid Team"
+            ),
+        )
+    if assignment.status == VolunteerStatus.REJECTED:
+        return (
+            user.email,
+            "RapidAid: Volunteer Application Update",
+            (
+                f"Hello {user.full_name},\n\n"
+                f"Your volunteer application for incident '{title}' was not approved at this time.\n"
+                "You can still support the platform by applying to future verified incidents.\n\n"
+                "Regards,\nRapidAid Team"
+            ),
+        )
+    return None
+
+
+def apply_status(assignments, status):
+    """
+    Move `assignments` (loaded with select_related("user", "incident"))
+    to `status`. Call inside a transaction.
+    """
+    now = timezone.now()
+    changes = {"status": status}
+    if status == VolunteerStatus.APPROVED:
+        changes["approved_at"] = now
+    elif status == VolunteerStatus.COMPLETED:
+        changes["completed_at"] = now
+
+    emails = []
+    for assignment in assignments:
+        changed = assignment.status != status
+        for field, value in changes.items():
+            setattr(assignment, field, value)
+
+        email = status_email(assignment) if changed else None
+        if email:
+            emails.append(email)
+
+    # Every row gets the same values, so one UPDATE ... WHERE id IN (...)
+    # does the job of bulk_update() without its per-row CASE expressions
+    VolunteerAssignment.objects.filter(pk__in=[assignment.pk for assignment in assignments]).update(**changes)
+
+    if status == VolunteerStatus.APPROVED:
+        provision_teams(assignments)
+
+    record_bulk_update(assignments)
+    record_audit_update(assignments)
+
+    # The incident payload lists approved volunteers
+    incident_ids = {assignment.incident_id for assignment in assignments}
+    Incident.objects.filter(pk__in=incident_ids).update(updated_at=now)
+    invalidate_incidents(incident_ids)
+
+    queue_notification_emails(emails)
+    return assignments
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import VolunteerAssignment
+from .provisioning import BULK_STATUSES
 
 
 class VolunteerAssignmentSerializer(serializers.ModelSerializer):
@@ -28,3 +29,12 @@ class AdminVolunteerUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = VolunteerAssignment
         fields = ["status"]
+
+
+class AdminVolunteerBulkUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+    status = serializers.ChoiceField(choices=BULK_STATUSES)
@@ -1,3 +1,75 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from .models import VolunteerAssignment, VolunteerStatus
+from Authapp.models import UserRole
+from notifications.models import OutboxEmail
+from rescue.models import RescueAssignment, RescueTeam, RescueTeamMember
+from RapidAid.testing import QueryCountMixin, api_client, make_incident, make_user
+
+
+class VolunteerQueryCountTests(QueryCountMixin, TestCase):
+    def test_volunteer_list_queries_do_not_grow_with_rows(self):
+        def add_assignment():
+            VolunteerAssignment.objects.create(user=make_user(), incident=make_incident())
+
+        client = api_client(make_user(role=UserRole.ADMIN))
+        self.assertConstantQueries(client, "/api/volunteer/list/", add_assignment)
+
+    def test_user_filter_uses_its_index(self):
+        assignments = VolunteerAssignment.objects.filter(user=make_user()).order_by("-applied_at", "-id")
+        self.assertIn("volunteer_user_applied_idx", assignments.explain())
+
+
+@override_settings(EMAIL_OUTBOX_AUTOSEND=False)
+class VolunteerBulkUpdateTests(TestCase):
+    url = "/api/volunteer/bulk-update/"
+
+    def setUp(self):
+        self.client = api_client(make_user(role=UserRole.ADMIN))
+
+    def apply(self, incident, count):
+        return [
+            VolunteerAssignment.objects.create(user=make_user(), incident=incident).id
+            for _ in range(count)
+        ]
+
+    def test_approval_provisions_one_team_per_incident(self):
+        first, second = make_incident(), make_incident()
+        ids = self.apply(first, 3) + self.apply(second, 2)
+        already = VolunteerAssignment.objects.create(
+            user=make_user(), incident=first, status=VolunteerStatus.APPROVED
+        )
+
+        response = self.client.post(
+            self.url, {"ids": ids + [already.id], "status": "approved"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], ids)
+        self.assertEqual(response.data["skipped"], [{"id": already.id, "error": "Already approved"}])
+        self.assertEqual(RescueTeam.objects.count(), 2)
+        self.assertEqual(RescueAssignment.objects.count(), 2)
+        self.assertEqual(RescueTeamMember.objects.count(), 5)
+        self.assertEqual(OutboxEmail.objects.count(), 5)
+
+        # Re-approving after a rejection does not duplicate members
+        self.client.post(self.url, {"ids": ids[:1], "status": "rejected"}, format="json")
+        self.client.post(self.url, {"ids": ids[:1], "status": "approved"}, format="json")
+        self.assertEqual(RescueTeamMember.objects.count(), 5)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        incident = make_incident()
+
+        def queries_for(count):
+            ids = self.apply(incident, count)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {"ids": ids, "status": "approved"}, format="json")
+            self.assertEqual(len(response.data["updated"]), count)
+            return len(queries)
+
+        queries_for(1)  # creates the team and dashboard counter rows
+        self.assertEqual(queries_for(3), queries_for(30))
+        # Larger batches only add the database's own bulk batching
+        self.assertLess(queries_for(300), 20)
@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     ApplyVolunteerAPIView,
     AdminUpdateVolunteerAPIView,
+    AdminBulkUpdateVolunteerAPIView,
     VolunteerListAPIView,
 )
 
@@ -9,4 +10,5 @@ urlpatterns = [
     path("apply/", ApplyVolunteerAPIView.as_view()),
     path("list/", VolunteerListAPIView.as_view()),
     path("update/<int:pk>/", AdminUpdateVolunteerAPIView.as_view()),
+    path("bulk-update/", AdminBulkUpdateVolunteerAPIView.as_view()),
 ]
@@ -1,16 +1,18 @@
 from rest_framework import generics, permissions
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 from django.utils import timezone
 from django.db import transaction
 
 from .models import VolunteerAssignment, VolunteerStatus
+from .provisioning import apply_status, provision_teams, status_email
 from .serializers import (
     VolunteerAssignmentSerializer,
     AdminVolunteerUpdateSerializer,
+    AdminVolunteerBulkUpdateSerializer,
 )
 from Authapp.permissions import IsAdminRole
 from incidents.models import IncidentStatus
-from rescue.models import RescueTeam, RescueTeamMember, RescueAssignment
 from RapidAid.email_utils import send_notification_email
 
 
@@ -54,7 +56,7 @@ class ApplyVolunteerAPIView(generics.CreateAPIView):
 class AdminUpdateVolunteerAPIView(generics.UpdateAPIView):
     serializer_class = AdminVolunteerUpdateSerializer
     permission_classes = [IsAdminRole]
-    queryset = VolunteerAssignment.objects.all()
+    queryset = VolunteerAssignment.objects.select_related("user", "incident")
 
     def get_serializer_class(self):
         if self.request.method in ["PUT", "PATCH"]:
@@ -63,65 +65,64 @@ class AdminUpdateVolunteerAPIView(generics.UpdateAPIView):
 
     def perform_update(self, serializer):
         with transaction.atomic():
-            assignment = self.get_object()
-            previous_status = assignment.status
+            previous_status = serializer.instance.status
             status = serializer.validated_data.get("status")
 
             if status == VolunteerStatus.APPROVED:
-                updated_assignment = serializer.save(approved_at=timezone.now())
-                incident = updated_assignment.incident
-
-                team, _ = RescueTeam.objects.get_or_create(
-                    name=f"Volunteer Team - Incident {incident.id}",
-                    defaults={
-                        "organization": "RapidAid Volunteer Network",
-                    },
-                )
-
-                RescueAssignment.objects.get_or_create(
-                    incident=incident,
-                    team=team,
-                    defaults={
-                        "status": "assigned",
-                        "notes": "Auto-created from approved volunteer applications.",
-                    },
-                )
-
-                RescueTeamMember.objects.get_or_create(
-                    team=team,
-                    user=updated_assignment.user,
-                    defaults={"role": "Volunteer"},
-                )
-
-                if previous_status != VolunteerStatus.APPROVED:
-                    send_notification_email(
-                        to_email=updated_assignment.user.email,
-                        subject="RapidAid: Volunteer Application Approved",
-                        message=(
-                            f"Hello {updated_assignment.user.full_name},\n\n"
-                            f"Your volunteer application for incident '{incident.title}' has been approved.\n"
-                            "Thank you for stepping up to help your community.\n\n"
-                            "Regards,\nRapidAid Team"
-                        ),
-                    )
-            elif status == VolunteerStatus.REJECTED:
-                updated_assignment = serializer.save()
-                if previous_status != VolunteerStatus.REJECTED:
-                    send_notification_email(
-                        to_email=updated_assignment.user.email,
-                        subject="RapidAid: Volunteer Application Update",
-                        message=(
-                            f"Hello {updated_assignment.user.full_name},\n\n"
-                            f"Your volunteer application for incident '{updated_assignment.incident.title}' "
-                            "was not approved at this time.\n"
-                            "You can still support the platform by applying to future verified incidents.\n\n"
-                            "Regards,\nRapidAid Team"
-                        ),
-                    )
+                assignment = serializer.save(approved_at=timezone.now())
+                provision_teams([assignment])
             elif status == VolunteerStatus.COMPLETED:
-                serializer.save(completed_at=timezone.now())
+                assignment = serializer.save(completed_at=timezone.now())
             else:
-                serializer.save()
+                assignment = serializer.save()
+
+            email = status_email(assignment) if previous_status != assignment.status else None
+            if email:
+                send_notification_email(*email)
+
+
+# =========================================
+# ADMIN: BULK APPROVE / REJECT / COMPLETE
+# =========================================
+class AdminBulkUpdateVolunteerAPIView(generics.GenericAPIView):
+    """
+    POST {"ids": [...], "status": "approved" | "rejected" | "completed"}
+
+    Applications already in that status, or missing, come back under
+    "skipped".
+    """
+    serializer_class = AdminVolunteerBulkUpdateSerializer
+    permission_classes = [IsAdminRole]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+        status = serializer.validated_data["status"]
+
+        with transaction.atomic():
+            assignments = VolunteerAssignment.objects.select_related(
+                "user", "incident"
+            ).select_for_update(of=("self",)).in_bulk(ids)
+
+            movable, skipped = [], []
+            for pk in ids:
+                assignment = assignments.get(pk)
+                if assignment is None:
+                    skipped.append({"id": pk, "error": "Not found"})
+                elif assignment.status == status:
+                    skipped.append({"id": pk, "error": f"Already {status}"})
+                else:
+                    movable.append(assignment)
+
+            if movable:
+                apply_status(movable, status)
+
+        return Response({
+            "status": status,
+            "updated": [assignment.pk for assignment in movable],
+            "skipped": skipped,
+        })
 
 
 # =========================================
@@ -130,4 +131,13 @@ class AdminUpdateVolunteerAPIView(generics.UpdateAPIView):
 class VolunteerListAPIView(generics.ListAPIView):
     serializer_class = VolunteerAssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
-    queryset = VolunteerAssignment.objects.all().order_by("-applied_at")
+    cursor_ordering = ("-applied_at", "-id")
+    filter_fields = {
+        "incident": "incident",
+        "status": "status",
+        "user": "user",
+    }
+    date_filter_field = "applied_at"
+    queryset = VolunteerAssignment.objects.select_related(
+        "user", "incident"
+    ).order_by("-applied_at", "-id")
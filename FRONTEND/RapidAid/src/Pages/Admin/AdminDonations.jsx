@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import axiosInstance from "../../api/Axios";
-import { formatDate, parseList } from "./adminUtils";
+import { formatDate, fetchAllPages } from "./adminUtils";
 
 export default function AdminDonations() {
   const [loading, setLoading] = useState(true);
@@ -10,8 +10,7 @@ export default function AdminDonations() {
   const refreshData = async () => {
     try {
       setError("");
-      const res = await axiosInstance.get("donations/list/");
-      setDonations(parseList(res.data));
+      setDonations(await fetchAllPages(axiosInstance, "donations/list/"));
     } catch (err) {
       setError(err.response?.data?.detail || "Failed to load donations.");
     } finally {
@@ -14,6 +14,9 @@ export default function AdminIncidents() {
   const [error, setError] = useState("");
   const [incidents, setIncidents] = useState([]);
   const [actionState, setActionState] = useState({});
+  const [selected, setSelected] = useState([]);
+  const [bulkBusy, setBulkBusy] = useState(false);
+  const [bulkResult, setBulkResult] = useState("");
 
   const refreshData = async () => {
     try {
@@ -49,6 +52,39 @@ export default function AdminIncidents() {
     }
   };
 
+  const toggleSelected = (incidentId) => {
+    setSelected((prev) =>
+      prev.includes(incidentId)
+        ? prev.filter((id) => id !== incidentId)
+        : [...prev, incidentId]
+    );
+  };
+
+  const handleBulkStatus = async (status) => {
+    try {
+      setBulkBusy(true);
+      setError("");
+      const res = await axiosInstance.post("incidents/admin/bulk-transition/", {
+        ids: selected,
+        status,
+      });
+      const skipped = res.data?.skipped || [];
+      setBulkResult(
+        `${res.data?.updated?.length || 0} updated` +
+          (skipped.length ? `, ${skipped.length} skipped` : "")
+      );
+      setSelected([]);
+      await refreshData();
+    } catch (err) {
+      setError(
+        err.response?.data?.detail ||
+          "Could not update the selected incidents. Please try again."
+      );
+    } finally {
+      setBulkBusy(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="bg-white border border-slate-200 rounded-2xl p-8 text-center">
@@ -79,6 +115,25 @@ export default function AdminIncidents() {
         </div>
       )}
 
+      {(selected.length > 0 || bulkResult) && (
+        <div className="bg-slate-50 border border-slate-200 rounded-2xl px-5 py-3 flex flex-wrap items-center gap-2">
+          <p className="text-sm text-slate-600 mr-2">
+            {selected.length > 0 ? `${selected.length} selected` : bulkResult}
+          </p>
+          {selected.length > 0 &&
+            INCIDENT_STATUSES.map((item) => (
+              <button
+                key={item.value}
+                onClick={() => handleBulkStatus(item.value)}
+                disabled={bulkBusy}
+                className="px-3 py-2 rounded-lg bg-slate-900 text-white text-xs font-semibold hover:bg-slate-700 disabled:opacity-50"
+              >
+                {item.label} selected
+              </button>
+            ))}
+        </div>
+      )}
+
       <div className="bg-white border border-slate-200 rounded-2xl divide-y divide-slate-200">
         {visibleIncidents.length === 0 && (
           <p className="px-5 py-6 text-sm text-slate-500">
@@ -97,19 +152,27 @@ export default function AdminIncidents() {
           return (
             <div key={incident.id} className="px-5 py-4">
               <div className="flex flex-col lg:flex-row lg:items-center lg:justify-between gap-4">
-                <div>
-                  <p className="text-base font-semibold text-slate-900">
-                    {incident.title}
-                  </p>
-                  <p className="text-sm text-slate-500 mt-1">
-                    Status: <span className="font-semibold">{incident.status}</span> |{" "}
-                    {incident.location}
-                  </p>
-                  <p className="text-xs text-slate-400 mt-1">
-                    Reported by {incident.reporter_name || "Unknown"} |{" "}
-                    {formatDate(incident.created_at)}
-                  </p>
-                </div>
+                <label className="flex items-start gap-3">
+                  <input
+                    type="checkbox"
+                    className="mt-1"
+                    checked={selected.includes(incident.id)}
+                    onChange={() => toggleSelected(incident.id)}
+                  />
+                  <div>
+                    <p className="text-base font-semibold text-slate-900">
+                      {incident.title}
+                    </p>
+                    <p className="text-sm text-slate-500 mt-1">
+                      Status: <span className="font-semibold">{incident.status}</span> |{" "}
+                      {incident.location}
+                    </p>
+                    <p className="text-xs text-slate-400 mt-1">
+                      Reported by {incident.reporter_name || "Unknown"} |{" "}
+                      {formatDate(incident.created_at)}
+                    </p>
+                  </div>
+                </label>
                 <div className="flex flex-wrap gap-2">
                   {statusOptions.map((item) => (
                     <button
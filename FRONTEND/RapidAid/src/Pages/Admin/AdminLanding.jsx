@@ -1,31 +1,17 @@
 import { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 import axiosInstance from "../../api/Axios";
-import { parseList } from "./adminUtils";
 
 export default function AdminLanding() {
 
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
-  const [incidents, setIncidents] = useState([]);
-  const [volunteers, setVolunteers] = useState([]);
-  const [donations, setDonations] = useState([]);
-  const [users, setUsers] = useState([]);
+  const [stats, setStats] = useState(null);
   const refreshData = async () => {
     try {
       setError("");
-      const [incidentRes, volunteerRes, donationRes, usersRes] =
-        await Promise.all([
-          axiosInstance.get("incidents/"),
-          axiosInstance.get("volunteer/list/"),
-          axiosInstance.get("donations/list/"),
-          axiosInstance.get("auth/admin/users/"),
-        ]);
-
-      setIncidents(parseList(incidentRes.data));
-      setVolunteers(parseList(volunteerRes.data));
-      setDonations(parseList(donationRes.data));
-      setUsers(parseList(usersRes.data));
+      const res = await axiosInstance.get("dashboard/admin/stats/");
+      setStats(res.data);
     } catch (err) {
       setError(
         err.response?.data?.detail || "Failed to load admin dashboard data."
@@ -39,8 +25,11 @@ export default function AdminLanding() {
     refreshData();
   }, []);
 
-  const pendingIncidents = incidents.filter((item) => item.status === "reported");
-  const pendingVolunteers = volunteers.filter((item) => item.status === "pending");
+  const totalUsers = stats?.users?.total || 0;
+  const totalIncidents = stats?.incidents?.total || 0;
+  const totalDonations = stats?.donations?.total || 0;
+  const pendingIncidents = stats?.incidents?.by_status?.reported || 0;
+  const pendingVolunteers = stats?.volunteers?.by_status?.pending || 0;
 
   if (loading) {
     return (
@@ -83,20 +72,20 @@ export default function AdminLanding() {
       <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
         <div className="bg-white border border-slate-200 rounded-xl p-4">
           <p className="text-xs text-slate-500 uppercase tracking-wider">Users</p>
-          <p className="text-2xl font-bold text-slate-900 mt-1">{users.length}</p>
+          <p className="text-2xl font-bold text-slate-900 mt-1">{totalUsers}</p>
         </div>
         <div className="bg-white border border-slate-200 rounded-xl p-4">
           <p className="text-xs text-slate-500 uppercase tracking-wider">Incidents</p>
-          <p className="text-2xl font-bold text-slate-900 mt-1">{incidents.length}</p>
+          <p className="text-2xl font-bold text-slate-900 mt-1">{totalIncidents}</p>
         </div>
         <div className="bg-white border border-slate-200 rounded-xl p-4">
           <p className="text-xs text-slate-500 uppercase tracking-wider">Donations</p>
-          <p className="text-2xl font-bold text-slate-900 mt-1">{donations.length}</p>
+          <p className="text-2xl font-bold text-slate-900 mt-1">{totalDonations}</p>
         </div>
         <div className="bg-white border border-slate-200 rounded-xl p-4">
           <p className="text-xs text-slate-500 uppercase tracking-wider">Pending Volunteers</p>
           <p className="text-2xl font-bold text-slate-900 mt-1">
-            {pendingVolunteers.length}
+            {pendingVolunteers}
           </p>
         </div>
       </div>
@@ -111,7 +100,7 @@ export default function AdminLanding() {
             Moderate reports and update incident status.
           </p>
           <p className="text-sm text-slate-500 mt-2">
-            Pending incidents: {pendingIncidents.length}
+            Pending incidents: {pendingIncidents}
           </p>
         </Link>
 
@@ -124,7 +113,7 @@ export default function AdminLanding() {
             Approve, reject, or complete volunteer applications.
           </p>
           <p className="text-sm text-slate-500 mt-2">
-            Pending volunteers: {pendingVolunteers.length}
+            Pending volunteers: {pendingVolunteers}
           </p>
         </Link>
 
@@ -137,7 +126,7 @@ export default function AdminLanding() {
             Review donations and donor activity.
           </p>
           <p className="text-sm text-slate-500 mt-2">
-            Total donations: {donations.length}
+            Total donations: {totalDonations}
           </p>
         </Link>
 
@@ -149,7 +138,7 @@ export default function AdminLanding() {
           <p className="text-lg font-semibold text-slate-900 mt-2">
             Manage admin, rescue, and assessment users.
           </p>
-          <p className="text-sm text-slate-500 mt-2">Total users: {users.length}</p>
+          <p className="text-sm text-slate-500 mt-2">Total users: {totalUsers}</p>
         </Link>
 
         <Link
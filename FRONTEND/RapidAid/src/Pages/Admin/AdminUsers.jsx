@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import axiosInstance from "../../api/Axios";
-import { formatDate, parseList } from "./adminUtils";
+import { formatDate, fetchAllPages } from "./adminUtils";
 
 export default function AdminUsers() {
   const [loading, setLoading] = useState(true);
@@ -10,8 +10,7 @@ export default function AdminUsers() {
   const refreshData = async () => {
     try {
       setError("");
-      const res = await axiosInstance.get("auth/admin/users/");
-      setUsers(parseList(res.data));
+      setUsers(await fetchAllPages(axiosInstance, "auth/admin/users/"));
     } catch (err) {
       setError(err.response?.data?.detail || "Failed to load users.");
     } finally {
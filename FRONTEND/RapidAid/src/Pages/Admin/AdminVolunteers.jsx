@@ -1,6 +1,6 @@
 import { useEffect, useState } from "react";
 import axiosInstance from "../../api/Axios";
-import { formatDate, parseList } from "./adminUtils";
+import { formatDate, fetchAllPages } from "./adminUtils";
 
 const VOLUNTEER_STATUSES = [
   { label: "Approve", value: "approved" },
@@ -17,8 +17,7 @@ export default function AdminVolunteers() {
   const refreshData = async () => {
     try {
       setError("");
-      const res = await axiosInstance.get("volunteer/list/");
-      setAssignments(parseList(res.data));
+      setAssignments(await fetchAllPages(axiosInstance, "volunteer/list/"));
     } catch (err) {
       setError(err.response?.data?.detail || "Failed to load volunteers.");
     } finally {
@@ -8,6 +8,18 @@ export const parseList = (payload) => {
   return [];
 };
 
+// List endpoints hand back one cursor page at a time; follow `next`
+// (an absolute URL) until the server says there is nothing left.
+export const fetchAllPages = async (client, url, params = {}) => {
+  let res = await client.get(url, { params: { page_size: 200, ...params } });
+  const items = [...parseList(res.data)];
+  while (res.data?.next) {
+    res = await client.get(res.data.next);
+    items.push(...parseList(res.data));
+  }
+  return items;
+};
+
 export const formatDate = (value) => {
   if (!value) return "N/A";
   return new Date(value).toLocaleString();
@@ -27,6 +27,7 @@ const normalizeList = (payload) => {
 
 const Transparency = () => {
   const [donations, setDonations] = useState([]);
+  const [aggregates, setAggregates] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
@@ -35,9 +36,12 @@ const Transparency = () => {
       try {
         setLoading(true);
         setError("");
-        const res = await axiosInstance.get("/donations/list/");
-        const donationList = normalizeList(res.data);
-        setDonations(donationList);
+        const [aggregateRes, listRes] = await Promise.all([
+          axiosInstance.get("/donations/aggregates/"),
+          axiosInstance.get("/donations/list/"),
+        ]);
+        setAggregates(aggregateRes.data);
+        setDonations(normalizeList(listRes.data));
       } catch (err) {
         const detail =
           err?.response?.data?.detail ||
@@ -52,26 +56,15 @@ const Transparency = () => {
   }, []);
 
   const metrics = useMemo(() => {
-    const totalDonations = donations.length;
-    const moneyDonations = donations.filter(
-      (entry) => String(entry?.donation_type).toLowerCase() === "money"
-    );
-    const itemDonations = donations.filter(
-      (entry) => String(entry?.donation_type).toLowerCase() === "item"
-    );
-
-    const totalAmount = moneyDonations.reduce((sum, donation) => {
-      const amount = Number(donation?.amount || 0);
-      return sum + (Number.isFinite(amount) ? amount : 0);
-    }, 0);
+    const totalAmount = Number(aggregates?.total_amount || 0);
 
     return {
-      totalDonations,
-      totalAmount,
-      moneyCount: moneyDonations.length,
-      itemCount: itemDonations.length,
+      totalDonations: aggregates?.total_donations || 0,
+      totalAmount: Number.isFinite(totalAmount) ? totalAmount : 0,
+      moneyCount: aggregates?.money_donations || 0,
+      itemCount: aggregates?.item_donations || 0,
     };
-  }, [donations]);
+  }, [aggregates]);
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-slate-50 via-white to-cyan-50 pt-24 pb-16 px-4">
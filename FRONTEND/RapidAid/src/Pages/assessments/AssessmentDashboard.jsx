@@ -56,7 +56,7 @@ export default function AssessmentDashboard() {
       setError("");
       const [familiesRes, incidentsRes] = await Promise.all([
         axiosInstance.get("assessments/families/"),
-        axiosInstance.get("incidents/"),
+        axiosInstance.get("incidents/", { params: { status: "verified" } }),
       ]);
       setFamilies(parseList(familiesRes.data));
       setIncidents(parseList(incidentsRes.data));
@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import axios from "../../api/Axios";
+import { fetchAllPages } from "../Admin/adminUtils";
 
 const DonorDetails = () => {
   const [donations, setDonations] = useState([]);
@@ -9,9 +10,8 @@ const DonorDetails = () => {
   const [incidentMap, setIncidentMap] = useState({});
 
   useEffect(() => {
-    axios
-      .get("/donations/list/")
-      .then((res) => setDonations(res.data))
+    fetchAllPages(axios, "/donations/list/")
+      .then(setDonations)
       .catch((err) => console.error(err));
 
     axios
@@ -80,8 +80,12 @@ const IncidentDetail = () => {
       setDamageError("");
 
       const [familyRes, lossRes] = await Promise.all([
-        axiosInstance.get("assessments/families/"),
-        axiosInstance.get("assessments/loss/"),
+        axiosInstance.get("assessments/families/", {
+          params: { incident: id, page_size: 200 },
+        }),
+        axiosInstance.get("assessments/loss/", {
+          params: { incident: id, page_size: 200 },
+        }),
       ]);
 
       const familiesPayload = Array.isArray(familyRes.data?.results)
@@ -462,9 +466,11 @@ const IncidentDetail = () => {
     <div className="grid gap-4 sm:grid-cols-2 lg:grid-cols-3">
       {incident.media.map((m) => {
 
-        const mediaUrl = m.file.startsWith("http")
-          ? m.file
-          : `${API_BASE}${m.file}`;
+        const toUrl = (path) =>
+          path.startsWith("http") ? path : `${API_BASE}${path}`;
+        const mediaUrl = toUrl(m.file);
+        // Photos show the resized preview and link to the original
+        const previewUrl = m.preview ? toUrl(m.preview) : mediaUrl;
 
         return (
           <div
@@ -472,15 +478,18 @@ const IncidentDetail = () => {
             className="rounded-lg overflow-hidden border"
           >
             {m.media_type === "photo" ? (
-              <img
-                src={mediaUrl}
-                alt="Incident"
-                className="w-full h-56 object-cover"
-                onError={(e) => {
-                  e.target.src =
-                    "https://via.placeholder.com/400x300?text=Image+Not+Found";
-                }}
-              />
+              <a href={mediaUrl} target="_blank" rel="noreferrer">
+                <img
+                  src={previewUrl}
+                  alt="Incident"
+                  loading="lazy"
+                  className="w-full h-56 object-cover"
+                  onError={(e) => {
+                    e.target.src =
+                      "https://via.placeholder.com/400x300?text=Image+Not+Found";
+                  }}
+                />
+              </a>
             ) : (
               <video
                 src={mediaUrl}
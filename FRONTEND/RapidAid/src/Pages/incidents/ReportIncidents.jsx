@@ -1,5 +1,6 @@
 import { useState } from "react";
 import axiosInstance from "../../api/Axios"; // update path according to your structure
+import { uploadIncidentMedia } from "../../api/uploads";
 import { MapPin, Camera } from "lucide-react";
 
 export default function ReportIncidentsPage() {
@@ -9,6 +10,7 @@ export default function ReportIncidentsPage() {
   const [location, setLocation] = useState("");
   const [severity, setSeverity] = useState("");
   const [incidentDate, setIncidentDate] = useState("");
+  const [coords, setCoords] = useState(null);
   const [files, setFiles] = useState([]);
   const [loading, setLoading] = useState(false);
   const [success, setSuccess] = useState("");
@@ -18,6 +20,21 @@ export default function ReportIncidentsPage() {
     setFiles([...e.target.files]);
   };
 
+  const handleLocate = () => {
+    if (!navigator.geolocation) {
+      setError("Location is not available in this browser.");
+      return;
+    }
+    navigator.geolocation.getCurrentPosition(
+      ({ coords: position }) =>
+        setCoords({
+          latitude: position.latitude.toFixed(6),
+          longitude: position.longitude.toFixed(6),
+        }),
+      () => setError("Could not read your current location.")
+    );
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setLoading(true);
@@ -32,31 +49,14 @@ export default function ReportIncidentsPage() {
         severity,
         location,
         incident_date: incidentDate,
+        ...(coords || {}),
       });
 
       const incidentId = response.data?.id;
 
       if (incidentId && files.length > 0) {
         await Promise.all(
-          files.map((file) => {
-            const mediaData = new FormData();
-            mediaData.append("file", file);
-            mediaData.append(
-              "media_type",
-              file.type.startsWith("video/") ? "video" : "photo"
-            );
-            return axiosInstance.post(
-              `/incidents/media/upload/${incidentId}/`,
-              mediaData,
-              {
-                transformRequest: (data, headers) => {
-                  delete headers["Content-Type"];
-                  delete headers["content-type"];
-                  return data;
-                },
-              }
-            );
-          })
+          files.map((file) => uploadIncidentMedia(incidentId, file))
         );
       }
 
@@ -67,12 +67,14 @@ export default function ReportIncidentsPage() {
       setLocation("");
       setSeverity("");
       setIncidentDate("");
+      setCoords(null);
       setFiles([]);
     } catch (err) {
       const data = err?.response?.data;
       const message =
         data?.detail ||
-        data?.file?.[0] ||
+        data?.[0] ||
+        data?.size?.[0] ||
         data?.media_type?.[0] ||
         data?.non_field_errors?.[0] ||
         "Something went wrong";
@@ -155,10 +157,20 @@ export default function ReportIncidentsPage() {
             className="flex-1 border rounded-lg p-2"
             required
           />
-          <button type="button" className="border rounded-lg p-2">
+          <button
+            type="button"
+            onClick={handleLocate}
+            title="Use my current location"
+            className={`border rounded-lg p-2 ${coords ? "text-green-600 border-green-600" : ""}`}
+          >
             <MapPin className="w-5 h-5" />
           </button>
         </div>
+        {coords && (
+          <p className="text-xs text-gray-500">
+            Pinned at {coords.latitude}, {coords.longitude}
+          </p>
+        )}
 
         <label className="border-2 border-dashed rounded-xl p-4 flex flex-col items-center justify-center cursor-pointer hover:bg-gray-100">
           <Camera className="w-8 h-8 text-gray-400" />
@@ -1,12 +1,11 @@
 import { useCallback, useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import axiosInstance from "../../api/Axios";
-import { parseList } from "../Admin/adminUtils";
+import { fetchAllPages } from "../Admin/adminUtils";
 
 const newEntryDefaults = {
-  module: "incidents",
+  module: "incidents.incident",
   reference_id: "",
-  action: "updated",
   old_data: "",
   new_data: "",
   note: "",
@@ -33,8 +32,7 @@ export default function LedgerPage() {
   const loadEntries = useCallback(async () => {
     try {
       setError("");
-      const res = await axiosInstance.get("ledger/ledger-entries/");
-      setEntries(parseList(res.data));
+      setEntries(await fetchAllPages(axiosInstance, "ledger/ledger-entries/"));
     } catch (err) {
       if (err?.response?.status === 401 || err?.response?.status === 403) {
         navigate("/login");
@@ -69,12 +67,11 @@ export default function LedgerPage() {
       await axiosInstance.post("ledger/ledger-entries/", {
         module: form.module,
         reference_id: Number(form.reference_id),
-        action: form.action,
         old_data: oldData,
         new_data: newData,
         note: form.note || null,
       });
-      setSuccess("Ledger entry created.");
+      setSuccess("Note added to the ledger.");
       setForm(newEntryDefaults);
       await loadEntries();
     } catch (err) {
@@ -82,7 +79,7 @@ export default function LedgerPage() {
         err?.response?.data?.detail ||
         (typeof err?.response?.data === "object"
           ? JSON.stringify(err.response.data)
-          : "Could not create ledger entry.");
+          : "Could not add the note.");
       setError(detail);
     } finally {
       setSubmitting(false);
@@ -124,13 +121,16 @@ export default function LedgerPage() {
         )}
 
         <form onSubmit={handleSubmit} className="bg-white border rounded-2xl p-5 space-y-3">
-          <h2 className="font-semibold text-slate-900">Create Entry</h2>
-          <div className="grid md:grid-cols-3 gap-3">
+          <h2 className="font-semibold text-slate-900">Add Note</h2>
+          <p className="text-sm text-slate-500">
+            Changes are recorded automatically; entries added here are kept as notes.
+          </p>
+          <div className="grid md:grid-cols-2 gap-3">
             <input
               value={form.module}
               onChange={(e) => setForm((prev) => ({ ...prev, module: e.target.value }))}
               className="border rounded-lg px-3 py-2"
-              placeholder="Module"
+              placeholder="Module (e.g. incidents.incident)"
               required
             />
             <input
@@ -142,15 +142,6 @@ export default function LedgerPage() {
               placeholder="Reference ID"
               required
             />
-            <select
-              value={form.action}
-              onChange={(e) => setForm((prev) => ({ ...prev, action: e.target.value }))}
-              className="border rounded-lg px-3 py-2"
-            >
-              <option value="created">created</option>
-              <option value="updated">updated</option>
-              <option value="deleted">deleted</option>
-            </select>
           </div>
           <textarea
             rows={3}
@@ -177,7 +168,7 @@ export default function LedgerPage() {
             disabled={submitting}
             className="bg-slate-900 text-white px-3 py-2 rounded-lg text-sm font-semibold disabled:opacity-60"
           >
-            {submitting ? "Creating..." : "Create Ledger Entry"}
+            {submitting ? "Adding..." : "Add Note"}
           </button>
         </form>
 
@@ -0,0 +1,57 @@
+import axiosInstance from "./Axios";
+
+const MAX_RETRIES = 5;
+
+const sha256 = async (buffer) => {
+  const digest = await crypto.subtle.digest("SHA-256", buffer);
+  return [...new Uint8Array(digest)]
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+};
+
+const wait = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Resumable chunked upload (see BACKEND/incidents/uploads.py). A dropped
+// connection only repeats the current chunk: on failure we ask the server
+// for the acknowledged offset and continue from there.
+export async function uploadIncidentMedia(incidentId, file) {
+  const { data: upload } = await axiosInstance.post(
+    `/incidents/media/uploads/${incidentId}/`,
+    {
+      filename: file.name,
+      media_type: file.type.startsWith("video/") ? "video" : "photo",
+      size: file.size,
+    }
+  );
+  const url = `/incidents/media/uploads/${upload.upload_id}/`;
+
+  let offset = upload.offset;
+  let retries = 0;
+  while (offset < file.size) {
+    const chunk = await file
+      .slice(offset, offset + upload.chunk_size)
+      .arrayBuffer();
+    try {
+      const { data } = await axiosInstance.put(url, chunk, {
+        headers: {
+          "Content-Type": "application/octet-stream",
+          "Upload-Offset": String(offset),
+          "Upload-Checksum": await sha256(chunk),
+        },
+      });
+      offset = data.offset;
+      retries = 0;
+    } catch (err) {
+      if (retries >= MAX_RETRIES) throw err;
+      retries += 1;
+      await wait(1000 * 2 ** retries);
+      const resumeFrom = err?.response?.data?.offset;
+      offset =
+        resumeFrom !== undefined
+          ? resumeFrom
+          : (await axiosInstance.get(url)).data.offset;
+    }
+  }
+
+  return axiosInstance.post(`${url}finalize/`);
+}